@@ -0,0 +1,133 @@
+"""
+Detección de títulos duplicados tolerante a diferencias de formato.
+
+Las descargas de IEEE, SAGE y ScienceDirect escriben el mismo título con
+llaves de LaTeX, comandos de acentos, guiones distintos, signos de puntuación
+o un punto final. La deduplicación se hace en dos etapas sin comparar todos
+los pares:
+
+1. Bloques por clave normalizada: los títulos con la misma forma normalizada
+   (ver `normalizar_titulo`) son duplicados.
+2. Vecindario ordenado (sorted neighbourhood): las claves distintas se
+   ordenan y cada una se compara con las `VENTANA - 1` siguientes, una vez en
+   orden alfabético y otra con las palabras invertidas (para las diferencias
+   cerca del principio). Dos claves son duplicadas si tienen los mismos
+   números (ver `numeros_titulo`) y su similitud de Levenshtein
+   (1 - distancia / longitud mayor) es al menos el umbral.
+
+El costo es O(N log N) por el ordenamiento más O(N · VENTANA) comparaciones
+con distancia acotada, por lo que escala casi linealmente.
+"""
+
+import importlib
+import os
+import re
+import sys
+import unicodedata
+
+# Agregar el directorio 'backend' al PYTHONPATH para poder ejecutar como script
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+levenshtein = importlib.import_module("app.2_similitud_texto.levenshtein")
+
+# Similitud mínima entre dos títulos normalizados para considerarlos el mismo.
+UMBRAL_SIMILITUD = 0.95
+# Cantidad de claves consecutivas (en cada orden) que se comparan entre sí.
+VENTANA = 5
+# Los títulos normalizados más cortos solo se unen por coincidencia exacta: en
+# títulos como "Editorial" una letra de diferencia ya es otro título.
+LONGITUD_MINIMA_DIFUSA = 30
+
+_COMANDO_LATEX = re.compile(r"\\(?:[a-zA-Z]+|[^a-zA-Z\s])")
+_NO_ALFANUMERICO = re.compile(r"[\W_]+")
+_NUMERO = re.compile(r"\d")
+# Números romanos hasta 39 ("part ii", "volume xii").
+_NUMERO_ROMANO = re.compile(r"x{0,3}(?:ix|iv|v?i{0,3})")
+
+
+def normalizar_titulo(titulo):
+    """
+    Forma canónica de un título para compararlo: sin comandos ni llaves de
+    LaTeX, sin acentos, en minúsculas y con cualquier secuencia de signos,
+    guiones o espacios reducida a un espacio.
+    """
+    # Las llaves se quitan sin dejar espacio: "{\"O}zt{\"u}rk" -> "Ozturk".
+    titulo = _COMANDO_LATEX.sub('', titulo).replace('{', '').replace('}', '')
+    titulo = unicodedata.normalize('NFKD', titulo)
+    titulo = ''.join(caracter for caracter in titulo if not unicodedata.combining(caracter))
+    return _NO_ALFANUMERICO.sub(' ', titulo.lower()).strip()
+
+
+def numeros_titulo(clave):
+    """
+    Palabras de una clave normalizada que son números o los contienen
+    ("2019", "5g", "ii"), en orden. Dos títulos que solo difieren en ellas
+    ("Part 1" y "Part 2", congresos de 2019 y 2020) son obras distintas aunque
+    su similitud supere el umbral.
+    """
+    return tuple(
+        palabra for palabra in clave.split()
+        if _NUMERO.search(palabra) or _NUMERO_ROMANO.fullmatch(palabra)
+    )
+
+
+def _raiz(padres, i):
+    while padres[i] != i:
+        padres[i] = padres[padres[i]]
+        i = padres[i]
+    return i
+
+
+def _similares(clave1, clave2, umbral):
+    """Si dos claves normalizadas tienen similitud de Levenshtein >= umbral."""
+    longitud = max(len(clave1), len(clave2))
+    max_distancia = int((1 - umbral) * longitud)
+    if abs(len(clave1) - len(clave2)) > max_distancia:
+        return False
+    return levenshtein.calcular_distancia(clave1, clave2, max_distancia) <= max_distancia
+
+
+def agrupar_titulos(titulos, umbral=UMBRAL_SIMILITUD, ventana=VENTANA):
+    """
+    Asigna un grupo a cada título: los duplicados comparten grupo. Devuelve
+    (grupos, coincidencias_aproximadas), donde `grupos[i]` es el índice del
+    primer título del grupo de `titulos[i]` (None si está vacío o sin letras
+    ni números) y `coincidencias_aproximadas` la cantidad de uniones hechas
+    por similitud y no por clave exacta.
+    """
+    # Etapa 1: bloques por clave normalizada.
+    indice_por_clave = {}
+    clave_de_titulo = []
+    for titulo in titulos:
+        clave = normalizar_titulo(titulo) if titulo else ''
+        if clave and clave not in indice_por_clave:
+            indice_por_clave[clave] = len(indice_por_clave)
+        clave_de_titulo.append(indice_por_clave.get(clave))
+    claves = list(indice_por_clave)
+
+    # Etapa 2: vecindario ordenado sobre las claves distintas (suficientemente largas).
+    padres = list(range(len(claves)))
+    coincidencias = 0
+    candidatas = [i for i, clave in enumerate(claves) if len(clave) >= LONGITUD_MINIMA_DIFUSA]
+    numeros = {i: numeros_titulo(claves[i]) for i in candidatas}
+    invertidas = {i: ' '.join(reversed(claves[i].split())) for i in candidatas}
+    for orden in (sorted(candidatas, key=claves.__getitem__), sorted(candidatas, key=invertidas.__getitem__)):
+        for posicion, i in enumerate(orden):
+            for j in orden[posicion + 1:posicion + ventana]:
+                raiz_i, raiz_j = _raiz(padres, i), _raiz(padres, j)
+                if raiz_i != raiz_j and numeros[i] == numeros[j] and _similares(claves[i], claves[j], umbral):
+                    # La raíz es la clave que apareció primero.
+                    padres[max(raiz_i, raiz_j)] = min(raiz_i, raiz_j)
+                    coincidencias += 1
+
+    # Grupo de cada título: el primer título cuya clave tiene la misma raíz.
+    primero_por_raiz = {}
+    grupos = []
+    for i, clave in enumerate(clave_de_titulo):
+        if clave is None:
+            grupos.append(None)
+            continue
+        grupos.append(primero_por_raiz.setdefault(_raiz(padres, clave), i))
+    return grupos, coincidencias
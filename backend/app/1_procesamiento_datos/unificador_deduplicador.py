@@ -3,12 +3,23 @@ import bibtexparser
 from bibtexparser.bwriter import BibTexWriter
 from bibtexparser.bparser import BibTexParser
 
+try:
+    from . import deduplicacion_difusa
+except ImportError:  # Ejecución directa como script
+    import deduplicacion_difusa
+
 def unificar_y_deduplicar(directorio_descargas, archivo_unicos, archivo_duplicados):
     """
     Esta función lee todos los archivos .bib de un directorio, los unifica,
     elimina las entradas duplicadas basadas en el título y guarda las entradas
     únicas y duplicadas en archivos separados.
 
+    Los títulos se comparan normalizados (sin llaves ni comandos de LaTeX,
+    acentos, signos ni diferencias de guiones o espacios) y, además, por
+    similitud dentro de ventanas de títulos ordenados (ver
+    `deduplicacion_difusa`), de modo que el mismo artículo exportado por
+    distintas bases de datos se detecta aunque el título no sea idéntico.
+
     Args:
         directorio_descargas (str): La ruta al directorio que contiene los archivos .bib descargados.
         archivo_unicos (str): La ruta al archivo donde se guardarán las entradas únicas.
@@ -16,12 +27,6 @@ def unificar_y_deduplicar(directorio_descargas, archivo_unicos, archivo_duplicad
     """
     
     # --- 1. Leer y combinar todos los archivos .bib ---
-    # Se crea un parser de BibTeX para poder leer los archivos.
-    # Se especifica que ignore los errores de parsing para que el proceso no se detenga
-    # si un archivo tiene un formato ligeramente incorrecto.
-    parser = BibTexParser(common_strings=False)
-    parser.ignore_errors = True
-    
     # Se crea una base de datos BibTeX vacía para almacenar todas las entradas.
     db_combinada = bibtexparser.bibdatabase.BibDatabase()
     
@@ -31,6 +36,13 @@ def unificar_y_deduplicar(directorio_descargas, archivo_unicos, archivo_duplicad
             ruta_archivo = os.path.join(directorio_descargas, nombre_archivo)
             print(f"Procesando archivo: {nombre_archivo}...")
             
+            # Se crea un parser por archivo: si se reutiliza, cada carga devuelve
+            # también las entradas de los archivos anteriores. Se especifica que
+            # ignore los errores de parsing para que el proceso no se detenga si
+            # un archivo tiene un formato ligeramente incorrecto.
+            parser = BibTexParser(common_strings=False)
+            parser.ignore_errors = True
+
             # Se abre y se parsea cada archivo .bib.
             with open(ruta_archivo, 'r', encoding='utf-8') as bibtex_file:
                 db = bibtexparser.load(bibtex_file, parser=parser)
@@ -40,33 +52,31 @@ def unificar_y_deduplicar(directorio_descargas, archivo_unicos, archivo_duplicad
     print(f"\nSe encontraron un total de {len(db_combinada.entries)} entradas en todos los archivos.")
 
     # --- 2. Identificar y separar duplicados ---
-    # Se utilizan un diccionario y un conjunto para rastrear los títulos que ya se han visto.
-    titulos_vistos = set()
+    # Cada título recibe un grupo (el índice de la primera entrada con el mismo
+    # título normalizado o uno suficientemente parecido).
+    grupos, coincidencias_aproximadas = deduplicacion_difusa.agrupar_titulos(
+        [entrada.get('title', '') for entrada in db_combinada.entries]
+    )
     entradas_unicas = []
     entradas_duplicadas = []
-    
+
     # Se itera sobre cada entrada en la base de datos combinada.
-    for entrada in db_combinada.entries:
-        # Se extrae el título, se convierte a minúsculas y se eliminan espacios
-        # para una comparación más robusta.
-        if 'title' in entrada:
-            titulo = entrada['title'].strip().lower()
-            
-            # Si el título no se ha visto antes, se considera una entrada única.
-            if titulo not in titulos_vistos:
-                titulos_vistos.add(titulo)
-                entradas_unicas.append(entrada)
-            else:
-                # Si el título ya se ha visto, se marca como duplicado.
-                entradas_duplicadas.append(entrada)
-        else:
+    for posicion, (entrada, grupo) in enumerate(zip(db_combinada.entries, grupos)):
+        if grupo is None:
             # Si una entrada no tiene título, se considera única para no perderla,
             # aunque podría ser un dato incompleto.
             entradas_unicas.append(entrada)
+        elif grupo == posicion:
+            # La primera entrada de su grupo se considera única.
+            entradas_unicas.append(entrada)
+        else:
+            # Las demás entradas del grupo se marcan como duplicadas.
+            entradas_duplicadas.append(entrada)
 
     print(f"Proceso de deduplicación completado.")
     print(f" - Entradas únicas encontradas: {len(entradas_unicas)}")
     print(f" - Entradas duplicadas encontradas: {len(entradas_duplicadas)}")
+    print(f" - Títulos unidos por similitud (no idénticos tras normalizar): {coincidencias_aproximadas}")
 
     # --- 3. Guardar los resultados en archivos separados ---
     # Se configura un escritor de BibTeX para guardar los archivos de salida.
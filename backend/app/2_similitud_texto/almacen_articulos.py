@@ -0,0 +1,103 @@
+import os
+import threading
+from collections import OrderedDict
+
+import bibtexparser
+from bibtexparser.bparser import BibTexParser
+
+try:
+    from .tokenizacion import CorpusTokenizado
+except ImportError:  # Ejecución directa como script
+    from tokenizacion import CorpusTokenizado
+
+
+class Corpus(list):
+    """
+    Lista de artículos (entradas BibTeX) con un índice por ID.
+
+    Se comporta como la lista que devolvía antes `cargar_articulos`, por lo que
+    el código existente puede seguir iterándola, pero permite buscar un artículo
+    en O(1) con `buscar`. El atributo `version` identifica el estado del archivo
+    .bib del que se cargó (mtime y tamaño).
+    """
+
+    def __init__(self, entradas, version=None):
+        super().__init__(entradas)
+        self.version = version
+        # Tokenización compartida por todos los algoritmos (ver tokenizacion.py).
+        self.tokenizado = None
+        # Matrices de frecuencias de palabras clave, por conjunto de palabras;
+        # es un LRU acotado (ver 3_frecuencia_palabras/matriz_frecuencias.py).
+        self.frecuencias = OrderedDict()
+        self.por_id = {}
+        for entrada in entradas:
+            id_articulo = entrada.get('ID')
+            # Si hay IDs repetidos se conserva el primero, igual que la búsqueda lineal.
+            if id_articulo is not None and id_articulo not in self.por_id:
+                self.por_id[id_articulo] = entrada
+
+    def buscar(self, id_articulo):
+        """Devuelve la entrada con el ID dado o None si no existe."""
+        return self.por_id.get(id_articulo)
+
+
+class AlmacenArticulos:
+    """
+    Almacén en memoria del corpus de artículos, compartido por todo el proceso.
+
+    El archivo .bib se parsea una sola vez y solo se vuelve a leer cuando cambia
+    su fecha de modificación o su tamaño (por ejemplo, tras ejecutar de nuevo
+    `unificar_y_deduplicar`).
+    """
+
+    def __init__(self, ruta_archivo_bib):
+        self.ruta_archivo_bib = ruta_archivo_bib
+        self._corpus = None
+        self._lock = threading.Lock()
+
+    def _version_archivo(self):
+        """Devuelve (mtime_ns, tamaño) del archivo o None si no existe."""
+        try:
+            estado = os.stat(self.ruta_archivo_bib)
+        except FileNotFoundError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size)
+
+    def _parsear(self):
+        with open(self.ruta_archivo_bib, 'r', encoding='utf-8') as bibtex_file:
+            parser = BibTexParser(common_strings=True)
+            bib_database = bibtexparser.load(bibtex_file, parser=parser)
+        return bib_database.entries
+
+    def obtener(self):
+        """
+        Devuelve el corpus actual, recargándolo si el archivo cambió en disco.
+        Si el archivo no existe devuelve un corpus vacío.
+        """
+        version = self._version_archivo()
+        if version is None:
+            print(f"[ERROR] El archivo no se encuentra en: {self.ruta_archivo_bib}")
+            return Corpus([])
+
+        corpus = self._corpus
+        if corpus is not None and corpus.version == version:
+            return corpus
+
+        with self._lock:
+            # Otro hilo pudo haber recargado el corpus mientras se esperaba el lock.
+            if self._corpus is not None and self._corpus.version == version:
+                return self._corpus
+            corpus = Corpus(self._parsear(), version)
+            # Cada abstract se tokeniza una sola vez, al cargar el corpus. Si ya
+            # había una versión cargada, solo se tokenizan los abstracts nuevos.
+            anterior = self._corpus.tokenizado if self._corpus is not None else None
+            corpus.tokenizado = CorpusTokenizado(corpus, version, anterior)
+            self._corpus = corpus
+            print(f"[INFO] Se cargaron {len(self._corpus)} artículos "
+                  f"({corpus.tokenizado.reutilizados} abstracts ya tokenizados).")
+            return self._corpus
+
+    def invalidar(self):
+        """Descarta el corpus en memoria para forzar una relectura en la próxima consulta."""
+        with self._lock:
+            self._corpus = None
@@ -1,62 +1,169 @@
-import bibtexparser
+import functools
 import os
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+
+import numpy as np
+
+try:
+    from . import cache_similitud
+    from . import indice_ann
+    from . import levenshtein
+    from . import matriz_similitud
+    from . import minhash_lsh
+    from . import modelo_tfidf
+    from . import registro_algoritmos
+    from . import tokenizacion
+    from .almacen_articulos import AlmacenArticulos
+except ImportError:  # Ejecución directa como script
+    import cache_similitud
+    import indice_ann
+    import levenshtein
+    import matriz_similitud
+    import minhash_lsh
+    import modelo_tfidf
+    import registro_algoritmos
+    import tokenizacion
+    from almacen_articulos import AlmacenArticulos
 
 # --- Constantes ---
 # Se calcula la ruta raíz del proyecto para que funcione independientemente de dónde se ejecute
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
 BIB_FILE_PATH = os.path.join(ROOT_DIR, 'datos', 'procesados', 'articulos_unicos.bib')
 
+# Prefijo de los índices MinHash persistidos junto al archivo .bib.
+MINHASH_FILE_PREFIX = os.path.splitext(BIB_FILE_PATH)[0] + '.minhash'
+
+# Índice ANN (vecinos aproximados por coseno) persistido junto al archivo .bib.
+ANN_FILE_PATH = os.path.splitext(BIB_FILE_PATH)[0] + '.ann.npz'
+
+# Operaciones bit-paralelas (palabras x ⌈palabras/64⌉) que puede costar
+# Levenshtein por palabras antes de pasar a la aproximación por bloques. Cubre
+# de forma exacta textos de hasta ~4000 palabras.
+PRESUPUESTO_LEVENSHTEIN_PALABRAS = 250_000
+
+# Códigos de error que acompañan al mensaje en {"error", "codigo"}; la API elige
+# el código HTTP a partir de ellos y no del texto del mensaje.
+ERROR_ARTICULO_NO_ENCONTRADO = "articulo_no_encontrado"
+ERROR_SIN_ABSTRACT = "sin_abstract"
+ERROR_PARAMETRO_INVALIDO = "parametro_invalido"
+
+# Nivel en disco de la caché de resultados de similitud.
+CACHE_FILE_PATH = os.path.splitext(BIB_FILE_PATH)[0] + '.cache_similitud.sqlite'
+
+# Almacén compartido por todo el proceso: el .bib se parsea una sola vez y
+# solo se vuelve a leer cuando cambia en disco.
+almacen = AlmacenArticulos(BIB_FILE_PATH)
+
+# Caché de resultados por par: LRU en memoria + SQLite en disco.
+cache = cache_similitud.CacheSimilitud(
+    ruta_sqlite=CACHE_FILE_PATH if os.path.isdir(os.path.dirname(CACHE_FILE_PATH)) else None
+)
+
 # --- Funciones de Lógica Principal ---
 
+def _error(mensaje, codigo):
+    """Resultado de error con su mensaje y su código (ver ERROR_*)."""
+    return {"error": mensaje, "codigo": codigo}
+
 def cargar_articulos():
     """
     Carga los artículos desde el archivo .bib unificado.
+    Devuelve el corpus en memoria (una lista indexada por ID), que solo se
+    vuelve a parsear si el archivo cambió desde la última lectura.
     """
-    if not os.path.exists(BIB_FILE_PATH):
-        print(f"[ERROR] El archivo no se encuentra en: {BIB_FILE_PATH}")
-        return []
-
-    with open(BIB_FILE_PATH, 'r', encoding='utf-8') as bibtex_file:
-        parser = bibtexparser.bparser.BibTexParser(common_strings=True)
-        bib_database = bibtexparser.load(bibtex_file, parser=parser)
-    
-    print(f"[INFO] Se cargaron {len(bib_database.entries)} artículos.")
-    return bib_database.entries
+    return almacen.obtener()
 
-def calcular_distancia_levenshtein(s1, s2):
+def buscar_articulo(articulos, id_articulo):
     """
-    Calcula la distancia de Levenshtein entre dos strings.
+    Busca un artículo por su ID. Usa el índice del corpus si está disponible
+    y, si se recibe una lista simple, recurre a una búsqueda lineal.
     """
-    if len(s1) < len(s2):
-        return calcular_distancia_levenshtein(s2, s1)
-    if len(s2) == 0:
-        return len(s1)
-    previous_row = range(len(s2) + 1)
-    for i, c1 in enumerate(s1):
-        current_row = [i + 1]
-        for j, c2 in enumerate(s2):
-            insertions = previous_row[j + 1] + 1
-            deletions = current_row[j] + 1
-            substitutions = previous_row[j] + (c1 != c2)
-            current_row.append(min(insertions, deletions, substitutions))
-        previous_row = current_row
-    return previous_row[-1]
+    buscar = getattr(articulos, 'buscar', None)
+    if buscar is not None:
+        return buscar(id_articulo)
+    return next((a for a in articulos if a.get('ID') == id_articulo), None)
 
-def analizar_similitud_levenshtein(articulos, id1, id2):
+def obtener_abstracts_par(articulos, id1, id2):
     """
-    Encuentra dos artículos y calcula la similitud de sus abstracts usando Levenshtein.
+    Obtiene los abstracts de dos artículos.
+    Devuelve (abstract1, abstract2, None) o (None, None, error) si alguno falta.
     """
-    articulo1 = next((a for a in articulos if a.get('ID') == id1), None)
-    articulo2 = next((a for a in articulos if a.get('ID') == id2), None)
+    articulo1 = buscar_articulo(articulos, id1)
+    articulo2 = buscar_articulo(articulos, id2)
 
     if not articulo1 or not articulo2:
-        return {"error": "No se encontró uno o ambos artículos."}
+        return None, None, _error("No se encontró uno o ambos artículos.", ERROR_ARTICULO_NO_ENCONTRADO)
     abstract1 = articulo1.get('abstract', '')
     abstract2 = articulo2.get('abstract', '')
     if not abstract1 or not abstract2:
-        return {"error": "Uno o ambos artículos no tienen abstract."}
+        return None, None, _error("Uno o ambos artículos no tienen abstract.", ERROR_SIN_ABSTRACT)
+    return abstract1, abstract2, None
+
+def calcular_distancia_levenshtein(s1, s2, max_distance=None):
+    """
+    Calcula la distancia de Levenshtein entre dos strings.
+    Usa el algoritmo bit-paralelo de Myers/Hyyrö; si se indica `max_distance`
+    el cálculo se corta en cuanto se supera el umbral y devuelve max_distance + 1.
+    """
+    return levenshtein.calcular_distancia(s1, s2, max_distance)
+
+def con_cache(algoritmo, depende_del_corpus=False):
+    """
+    Decorador que antepone la caché de resultados a una función
+    analizar_similitud_*(articulos, id1, id2). La clave incluye el algoritmo,
+    los IDs en orden canónico y la huella de ambos abstracts; si el resultado
+    depende de todo el corpus, también la versión del corpus.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(articulos, id1, id2):
+            abstract1, abstract2, error = obtener_abstracts_par(articulos, id1, id2)
+            if error:
+                return error
+            version = getattr(articulos, 'version', None)
+            if depende_del_corpus and version is None:
+                # Sin versión no se puede saber si el corpus cambió.
+                return funcion(articulos, id1, id2)
+
+            clave = cache_similitud.construir_clave(
+                algoritmo, id1, abstract1, id2, abstract2, version if depende_del_corpus else None
+            )
+            resultado = cache.obtener(clave)
+            if resultado is None:
+                resultado = funcion(articulos, id1, id2)
+                if "error" in resultado:
+                    return resultado
+                cache.guardar(clave, {k: v for k, v in resultado.items() if k not in ("articulo1_id", "articulo2_id")})
+                return resultado
+            return {"articulo1_id": id1, "articulo2_id": id2, **resultado}
+        return envoltura
+    return decorador
+
+def calcular_distancias_levenshtein_lote(pares, abstracts, max_workers=None, max_distance=None):
+    """
+    Calcula la distancia de Levenshtein de una lista de pares (id1, id2), donde
+    `abstracts` asocia cada ID con su texto. Los lotes grandes se reparten entre
+    procesos (ProcessPoolExecutor) en bloques de costo estimado similar y cada
+    proceso recibe solo los textos que necesita.
+    """
+    return levenshtein.distancias_en_paralelo(pares, abstracts, max_workers, max_distance)
+
+def calcular_distancias_levenshtein_uno_contra_muchos(abstract, abstracts, max_distance=None, max_workers=None):
+    """
+    Calcula la distancia de Levenshtein de un abstract a una lista de abstracts
+    (p. ej. para ordenar todo el corpus por parecido a un artículo). Las
+    consultas cortas se resuelven con operaciones de NumPy sobre todo el lote y
+    las largas se reparten entre procesos como los lotes de pares.
+    """
+    return levenshtein.distancias_uno_contra_muchos(abstract, abstracts, max_distance, max_workers)
+
+@con_cache("levenshtein")
+def analizar_similitud_levenshtein(articulos, id1, id2):
+    """
+    Encuentra dos artículos y calcula la similitud de sus abstracts usando Levenshtein.
+    """
+    abstract1, abstract2, error = obtener_abstracts_par(articulos, id1, id2)
+    if error:
+        return error
 
     distancia = calcular_distancia_levenshtein(abstract1, abstract2)
     longitud_max = max(len(abstract1), len(abstract2))
@@ -70,54 +177,92 @@ def analizar_similitud_levenshtein(articulos, id1, id2):
         "similitud": round(similitud, 4)
     }
 
+def calcular_levenshtein_palabras(secuencia1, secuencia2, presupuesto=PRESUPUESTO_LEVENSHTEIN_PALABRAS):
+    """
+    Distancia de edición entre dos secuencias de IDs de tokens (palabras) y su
+    similitud normalizada. Si el costo exacto supera el presupuesto se usa la
+    aproximación por bloques y el resultado se marca como aproximado.
+    """
+    distancia, aproximado = levenshtein.distancia_con_presupuesto(secuencia1, secuencia2, presupuesto)
+    longitud_max = max(len(secuencia1), len(secuencia2))
+    return {
+        "distancia": distancia,
+        "similitud": round(1 - (distancia / longitud_max) if longitud_max > 0 else 1.0, 4),
+        "aproximado": aproximado,
+    }
+
+# El presupuesto forma parte de la clave: con otro presupuesto cambian los
+# resultados aproximados.
+@con_cache(f"levenshtein_palabras:{PRESUPUESTO_LEVENSHTEIN_PALABRAS}")
+def analizar_similitud_levenshtein_palabras(articulos, id1, id2):
+    """
+    Calcula la distancia de Levenshtein entre los abstracts de dos artículos
+    contando palabras en lugar de caracteres. Trabaja sobre las secuencias de
+    IDs de tokens del corpus, mucho más cortas que el texto.
+    """
+    abstract1, abstract2, error = obtener_abstracts_par(articulos, id1, id2)
+    if error:
+        return error
+
+    corpus_tokenizado = tokenizacion.obtener_corpus_tokenizado(articulos)
+    resultado = calcular_levenshtein_palabras(
+        corpus_tokenizado.documento(id1).secuencia, corpus_tokenizado.documento(id2).secuencia
+    )
+
+    return {
+        "articulo1_id": id1,
+        "articulo2_id": id2,
+        "algoritmo": "Distancia de Levenshtein por palabras",
+        **resultado,
+    }
+
+@con_cache("coseno", depende_del_corpus=True)
 def analizar_similitud_coseno(articulos, id1, id2):
     """
     Encuentra dos artículos y calcula la similitud de sus abstracts usando Similitud de Coseno con TF-IDF.
+    Los pesos IDF provienen de todo el corpus, por lo que los puntajes son comparables entre pares.
     """
-    articulo1 = next((a for a in articulos if a.get('ID') == id1), None)
-    articulo2 = next((a for a in articulos if a.get('ID') == id2), None)
+    abstract1, abstract2, error = obtener_abstracts_par(articulos, id1, id2)
+    if error:
+        return error
 
-    if not articulo1 or not articulo2:
-        return {"error": "No se encontró uno o ambos artículos."}
-    abstract1 = articulo1.get('abstract', '')
-    abstract2 = articulo2.get('abstract', '')
-    if not abstract1 or not abstract2:
-        return {"error": "Uno o ambos artículos no tienen abstract."}
-
-    # Vectorizar los textos
-    vectorizer = TfidfVectorizer()
-    tfidf_matrix = vectorizer.fit_transform([abstract1, abstract2])
-    
-    # Calcular la similitud de coseno
-    similitud = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
+    # El modelo TF-IDF se ajusta una sola vez sobre todo el corpus; la similitud
+    # de coseno es el producto punto de las dos filas normalizadas.
+    modelo = modelo_tfidf.obtener_modelo(articulos)
+    similitud = modelo.similitud(id1, id2)
     
     return {
         "articulo1_id": id1,
         "articulo2_id": id2,
         "algoritmo": "Similitud de Coseno (TF-IDF)",
-        "similitud": round(similitud[0][0], 4)
+        "similitud": round(similitud, 4)
     }
 
+@con_cache("jaccard")
 def analizar_similitud_jaccard(articulos, id1, id2):
     """
     Encuentra dos artículos y calcula la similitud de sus abstracts usando el índice de Jaccard.
-    """
-    articulo1 = next((a for a in articulos if a.get('ID') == id1), None)
-    articulo2 = next((a for a in articulos if a.get('ID') == id2), None)
 
-    if not articulo1 or not articulo2:
-        return {"error": "No se encontró uno o ambos artículos."}
-    abstract1 = articulo1.get('abstract', '')
-    abstract2 = articulo2.get('abstract', '')
-    if not abstract1 or not abstract2:
-        return {"error": "Uno o ambos artículos no tienen abstract."}
+    Los conjuntos son los de la tokenización compartida (`tokenizacion.PATRON_TOKEN`:
+    palabras de 2 o más caracteres alfanuméricos en minúsculas, como TF-IDF), y
+    no las palabras separadas por espacios de `lower().split()` que se usaban
+    antes. Los signos de puntuación ya no crean palabras distintas ("data," y
+    "data" son la misma) y se ignoran las palabras de un carácter, por lo que
+    los puntajes difieren de los anteriores. Es la misma tokenización que usan
+    la matriz de Jaccard y el índice MinHash, de modo que todos los caminos dan
+    el mismo puntaje.
+    """
+    abstract1, abstract2, error = obtener_abstracts_par(articulos, id1, id2)
+    if error:
+        return error
 
-    # Tokenización simple: convertir a minúsculas y dividir por espacios
-    a = set(abstract1.lower().split())
-    b = set(abstract2.lower().split())
+    # Se usan los conjuntos de IDs de tokens calculados al cargar el corpus.
+    corpus_tokenizado = tokenizacion.obtener_corpus_tokenizado(articulos)
+    a = corpus_tokenizado.documento(id1).unicos
+    b = corpus_tokenizado.documento(id2).unicos
     
-    interseccion = len(a.intersection(b))
-    union = len(a.union(b))
+    interseccion = len(np.intersect1d(a, b, assume_unique=True))
+    union = len(a) + len(b) - interseccion
     
     similitud = interseccion / union if union != 0 else 0
     
@@ -128,6 +273,363 @@ def analizar_similitud_jaccard(articulos, id1, id2):
         "similitud": round(similitud, 4)
     }
 
+# --- Índice MinHash + LSH para Jaccard ---
+
+_indices_minhash = {}
+
+def obtener_indice_minhash(articulos, num_perm=minhash_lsh.NUM_PERMUTACIONES, num_bandas=minhash_lsh.NUM_BANDAS):
+    """
+    Devuelve el índice MinHash del corpus para los parámetros dados. Se mantiene
+    en memoria y se persiste junto a 'articulos_unicos.bib'; solo se reconstruye
+    cuando el corpus cambia.
+    """
+    clave = (num_perm, num_bandas)
+    indice = _indices_minhash.get(clave)
+    version = getattr(articulos, 'version', None)
+    if indice is not None and version is not None and indice.version == version:
+        return indice
+    ruta = f"{MINHASH_FILE_PREFIX}-{num_perm}x{num_bandas}.npz"
+    indice = minhash_lsh.obtener_indice(articulos, ruta, num_perm, num_bandas)
+    if version is not None:
+        _indices_minhash[clave] = indice
+    return indice
+
+def buscar_similares_jaccard(articulos, id_articulo, k=10, num_perm=minhash_lsh.NUM_PERMUTACIONES,
+                             num_bandas=minhash_lsh.NUM_BANDAS, exacto=False):
+    """
+    Busca los artículos más parecidos según Jaccard usando MinHash + LSH: solo se
+    evalúan los candidatos que comparten alguna banda de la firma. La similitud
+    es estimada, salvo que se pida `exacto=True` para volver a puntuar los
+    candidatos con el índice de Jaccard real.
+    """
+    if buscar_articulo(articulos, id_articulo) is None:
+        return _error("No se encontró el artículo.", ERROR_ARTICULO_NO_ENCONTRADO)
+    indice = obtener_indice_minhash(articulos, num_perm, num_bandas)
+    vecinos = indice.consultar(id_articulo, k, articulos, exacto)
+    if vecinos is None:
+        return _error("El artículo no tiene abstract.", ERROR_SIN_ABSTRACT)
+
+    return {
+        "articulo_id": id_articulo,
+        "algoritmo": "Índice de Jaccard (MinHash + LSH)",
+        "exacto": exacto,
+        "vecinos": [{"id": id_vecino, "similitud": round(puntaje, 4)} for id_vecino, puntaje in vecinos],
+    }
+
+# --- Índice ANN para Coseno ---
+
+_indice_ann = None
+
+def obtener_indice_ann(articulos, reconstruir=False):
+    """
+    Devuelve el índice de vecinos aproximados sobre los vectores TF-IDF. Se
+    mantiene en memoria y se persiste junto a 'articulos_unicos.bib'; solo se
+    reconstruye cuando cambia el corpus o si se pide `reconstruir`.
+    """
+    global _indice_ann
+    modelo = modelo_tfidf.obtener_modelo(articulos)
+    if modelo.matriz is None:
+        return None
+    indice = _indice_ann
+    if not reconstruir and indice is not None and modelo.version is not None and indice.version == modelo.version:
+        return indice
+    indice = indice_ann.obtener_indice(modelo, ANN_FILE_PATH, reconstruir)
+    if modelo.version is not None:
+        _indice_ann = indice
+    return indice
+
+def buscar_similares_coseno(articulos, id_articulo, k=10, nprobe=indice_ann.NPROBE, exacto=True):
+    """
+    Busca los artículos más parecidos por coseno con el índice ANN. `nprobe`
+    controla cuántas listas invertidas se revisan (más recall, más latencia).
+    Con `exacto=True` los candidatos se puntúan con el coseno TF-IDF real.
+    """
+    if buscar_articulo(articulos, id_articulo) is None:
+        return _error("No se encontró el artículo.", ERROR_ARTICULO_NO_ENCONTRADO)
+    indice = obtener_indice_ann(articulos)
+    matriz = modelo_tfidf.obtener_modelo(articulos).matriz if exacto else None
+    vecinos = indice.buscar(id_articulo, k, nprobe, matriz) if indice is not None else None
+    if vecinos is None:
+        return _error("El artículo no tiene abstract.", ERROR_SIN_ABSTRACT)
+
+    return {
+        "articulo_id": id_articulo,
+        "algoritmo": "Similitud de Coseno (TF-IDF, ANN)",
+        "nprobe": nprobe,
+        "vecinos": [{"id": id_vecino, "similitud": round(puntaje, 4)} for id_vecino, puntaje in vecinos],
+    }
+
+# --- Registro de algoritmos ---
+# Cada algoritmo declara su preprocesamiento y los caminos rápidos que soporta;
+# las funciones genéricas de abajo eligen el más rápido disponible.
+
+@registro_algoritmos.registrar
+class Levenshtein(registro_algoritmos.AlgoritmoSimilitud):
+    nombre = "levenshtein"
+    descripcion = "Distancia de Levenshtein"
+    preprocesamiento = "texto"
+
+    def comparar(self, articulos, id1, id2):
+        return analizar_similitud_levenshtein(articulos, id1, id2)
+
+    def puntuar_lote(self, articulos, pares, abstracts):
+        """
+        Reutiliza los resultados en caché y calcula en paralelo solo los pares
+        distintos que faltan.
+        """
+        en_cache = {}
+        pendientes = {}
+        for id1, id2 in pares:
+            par = (id1, id2) if id1 <= id2 else (id2, id1)
+            if par in en_cache or par in pendientes:
+                continue
+            clave = cache_similitud.construir_clave(self.nombre, par[0], abstracts[par[0]], par[1], abstracts[par[1]])
+            guardado = cache.obtener(clave)
+            if guardado is not None:
+                en_cache[par] = guardado
+            else:
+                pendientes[par] = clave
+        pares_pendientes = list(pendientes)
+        for par, distancia in zip(pares_pendientes, calcular_distancias_levenshtein_lote(pares_pendientes, abstracts)):
+            longitud_max = max(len(abstracts[par[0]]), len(abstracts[par[1]]))
+            en_cache[par] = {
+                "algoritmo": self.descripcion,
+                "distancia": distancia,
+                "similitud": round(1 - (distancia / longitud_max) if longitud_max > 0 else 1.0, 4),
+            }
+        cache.guardar_varios((pendientes[par], en_cache[par]) for par in pares_pendientes)
+
+        resultados = []
+        for id1, id2 in pares:
+            guardado = en_cache[(id1, id2) if id1 <= id2 else (id2, id1)]
+            resultados.append({"distancia": guardado["distancia"], "similitud": guardado["similitud"]})
+        return resultados
+
+    def iterar_top_k(self, articulos, ids, abstracts, k, filas_consulta=None):
+        return matriz_similitud.iterar_top_k_levenshtein(ids, abstracts, k, filas_consulta)
+
+
+@registro_algoritmos.registrar
+class LevenshteinPalabras(registro_algoritmos.AlgoritmoSimilitud):
+    nombre = "levenshtein_palabras"
+    descripcion = "Distancia de Levenshtein por palabras"
+    preprocesamiento = "ids_tokens"
+
+    def comparar(self, articulos, id1, id2):
+        return analizar_similitud_levenshtein_palabras(articulos, id1, id2)
+
+    def puntuar_lote(self, articulos, pares, abstracts):
+        # Sobre secuencias de palabras cada par cuesta poco; se calcula directo.
+        corpus_tokenizado = tokenizacion.obtener_corpus_tokenizado(articulos)
+        return [
+            calcular_levenshtein_palabras(
+                corpus_tokenizado.documento(id1).secuencia, corpus_tokenizado.documento(id2).secuencia
+            )
+            for id1, id2 in pares
+        ]
+
+
+@registro_algoritmos.registrar
+class Coseno(registro_algoritmos.AlgoritmoConIndice):
+    nombre = "coseno"
+    descripcion = "Similitud de Coseno (TF-IDF)"
+    preprocesamiento = "tokens_tfidf"
+    vectorizado = True
+
+    def comparar(self, articulos, id1, id2):
+        return analizar_similitud_coseno(articulos, id1, id2)
+
+    def modelo(self, articulos):
+        return matriz_similitud.ModeloCosenoBloques(modelo_tfidf.obtener_modelo(articulos))
+
+    def vecinos_indice(self, articulos, id_articulo, k, exacto=False, nprobe=None):
+        indice = obtener_indice_ann(articulos)
+        if indice is None:
+            # Ningún abstract tiene vocabulario TF-IDF: no hay índice que consultar.
+            return None
+        # Con el modelo TF-IDF en memoria, puntuar los candidatos con el coseno
+        # real cuesta poco, así que siempre se usa el puntaje exacto.
+        matriz = modelo_tfidf.obtener_modelo(articulos).matriz
+        return indice.buscar(id_articulo, k, nprobe or indice_ann.NPROBE, matriz_tfidf=matriz)
+
+
+@registro_algoritmos.registrar
+class Jaccard(registro_algoritmos.AlgoritmoConIndice):
+    nombre = "jaccard"
+    descripcion = "Índice de Jaccard"
+    preprocesamiento = "conjunto_tokens"
+    vectorizado = True
+
+    def comparar(self, articulos, id1, id2):
+        return analizar_similitud_jaccard(articulos, id1, id2)
+
+    def modelo(self, articulos):
+        return matriz_similitud.obtener_modelo_jaccard(articulos)
+
+    def vecinos_indice(self, articulos, id_articulo, k, exacto=False, nprobe=None):
+        return obtener_indice_minhash(articulos).consultar(id_articulo, k, articulos, exacto)
+
+
+def obtener_algoritmo(nombre):
+    """Devuelve el algoritmo registrado con ese nombre o None."""
+    return registro_algoritmos.obtener(nombre)
+
+def listar_algoritmos():
+    """Lista los algoritmos registrados con sus capacidades."""
+    return [algoritmo.capacidades() for algoritmo in registro_algoritmos.listar()]
+
+def _abstracts_por_fila(articulos):
+    """IDs y abstracts de los artículos con abstract, sin IDs repetidos."""
+    ids, abstracts, fila_por_id = [], [], {}
+    for articulo in articulos:
+        abstract = articulo.get('abstract', '')
+        id_articulo = articulo.get('ID')
+        if abstract and id_articulo is not None and id_articulo not in fila_por_id:
+            fila_por_id[id_articulo] = len(ids)
+            ids.append(id_articulo)
+            abstracts.append(abstract)
+    return ids, abstracts, fila_por_id
+
+# --- Similitud de todos contra todos ---
+
+def iterar_vecinos_similares(articulos, algoritmo, k=5, id_articulo=None, aproximado=False, exacto=False,
+                             nprobe=indice_ann.NPROBE):
+    """
+    Calcula la similitud de todos los artículos contra todos (o de uno contra
+    todos si se indica `id_articulo`) y obtiene los k más similares de cada uno.
+    Los algoritmos vectorizados se calculan con productos de matrices dispersas
+    por bloques, de modo que la memoria no crece con N x N. Con `aproximado=True`
+    se usa el índice precalculado del algoritmo (p. ej. MinHash + LSH en Jaccard,
+    IVF en coseno, donde `nprobe` fija cuántas listas se revisan). Un artículo
+    que no está en el índice sale sin vecinos.
+
+    Los parámetros se validan de inmediato; "resultados" es un generador que
+    entrega cada artículo apenas se completa su bloque, para poder enviarlo sin
+    esperar al resto.
+    """
+    algoritmo_registrado = obtener_algoritmo(algoritmo)
+    if algoritmo_registrado is None:
+        return _error(f"Algoritmo '{algoritmo}' no reconocido.", ERROR_PARAMETRO_INVALIDO)
+    if k < 1:
+        return _error("El parámetro k debe ser al menos 1.", ERROR_PARAMETRO_INVALIDO)
+    if nprobe < 1:
+        return _error("El parámetro nprobe debe ser al menos 1.", ERROR_PARAMETRO_INVALIDO)
+    if aproximado and not algoritmo_registrado.usa_indice:
+        return _error(f"La búsqueda aproximada no está disponible para '{algoritmo}'.", ERROR_PARAMETRO_INVALIDO)
+
+    modelo = None if aproximado else algoritmo_registrado.modelo(articulos)
+    if modelo is not None:
+        ids, fila_por_id = modelo.ids, modelo.fila_por_id
+    else:
+        ids, abstracts, fila_por_id = _abstracts_por_fila(articulos)
+
+    filas_consulta = None
+    if id_articulo is not None:
+        if buscar_articulo(articulos, id_articulo) is None:
+            return _error("No se encontró el artículo.", ERROR_ARTICULO_NO_ENCONTRADO)
+        if id_articulo not in fila_por_id:
+            return _error("El artículo no tiene abstract.", ERROR_SIN_ABSTRACT)
+        filas_consulta = [fila_por_id[id_articulo]]
+
+    if aproximado:
+        consultas = ids if filas_consulta is None else [id_articulo]
+        vecinos = (
+            (id_actual, algoritmo_registrado.vecinos_indice(articulos, id_actual, k, exacto, nprobe) or [])
+            for id_actual in consultas
+        )
+        descripcion = f"{algoritmo_registrado.descripcion} (índice aproximado)"
+    elif modelo is not None:
+        vecinos = matriz_similitud.iterar_top_k_por_bloques(modelo, k, filas_consulta)
+        descripcion = algoritmo_registrado.descripcion
+    else:
+        vecinos = algoritmo_registrado.iterar_top_k(articulos, ids, abstracts, k, filas_consulta)
+        descripcion = algoritmo_registrado.descripcion
+
+    return {
+        "algoritmo": descripcion,
+        "k": k,
+        "resultados": (
+            {
+                "id": id_actual,
+                "vecinos": [{"id": id_vecino, "similitud": round(puntaje, 4)} for id_vecino, puntaje in lista],
+            }
+            for id_actual, lista in vecinos
+        ),
+    }
+
+def calcular_vecinos_similares(articulos, algoritmo, k=5, id_articulo=None, aproximado=False, exacto=False,
+                               nprobe=indice_ann.NPROBE):
+    """Versión de `iterar_vecinos_similares` que devuelve todos los resultados en una lista."""
+    respuesta = iterar_vecinos_similares(articulos, algoritmo, k, id_articulo, aproximado, exacto, nprobe)
+    if "resultados" in respuesta:
+        respuesta["resultados"] = list(respuesta["resultados"])
+    return respuesta
+
+# --- Comparación por lotes ---
+
+# Pares que se puntúan juntos al generar los resultados de un lote por partes.
+TAMANO_BLOQUE_LOTE = 1000
+
+def iterar_similitud_lote(articulos, algoritmo, pares, tamano_bloque=TAMANO_BLOQUE_LOTE):
+    """
+    Calcula la similitud de una lista de pares (id1, id2) con un mismo algoritmo.
+    Cada artículo se resuelve una sola vez; los algoritmos vectorizados puntúan
+    cada bloque de pares con una única operación sobre matrices dispersas y el
+    resto usa su propio camino por lotes. Los pares con artículos inexistentes o
+    sin abstract se devuelven con su propio mensaje de error.
+
+    Devuelve {"error": ...} o {"algoritmo", "resultados"}, donde "resultados" es
+    un generador que entrega los pares en orden, bloque a bloque.
+    """
+    algoritmo_registrado = obtener_algoritmo(algoritmo)
+    if algoritmo_registrado is None:
+        return _error(f"Algoritmo '{algoritmo}' no reconocido.", ERROR_PARAMETRO_INVALIDO)
+
+    # Se resuelve cada ID una sola vez.
+    abstracts = {}
+    for id_articulo in {id_articulo for par in pares for id_articulo in par}:
+        articulo = buscar_articulo(articulos, id_articulo)
+        abstracts[id_articulo] = articulo.get('abstract', '') if articulo else None
+
+    def generar():
+        modelo = None
+        for inicio in range(0, len(pares), tamano_bloque):
+            resultados = []
+            validos = []
+            for id1, id2 in pares[inicio:inicio + tamano_bloque]:
+                resultado = {"articulo1_id": id1, "articulo2_id": id2}
+                if abstracts[id1] is None or abstracts[id2] is None:
+                    resultado["error"] = "No se encontró uno o ambos artículos."
+                elif not abstracts[id1] or not abstracts[id2]:
+                    resultado["error"] = "Uno o ambos artículos no tienen abstract."
+                else:
+                    validos.append(len(resultados))
+                resultados.append(resultado)
+
+            if validos:
+                pares_validos = [(resultados[i]["articulo1_id"], resultados[i]["articulo2_id"]) for i in validos]
+                if modelo is None:
+                    modelo = algoritmo_registrado.modelo(articulos)
+                if modelo is not None:
+                    filas1 = [modelo.fila_por_id[id1] for id1, _ in pares_validos]
+                    filas2 = [modelo.fila_por_id[id2] for _, id2 in pares_validos]
+                    puntajes = [{"similitud": round(float(p), 4)} for p in modelo.puntajes_pares(filas1, filas2)]
+                else:
+                    puntajes = algoritmo_registrado.puntuar_lote(articulos, pares_validos, abstracts)
+                for i, puntaje in zip(validos, puntajes):
+                    resultados[i].update(puntaje)
+
+            yield from resultados
+
+    return {"algoritmo": algoritmo_registrado.descripcion, "resultados": generar()}
+
+def analizar_similitud_lote(articulos, algoritmo, pares):
+    """Versión de `iterar_similitud_lote` que devuelve todos los resultados en una lista."""
+    respuesta = iterar_similitud_lote(articulos, algoritmo, pares)
+    if "resultados" in respuesta:
+        respuesta["resultados"] = list(respuesta["resultados"])
+    return respuesta
+
 # --- Ejemplo de uso (para pruebas) ---
 if __name__ == '__main__':
     lista_articulos = cargar_articulos()
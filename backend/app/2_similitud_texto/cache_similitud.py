@@ -0,0 +1,164 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+CAPACIDAD_MEMORIA = 10000
+# Filas de la tabla en disco. Al superarla se borra la fracción
+# `FRACCION_DESALOJO` de las escritas hace más tiempo.
+CAPACIDAD_DISCO = 200_000
+FRACCION_DESALOJO = 0.1
+# Se incrementa cuando cambia la forma de calcular algún puntaje (p. ej. la
+# tokenización), para que la caché en disco no devuelva resultados anteriores.
+VERSION_CACHE = 3
+
+
+def hash_texto(texto):
+    """Huella del contenido de un abstract."""
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def construir_clave(algoritmo, id1, abstract1, id2, abstract2, version_corpus=None):
+    """
+    Clave direccionada por contenido: algoritmo, los dos IDs en orden canónico y
+    la huella de ambos abstracts. Si el resultado depende de todo el corpus
+    (por ejemplo, los pesos IDF del coseno) se incluye también su versión.
+    """
+    if (id2, abstract2) < (id1, abstract1):
+        id1, abstract1, id2, abstract2 = id2, abstract2, id1, abstract1
+    partes = [f"v{VERSION_CACHE}", algoritmo, id1, id2, hash_texto(abstract1), hash_texto(abstract2)]
+    if version_corpus is not None:
+        partes.append(str(version_corpus))
+    return '|'.join(partes)
+
+
+class CacheSimilitud:
+    """
+    Caché de resultados de similitud en dos niveles: un LRU acotado en memoria
+    y, opcionalmente, una tabla SQLite que sobrevive a reinicios del servidor,
+    acotada a `capacidad_disco` filas y que se abre con el primer uso.
+
+    Como la clave incluye la huella de los abstracts, un .bib regenerado con
+    textos distintos nunca devuelve resultados viejos.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_MEMORIA, ruta_sqlite=None, capacidad_disco=CAPACIDAD_DISCO):
+        self.capacidad = capacidad
+        self.ruta_sqlite = ruta_sqlite
+        self.capacidad_disco = capacidad_disco
+        self._memoria = OrderedDict()
+        self._lock = threading.Lock()
+        self._conexion = None
+        # La base de datos se abre con el primer uso, no al importar el módulo.
+        self._abierta = False
+        self._filas_disco = 0
+
+    def _abrir(self):
+        """Abre (una sola vez) la tabla en disco, si hay ruta. Se llama con el lock tomado."""
+        if self._abierta:
+            return self._conexion
+        self._abierta = True
+        if not self.ruta_sqlite:
+            return None
+        try:
+            conexion = sqlite3.connect(self.ruta_sqlite, check_same_thread=False)
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultados (clave TEXT PRIMARY KEY, valor TEXT NOT NULL)"
+            )
+            conexion.commit()
+            self._filas_disco = conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+            self._conexion = conexion
+        except sqlite3.Error as e:
+            print(f"[ERROR] No se pudo abrir la caché en disco {self.ruta_sqlite}: {e}")
+        return self._conexion
+
+    def _desalojar_disco(self):
+        """
+        Si la tabla superó `capacidad_disco`, borra las filas escritas hace más
+        tiempo (INSERT OR REPLACE le da un rowid nuevo a cada escritura).
+        """
+        if self._filas_disco <= self.capacidad_disco:
+            return
+        self._filas_disco = self._conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+        exceso = self._filas_disco - self.capacidad_disco
+        if exceso <= 0:
+            return
+        borrar = exceso + int(self.capacidad_disco * FRACCION_DESALOJO)
+        self._conexion.execute(
+            "DELETE FROM resultados WHERE rowid IN (SELECT rowid FROM resultados ORDER BY rowid LIMIT ?)",
+            (borrar,),
+        )
+        self._filas_disco = max(0, self._filas_disco - borrar)
+
+    def obtener(self, clave):
+        """Devuelve el resultado guardado para la clave o None."""
+        with self._lock:
+            valor = self._memoria.get(clave)
+            if valor is not None:
+                self._memoria.move_to_end(clave)
+                return dict(valor)
+            conexion = self._abrir()
+            if conexion is None:
+                return None
+            try:
+                fila = conexion.execute(
+                    "SELECT valor FROM resultados WHERE clave = ?", (clave,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[ERROR] Falló la lectura de la caché en disco: {e}")
+                return None
+            if fila is None:
+                return None
+            valor = json.loads(fila[0])
+            self._guardar_memoria(clave, valor)
+            return dict(valor)
+
+    def guardar(self, clave, valor):
+        """Guarda un resultado en memoria y, si está configurado, en disco."""
+        self.guardar_varios([(clave, valor)])
+
+    def guardar_varios(self, elementos):
+        """
+        Guarda varios pares (clave, valor) con una sola transacción en disco, en
+        lugar de un commit por resultado como al llamar a `guardar` en un bucle.
+        """
+        elementos = [(clave, dict(valor)) for clave, valor in elementos]
+        if not elementos:
+            return
+        with self._lock:
+            for clave, valor in elementos:
+                self._guardar_memoria(clave, valor)
+            conexion = self._abrir()
+            if conexion is None:
+                return
+            try:
+                conexion.executemany(
+                    "INSERT OR REPLACE INTO resultados (clave, valor) VALUES (?, ?)",
+                    [(clave, json.dumps(valor)) for clave, valor in elementos],
+                )
+                # Cuenta aproximada (un reemplazo no agrega filas); se corrige al desalojar.
+                self._filas_disco += len(elementos)
+                self._desalojar_disco()
+                conexion.commit()
+            except sqlite3.Error as e:
+                print(f"[ERROR] Falló la escritura de la caché en disco: {e}")
+
+    def _guardar_memoria(self, clave, valor):
+        self._memoria[clave] = valor
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.capacidad:
+            self._memoria.popitem(last=False)
+
+    def limpiar(self):
+        """Vacía ambos niveles de la caché."""
+        with self._lock:
+            self._memoria.clear()
+            conexion = self._abrir()
+            if conexion is not None:
+                conexion.execute("DELETE FROM resultados")
+                conexion.commit()
+                self._filas_disco = 0
+
+    def __len__(self):
+        return len(self._memoria)
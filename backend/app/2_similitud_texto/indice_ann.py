@@ -0,0 +1,175 @@
+import os
+
+import numpy as np
+from sklearn.random_projection import SparseRandomProjection
+
+# Dimensión de la proyección aleatoria de los vectores TF-IDF.
+DIMENSION_PROYECCION = 128
+# Listas invertidas que se revisan por consulta. Es el control entre recall y
+# latencia: más listas dan más recall y más costo.
+NPROBE = 8
+ITERACIONES_KMEANS = 15
+# Filas que se asignan a su centroide por bloque en k-means: acota la matriz
+# densa de similitudes a este número de filas x número de listas.
+FILAS_POR_BLOQUE_ASIGNACION = 8192
+SEMILLA = 1
+# Versión del formato del archivo persistido.
+VERSION_FORMATO = 1
+
+
+def _normalizar_filas(matriz):
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return matriz / normas
+
+
+def _asignar(vectores, centroides, filas_por_bloque=None):
+    """Índice del centroide más parecido a cada vector, calculado por bloques de filas."""
+    filas_por_bloque = filas_por_bloque or FILAS_POR_BLOQUE_ASIGNACION
+    asignacion = np.empty(len(vectores), dtype=np.int32)
+    for inicio in range(0, len(vectores), filas_por_bloque):
+        bloque = vectores[inicio:inicio + filas_por_bloque]
+        asignacion[inicio:inicio + len(bloque)] = np.argmax(bloque @ centroides.T, axis=1)
+    return asignacion
+
+
+class IndiceANN:
+    """
+    Índice aproximado de vecinos más cercanos (IVF) sobre los vectores TF-IDF.
+
+    Los vectores dispersos se proyectan a `DIMENSION_PROYECCION` dimensiones con
+    una proyección aleatoria dispersa y se agrupan con k-means esférico. Cada
+    grupo es una lista invertida; una consulta solo revisa las `nprobe` listas
+    cuyos centroides son más parecidos al artículo y puntúa sus candidatos.
+    """
+
+    def __init__(self, ids, vectores, centroides, asignacion, version=None):
+        self.ids = list(ids)
+        self.fila_por_id = {id_articulo: fila for fila, id_articulo in enumerate(self.ids)}
+        self.vectores = vectores
+        self.centroides = centroides
+        self.asignacion = asignacion
+        self.version = version
+        # Listas invertidas: filas de cada grupo.
+        orden = np.argsort(asignacion, kind='stable')
+        limites = np.searchsorted(asignacion[orden], np.arange(len(centroides) + 1))
+        self.listas = [orden[limites[i]:limites[i + 1]] for i in range(len(centroides))]
+
+    @classmethod
+    def construir(cls, ids, matriz_tfidf, num_listas=None, dimension=DIMENSION_PROYECCION,
+                  iteraciones=ITERACIONES_KMEANS, semilla=SEMILLA, version=None):
+        """
+        Construye el índice a partir de la matriz TF-IDF (filas normalizadas).
+        Por defecto se usan sqrt(N) listas. La asignación de k-means se hace por
+        bloques de `FILAS_POR_BLOQUE_ASIGNACION` filas, sin materializar la
+        matriz densa N x sqrt(N) de similitudes.
+        """
+        generador = np.random.RandomState(semilla)
+        n = matriz_tfidf.shape[0]
+        # Proyección dispersa (Achlioptas/Li): no materializa una matriz densa
+        # de vocabulario x dimensión.
+        proyeccion = SparseRandomProjection(n_components=dimension, dense_output=True, random_state=semilla)
+        vectores = _normalizar_filas(np.asarray(proyeccion.fit_transform(matriz_tfidf), dtype=np.float32))
+
+        num_listas = max(1, min(n, num_listas or int(np.sqrt(n))))
+        centroides = vectores[generador.choice(n, num_listas, replace=False)].copy()
+        asignacion = np.zeros(n, dtype=np.int32)
+        for _ in range(iteraciones):
+            asignacion = _asignar(vectores, centroides)
+            sumas = np.zeros_like(centroides)
+            np.add.at(sumas, asignacion, vectores)
+            vacios = ~np.any(sumas, axis=1)
+            # Los grupos vacíos se reinician con un vector al azar.
+            sumas[vacios] = vectores[generador.choice(n, int(vacios.sum()))]
+            centroides = _normalizar_filas(sumas)
+        asignacion = _asignar(vectores, centroides)
+        return cls(ids, vectores, centroides, asignacion, version)
+
+    def candidatos(self, fila, nprobe=NPROBE):
+        """Filas de las `nprobe` listas más cercanas al vector de la fila (sin incluirla)."""
+        nprobe = max(1, min(nprobe, len(self.centroides)))
+        similitudes = self.centroides @ self.vectores[fila]
+        listas = np.argpartition(-similitudes, nprobe - 1)[:nprobe]
+        candidatos = np.concatenate([self.listas[i] for i in listas])
+        return candidatos[candidatos != fila]
+
+    def buscar(self, id_articulo, k=10, nprobe=NPROBE, matriz_tfidf=None):
+        """
+        Devuelve hasta k pares (id, similitud) de mayor a menor, o None si el
+        artículo no está en el índice. Si se pasa la matriz TF-IDF, los
+        candidatos se puntúan con la similitud de coseno exacta; si no, con la
+        de los vectores proyectados.
+        """
+        fila = self.fila_por_id.get(id_articulo)
+        if fila is None:
+            return None
+        candidatos = self.candidatos(fila, nprobe)
+        if len(candidatos) == 0:
+            return []
+        if matriz_tfidf is not None:
+            puntajes = (matriz_tfidf[candidatos] @ matriz_tfidf[fila].T).toarray().ravel()
+        else:
+            puntajes = self.vectores[candidatos] @ self.vectores[fila]
+        k = min(k, len(candidatos))
+        mejores = np.argpartition(-puntajes, k - 1)[:k]
+        mejores = mejores[np.argsort(-puntajes[mejores], kind='stable')]
+        return [(self.ids[candidatos[i]], float(puntajes[i])) for i in mejores]
+
+    def guardar(self, ruta):
+        """Guarda el índice en un archivo .npz."""
+        version = np.array(self.version if self.version is not None else (-1, -1), dtype=np.int64)
+        with open(ruta, 'wb') as archivo:
+            np.savez_compressed(
+                archivo,
+                ids=np.array(self.ids, dtype=str),
+                vectores=self.vectores,
+                centroides=self.centroides,
+                asignacion=self.asignacion,
+                formato=np.array([VERSION_FORMATO], dtype=np.int64),
+                version=version,
+            )
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un índice guardado con `guardar`. Devuelve None si no existe, está dañado o es de otro formato."""
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta) as datos:
+                if int(datos['formato'][0]) != VERSION_FORMATO:
+                    return None
+                version = tuple(int(v) for v in datos['version'])
+                return cls(datos['ids'].tolist(), datos['vectores'], datos['centroides'], datos['asignacion'],
+                           None if version == (-1, -1) else version)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[ERROR] No se pudo cargar el índice ANN de {ruta}: {e}")
+            return None
+
+
+def obtener_indice(modelo, ruta, reconstruir=False):
+    """
+    Carga el índice persistido en `ruta` si corresponde a la versión del modelo
+    TF-IDF; si no (o si se pide `reconstruir`), lo construye y lo guarda.
+    """
+    if not reconstruir and modelo.version is not None:
+        indice = IndiceANN.cargar(ruta)
+        if indice is not None and indice.version == modelo.version and indice.ids == modelo.ids:
+            return indice
+
+    indice = IndiceANN.construir(modelo.ids, modelo.matriz, version=modelo.version)
+    if modelo.version is not None:
+        try:
+            indice.guardar(ruta)
+            print(f"[INFO] Índice ANN guardado en: {ruta}")
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar el índice ANN: {e}")
+    return indice
+
+
+# --- Construcción del índice fuera de línea ---
+if __name__ == '__main__':
+    import analizador_similitud
+
+    lista_articulos = analizador_similitud.cargar_articulos()
+    if lista_articulos:
+        analizador_similitud.obtener_indice_ann(lista_articulos, reconstruir=True)
@@ -0,0 +1,394 @@
+"""
+Motores para la distancia de Levenshtein.
+
+- `distancia_bit_paralela`: algoritmo bit-paralelo de Myers/Hyyrö. Cada columna
+  de la matriz de programación dinámica se representa con enteros de Python
+  usados como vectores de bits, por lo que el costo es O(n) operaciones sobre
+  enteros de m bits en lugar de O(n·m) operaciones en Python.
+- `distancia_banda`: programación dinámica restringida a la banda diagonal de
+  ancho 2k+1 (corte de Ukkonen). Se detiene en cuanto toda la banda supera k.
+- `distancia_clasica`: la versión de referencia fila por fila.
+- `distancia_con_presupuesto`: distancia exacta si el costo bit-paralelo cabe
+  en el presupuesto y, si no, una cota superior que suma la distancia exacta
+  de tramos alineados sobre la diagonal (`distancia_por_bloques`).
+- `distancias_vectoriales`: una consulta contra muchos textos a la vez con
+  operaciones de NumPy sobre filas int16/int32 (textos como code points uint32).
+
+`distancias_en_paralelo` reparte lotes de pares entre varios procesos, ya que
+el cálculo es intensivo en CPU y el GIL lo limita a un solo núcleo.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Por debajo de este ancho de banda la programación dinámica en banda es más
+# rápida en Python que el algoritmo bit-paralelo sobre abstracts completos.
+ANCHO_BANDA_MAXIMO = 15
+
+# Costo estimado (suma de len(a)·len(b)) a partir del cual compensa arrancar
+# procesos; por debajo el lote se calcula en el proceso actual.
+COSTO_MINIMO_PARALELO = 10 ** 8
+# Bloques que se generan por proceso para equilibrar la carga entre núcleos.
+BLOQUES_POR_PROCESO = 4
+
+# Longitud de consulta hasta la que el motor vectorial de NumPy es más rápido
+# que el bit-paralelo; con consultas más largas (abstracts completos) el
+# bit-paralelo procesa 64 celdas por operación y gana.
+LONGITUD_MAXIMA_VECTORIAL = 256
+# Celdas (textos x caracteres) por bloque del motor vectorial, para que las
+# filas de trabajo quepan en la caché del procesador.
+CELDAS_POR_BLOQUE = 2 ** 16
+# Relleno de los textos más cortos del bloque; no es un code point válido.
+RELLENO = 0xFFFFFFFF
+
+
+def distancia_clasica(s1, s2):
+    """
+    Calcula la distancia de Levenshtein con la programación dinámica clásica.
+    Se conserva como implementación de referencia.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+def distancia_bit_paralela(s1, s2, max_distance=None):
+    """
+    Calcula la distancia de Levenshtein con el algoritmo bit-paralelo de Myers
+    (formulación de Hyyrö). El patrón es la cadena más corta.
+
+    Si se indica `max_distance`, el cálculo se detiene en cuanto la distancia
+    final no puede ser menor o igual que ese umbral y se devuelve max_distance + 1.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    patron, texto = s2, s1
+    m, n = len(patron), len(texto)
+    if max_distance is not None and n - m > max_distance:
+        return max_distance + 1
+    if m == 0:
+        return n
+
+    # Máscara de coincidencias: para cada carácter, los bits de las posiciones
+    # del patrón donde aparece.
+    peq = {}
+    for i, caracter in enumerate(patron):
+        peq[caracter] = peq.get(caracter, 0) | (1 << i)
+
+    mascara = (1 << m) - 1
+    ultimo_bit = 1 << (m - 1)
+    pv = mascara  # Diferencias verticales +1
+    mv = 0        # Diferencias verticales -1
+    distancia = m
+
+    for j, caracter in enumerate(texto):
+        eq = peq.get(caracter, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mascara)
+        mh = pv & xh
+        if ph & ultimo_bit:
+            distancia += 1
+        elif mh & ultimo_bit:
+            distancia -= 1
+        ph = ((ph << 1) | 1) & mascara
+        mh = (mh << 1) & mascara
+        pv = mh | (~(xv | ph) & mascara)
+        mv = ph & xv
+        # Cada columna restante puede reducir la distancia a lo sumo en 1.
+        if max_distance is not None and distancia - (n - j - 1) > max_distance:
+            return max_distance + 1
+
+    return distancia
+
+
+def distancia_banda(s1, s2, max_distance):
+    """
+    Calcula la distancia de Levenshtein evaluando solo las celdas a distancia
+    diagonal <= max_distance (algoritmo de Ukkonen). Si la distancia supera el
+    umbral se devuelve max_distance + 1 sin terminar de recorrer la matriz.
+    """
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    n, m = len(s1), len(s2)
+    k = max_distance
+    if n - m > k:
+        return k + 1
+    if m == 0:
+        return n
+
+    fuera = k + 1
+    # Fila 0 dentro de la banda: columnas 0..min(m, k).
+    previous_row = {j: j for j in range(min(m, k) + 1)}
+    for i in range(1, n + 1):
+        c1 = s1[i - 1]
+        inicio = max(0, i - k)
+        fin = min(m, i + k)
+        current_row = {}
+        minimo_fila = fuera
+        for j in range(inicio, fin + 1):
+            if j == 0:
+                valor = i
+            else:
+                valor = min(
+                    previous_row.get(j, fuera) + 1,
+                    current_row.get(j - 1, fuera) + 1,
+                    previous_row.get(j - 1, fuera) + (c1 != s2[j - 1]),
+                )
+            if valor > fuera:
+                valor = fuera
+            current_row[j] = valor
+            if valor < minimo_fila:
+                minimo_fila = valor
+        # Corte de Ukkonen: si toda la banda supera el umbral, no puede bajar.
+        if minimo_fila > k:
+            return fuera
+        previous_row = current_row
+    return min(previous_row.get(m, fuera), fuera)
+
+
+def distancia_por_bloques(s1, s2, bloques):
+    """
+    Aproximación por bloques diagonales: corta ambas secuencias en `bloques`
+    tramos proporcionales a su longitud y suma la distancia exacta
+    (bit-paralela) de cada par de tramos. Unir las ediciones de cada tramo da
+    una edición válida de la secuencia completa, así que el resultado es una
+    cota superior de la distancia (exacta con un solo bloque). Cuesta
+    n·⌈m/(64·bloques)⌉ operaciones sobre palabras de 64 bits en lugar de n·⌈m/64⌉.
+    """
+    n, m = len(s1), len(s2)
+    bloques = max(1, min(bloques, n, m)) if n and m else 1
+    limites1 = [round(b * n / bloques) for b in range(bloques + 1)]
+    limites2 = [round(b * m / bloques) for b in range(bloques + 1)]
+    return sum(
+        distancia_bit_paralela(s1[limites1[b]:limites1[b + 1]], s2[limites2[b]:limites2[b + 1]])
+        for b in range(bloques)
+    )
+
+
+def distancia_con_presupuesto(s1, s2, presupuesto=None):
+    """
+    Distancia de Levenshtein con un presupuesto de trabajo, medido como el costo
+    del algoritmo bit-paralelo: n·⌈m/64⌉ operaciones sobre palabras de 64 bits
+    (n y m, longitudes de la secuencia larga y la corta). Si el costo exacto
+    cabe en el presupuesto (o no se indica) se calcula la distancia exacta; si
+    no, `distancia_por_bloques` con los bloques mínimos para que quepa.
+    Devuelve (distancia, aproximada).
+
+    El costo no baja de n (una operación por elemento de la secuencia larga):
+    si la corta ocupa una sola palabra, la distancia exacta ya es lo más barato
+    y se calcula aunque supere el presupuesto.
+
+    Sirve para cualquier secuencia de elementos comparables, por ejemplo las
+    secuencias de IDs de tokens de un abstract.
+    """
+    n, m = max(len(s1), len(s2)), min(len(s1), len(s2))
+    if presupuesto is None or m == 0:
+        return distancia_bit_paralela(s1, s2), False
+    # Elementos de la secuencia corta por bloque para que n·⌈(m/bloques)/64⌉ quepa.
+    por_bloque = 64 * max(1, presupuesto // n)
+    bloques = -(-m // por_bloque)
+    if bloques == 1:
+        return distancia_bit_paralela(s1, s2), False
+    return distancia_por_bloques(s1, s2, bloques), True
+
+
+def codificar(texto):
+    """Code points del texto como arreglo uint32."""
+    return np.frombuffer(texto.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _distancias_vectoriales_bloque(consulta, objetivos):
+    """
+    Programación dinámica de la consulta contra un bloque de textos codificados.
+    Las columnas del bloque son los textos y cada paso procesa un carácter de la
+    consulta para todos a la vez.
+
+    Se guarda E[j] = D[j] - j: así la dependencia con la celda izquierda
+    (inserción) se resuelve con un mínimo acumulado sobre la columna.
+    """
+    longitudes = np.array([len(objetivo) for objetivo in objetivos], dtype=np.int64)
+    largo = int(longitudes.max())
+    tipo = np.int16 if max(len(consulta), largo) < np.iinfo(np.int16).max - 1 else np.int32
+
+    textos = np.full((largo, len(objetivos)), RELLENO, dtype=np.uint32)
+    for columna, objetivo in enumerate(objetivos):
+        textos[:len(objetivo), columna] = objetivo
+
+    fila = np.zeros((largo + 1, len(objetivos)), dtype=tipo)
+    siguiente = np.empty_like(fila)
+    coincide = np.empty((largo, len(objetivos)), dtype=tipo)
+    for i, caracter in enumerate(consulta, 1):
+        np.equal(textos, caracter, out=coincide, casting='unsafe')
+        # Sustitución (o coincidencia) desde la diagonal.
+        np.subtract(fila[:-1], coincide, out=siguiente[1:])
+        # Borrado desde la fila anterior.
+        fila += 1
+        np.minimum(siguiente[1:], fila[1:], out=siguiente[1:])
+        siguiente[0] = i
+        # Inserción desde la izquierda.
+        np.minimum.accumulate(siguiente, axis=0, out=fila)
+    return fila[longitudes, np.arange(len(objetivos))] + longitudes
+
+
+def distancias_vectoriales(consulta, textos, celdas_por_bloque=CELDAS_POR_BLOQUE):
+    """
+    Distancia de Levenshtein exacta de `consulta` a cada uno de `textos`. Los
+    textos se ordenan por longitud y se agrupan en bloques de tamaño parecido
+    para no desperdiciar cálculo en el relleno.
+    """
+    if not textos:
+        return []
+    consulta = codificar(consulta)
+    codificados = [codificar(texto) for texto in textos]
+    orden = sorted(range(len(textos)), key=lambda i: len(codificados[i]))
+
+    distancias = np.empty(len(textos), dtype=np.int64)
+    inicio = 0
+    while inicio < len(orden):
+        fin = inicio + 1
+        while fin < len(orden) and (fin - inicio + 1) * len(codificados[orden[fin]]) <= celdas_por_bloque:
+            fin += 1
+        bloque = orden[inicio:fin]
+        distancias[bloque] = _distancias_vectoriales_bloque(consulta, [codificados[i] for i in bloque])
+        inicio = fin
+    return distancias.tolist()
+
+
+def distancias_uno_contra_muchos(consulta, textos, max_distance=None, max_workers=None):
+    """
+    Distancia de Levenshtein de un texto a una lista de textos, en el mismo
+    orden. Las consultas cortas usan el motor vectorial; las largas (abstracts
+    completos), o las que tienen umbral, se calculan por pares con
+    `distancias_en_paralelo`, que reparte el lote entre procesos si su costo lo
+    justifica.
+    """
+    if max_distance is None and len(consulta) <= LONGITUD_MAXIMA_VECTORIAL:
+        return distancias_vectoriales(consulta, textos)
+    # La consulta es el texto 0 y cada objetivo, el texto i + 1.
+    pares = [(0, i) for i in range(1, len(textos) + 1)]
+    return distancias_en_paralelo(pares, [consulta, *textos], max_workers, max_distance)
+
+
+def calcular_distancia(s1, s2, max_distance=None):
+    """
+    Calcula la distancia de Levenshtein eligiendo el motor más rápido.
+
+    Sin `max_distance` se usa el algoritmo bit-paralelo (resultado exacto). Con
+    umbral se devuelve la distancia exacta si es <= max_distance y, en caso
+    contrario, max_distance + 1.
+    """
+    if max_distance is not None:
+        if max_distance < 0:
+            raise ValueError("max_distance debe ser un entero no negativo.")
+        if 2 * max_distance + 1 <= ANCHO_BANDA_MAXIMO:
+            return distancia_banda(s1, s2, max_distance)
+    return distancia_bit_paralela(s1, s2, max_distance)
+
+
+def _distancias_bloque(textos, pares, max_distance):
+    """Tarea de cada proceso: distancias de los pares (índices sobre `textos`)."""
+    return [calcular_distancia(textos[i], textos[j], max_distance) for i, j in pares]
+
+
+def _dividir_en_bloques(pares, textos, num_bloques):
+    """
+    Agrupa los pares en bloques de costo similar (len(a)·len(b)). Cada bloque
+    lleva solo los textos que necesita, reindexados localmente, para no enviar
+    el corpus completo a cada proceso. Devuelve (posiciones, textos, pares).
+    """
+    costos = [len(textos[a]) * len(textos[b]) for a, b in pares]
+    costo_objetivo = max(1, sum(costos) // num_bloques)
+    # Primero los pares más costosos, para que los bloques queden parejos.
+    orden = sorted(range(len(pares)), key=lambda i: costos[i], reverse=True)
+
+    bloques = []
+    posiciones, textos_bloque, pares_bloque, indice_local = [], [], [], {}
+    costo_bloque = 0
+    for posicion in orden:
+        par_local = []
+        for clave in pares[posicion]:
+            if clave not in indice_local:
+                indice_local[clave] = len(textos_bloque)
+                textos_bloque.append(textos[clave])
+            par_local.append(indice_local[clave])
+        posiciones.append(posicion)
+        pares_bloque.append(tuple(par_local))
+        costo_bloque += costos[posicion]
+        if costo_bloque >= costo_objetivo:
+            bloques.append((posiciones, textos_bloque, pares_bloque))
+            posiciones, textos_bloque, pares_bloque, indice_local = [], [], [], {}
+            costo_bloque = 0
+    if posiciones:
+        bloques.append((posiciones, textos_bloque, pares_bloque))
+    return bloques
+
+
+def _procesos(max_workers):
+    return max_workers or os.cpu_count() or 1
+
+
+def conviene_paralelo(pares, textos, max_workers=None):
+    """Si el lote justifica repartirlo entre procesos: más de un núcleo y costo estimado alto."""
+    if _procesos(max_workers) == 1 or not pares:
+        return False
+    return sum(len(textos[a]) * len(textos[b]) for a, b in pares) >= COSTO_MINIMO_PARALELO
+
+
+def crear_pool(max_workers=None):
+    """
+    Pool de procesos para `distancias_en_paralelo`. Crearlo una vez y pasarlo
+    en cada llamada evita pagar el arranque de los procesos en cada lote.
+    """
+    # 'spawn' evita heredar hilos y locks del servidor al crear los procesos.
+    contexto = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=_procesos(max_workers), mp_context=contexto)
+
+
+def distancias_en_paralelo(pares, textos, max_workers=None, max_distance=None, executor=None):
+    """
+    Calcula la distancia de Levenshtein de cada par (clave1, clave2), donde las
+    claves indexan `textos` (lista o diccionario). Devuelve las distancias en el
+    mismo orden que `pares`.
+
+    Si el costo total estimado es bajo o solo hay un núcleo, se calcula en el
+    proceso actual; si no, los pares se reparten en bloques entre procesos. Con
+    `executor` (ver `crear_pool`) se usa ese pool; si no, se crea uno para este
+    lote.
+    """
+    if not pares:
+        return []
+    if not conviene_paralelo(pares, textos, max_workers):
+        return [calcular_distancia(textos[a], textos[b], max_distance) for a, b in pares]
+
+    distancias = [None] * len(pares)
+    bloques = _dividir_en_bloques(pares, textos, _procesos(max_workers) * BLOQUES_POR_PROCESO)
+    propio = executor is None
+    if propio:
+        executor = crear_pool(min(_procesos(max_workers), len(bloques)))
+    try:
+        futuros = [
+            (posiciones, executor.submit(_distancias_bloque, textos_bloque, pares_bloque, max_distance))
+            for posiciones, textos_bloque, pares_bloque in bloques
+        ]
+        for posiciones, futuro in futuros:
+            for posicion, distancia in zip(posiciones, futuro.result()):
+                distancias[posicion] = distancia
+    finally:
+        if propio:
+            executor.shutdown()
+    return distancias
@@ -0,0 +1,239 @@
+import heapq
+import threading
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+try:
+    from . import levenshtein
+    from . import tokenizacion
+except ImportError:  # Ejecución directa como script
+    import levenshtein
+    import tokenizacion
+
+# Número de filas que se multiplican a la vez contra toda la matriz. Limita la
+# memoria a tamano_bloque x N puntajes densos en lugar de N x N.
+TAMANO_BLOQUE = 256
+# Filas por bloque en los algoritmos que puntúan pares sueltos (Levenshtein).
+FILAS_POR_BLOQUE = 32
+
+
+class ModeloJaccard:
+    """
+    Matriz binaria dispersa (documentos x tokens) con el conjunto de tokens de
+    cada abstract, construida a partir de la tokenización compartida del corpus.
+    """
+
+    def __init__(self, corpus_tokenizado, version=None):
+        self.version = version
+        self.ids = corpus_tokenizado.ids
+        self.fila_por_id = {id_articulo: fila for fila, id_articulo in enumerate(self.ids)}
+
+        conjuntos = [corpus_tokenizado.documentos[id_articulo].unicos for id_articulo in self.ids]
+        # Tamaño del conjunto de tokens de cada documento.
+        self.tamanos = np.array([len(conjunto) for conjunto in conjuntos], dtype=np.float64)
+        if not conjuntos:
+            self.matriz = None
+            return
+        indptr = np.concatenate(([0], np.cumsum(self.tamanos, dtype=np.int64)))
+        indices = np.concatenate(conjuntos)
+        self.matriz = csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(conjuntos), len(corpus_tokenizado.vocabulario)),
+        )
+
+    def puntajes_bloque(self, filas):
+        """Índice de Jaccard de las filas dadas contra todo el corpus (matriz densa)."""
+        interseccion = (self.matriz[filas] @ self.matriz.T).toarray()
+        union = self.tamanos[filas][:, None] + self.tamanos[None, :] - interseccion
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(union > 0, interseccion / union, 0.0)
+
+    def puntajes_pares(self, filas1, filas2):
+        """Índice de Jaccard de cada par (filas1[i], filas2[i]) en una sola operación."""
+        interseccion = np.asarray(self.matriz[filas1].multiply(self.matriz[filas2]).sum(axis=1)).ravel()
+        union = self.tamanos[filas1] + self.tamanos[filas2] - interseccion
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(union > 0, interseccion / union, 0.0)
+
+
+class ModeloCosenoBloques:
+    """Adaptador del modelo TF-IDF para calcular puntajes por bloques de filas."""
+
+    def __init__(self, modelo):
+        self.ids = modelo.ids
+        self.fila_por_id = modelo.fila_por_id
+        self.matriz = modelo.matriz
+
+    def puntajes_bloque(self, filas):
+        """Similitud de coseno de las filas dadas contra todo el corpus (matriz densa)."""
+        return (self.matriz[filas] @ self.matriz.T).toarray()
+
+    def puntajes_pares(self, filas1, filas2):
+        """Similitud de coseno de cada par (filas1[i], filas2[i]) en una sola operación."""
+        return np.asarray(self.matriz[filas1].multiply(self.matriz[filas2]).sum(axis=1)).ravel()
+
+
+_modelo_jaccard = None
+_lock = threading.Lock()
+
+
+def obtener_modelo_jaccard(articulos):
+    """
+    Devuelve la matriz de conjuntos de tokens del corpus, construyéndola solo
+    cuando cambia la versión del corpus.
+    """
+    global _modelo_jaccard
+    version = getattr(articulos, 'version', None)
+    if version is None:
+        return ModeloJaccard(tokenizacion.obtener_corpus_tokenizado(articulos))
+
+    modelo = _modelo_jaccard
+    if modelo is not None and modelo.version == version:
+        return modelo
+    with _lock:
+        if _modelo_jaccard is None or _modelo_jaccard.version != version:
+            _modelo_jaccard = ModeloJaccard(tokenizacion.obtener_corpus_tokenizado(articulos), version)
+        return _modelo_jaccard
+
+
+def _top_k_fila(puntajes, k, excluir):
+    """Índices de los k puntajes más altos de una fila, sin la columna `excluir`."""
+    puntajes = puntajes.copy()
+    puntajes[excluir] = -np.inf
+    k = min(k, len(puntajes) - 1)
+    if k <= 0:
+        return []
+    candidatos = np.argpartition(-puntajes, k - 1)[:k]
+    return candidatos[np.argsort(-puntajes[candidatos], kind='stable')]
+
+
+def iterar_top_k_por_bloques(modelo, k, filas_consulta=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Calcula los k vecinos más similares de cada fila de consulta multiplicando
+    bloques de filas contra toda la matriz. Genera (id, [(id_vecino, similitud), ...])
+    a medida que se completa cada bloque.
+    """
+    if modelo.matriz is None:
+        return
+    if filas_consulta is None:
+        filas_consulta = range(len(modelo.ids))
+    filas_consulta = list(filas_consulta)
+
+    for inicio in range(0, len(filas_consulta), tamano_bloque):
+        bloque = filas_consulta[inicio:inicio + tamano_bloque]
+        puntajes = modelo.puntajes_bloque(bloque)
+        for posicion, fila in enumerate(bloque):
+            vecinos = _top_k_fila(puntajes[posicion], k, fila)
+            yield (
+                modelo.ids[fila],
+                [(modelo.ids[v], float(puntajes[posicion, v])) for v in vecinos],
+            )
+
+
+def top_k_por_bloques(modelo, k, filas_consulta=None, tamano_bloque=TAMANO_BLOQUE):
+    """Versión de `iterar_top_k_por_bloques` que devuelve la lista completa."""
+    return list(iterar_top_k_por_bloques(modelo, k, filas_consulta, tamano_bloque))
+
+
+def iterar_top_k_pares(ids, k, puntuar, filas_consulta=None, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Top-k para algoritmos que puntúan pares sueltos. `puntuar` recibe una lista
+    de pares de filas (i, j) y devuelve sus similitudes.
+
+    Sin filas de consulta cada par se evalúa una sola vez: las filas se recorren
+    en bloques y, para cada fila i del bloque, se puntúan los pares (i, j > i).
+    Al terminar el bloque, sus filas ya vieron todos sus pares y se generan sin
+    esperar al resto, de modo que la memoria no crece con N x N.
+    """
+    n = len(ids)
+    if filas_consulta is not None:
+        for inicio in range(0, len(filas_consulta), filas_por_bloque):
+            bloque = filas_consulta[inicio:inicio + filas_por_bloque]
+            pares = [(fila, otra) for fila in bloque for otra in range(n) if otra != fila]
+            heaps = {fila: [] for fila in bloque}
+            for (i, j), puntaje in zip(pares, puntuar(pares)):
+                agregar_heap(heaps[i], k, puntaje, j)
+            for fila in bloque:
+                yield _resultado_heap(ids, fila, heaps[fila])
+        return
+
+    heaps = {}
+    for inicio in range(0, n, filas_por_bloque):
+        bloque = range(inicio, min(n, inicio + filas_por_bloque))
+        pares = [(i, j) for i in bloque for j in range(i + 1, n)]
+        for (i, j), puntaje in zip(pares, puntuar(pares)):
+            agregar_heap(heaps.setdefault(i, []), k, puntaje, j)
+            agregar_heap(heaps.setdefault(j, []), k, puntaje, i)
+        for fila in bloque:
+            yield _resultado_heap(ids, fila, heaps.pop(fila, []))
+
+
+def _resultado_heap(ids, fila, heap):
+    ordenados = sorted(heap, reverse=True)
+    return ids[fila], [(ids[-indice], puntaje) for puntaje, indice in ordenados]
+
+
+def similitud_levenshtein(abstract1, abstract2, distancia=None):
+    """Similitud normalizada 1 - distancia / longitud máxima."""
+    longitud_max = max(len(abstract1), len(abstract2))
+    if longitud_max == 0:
+        return 1.0
+    if distancia is None:
+        distancia = levenshtein.calcular_distancia(abstract1, abstract2)
+    return 1 - distancia / longitud_max
+
+
+def iterar_top_k_levenshtein(ids, abstracts, k, filas_consulta=None, max_workers=None):
+    """
+    Genera los k vecinos más similares según Levenshtein. Todos contra todos, las
+    distancias de cada bloque de filas se reparten con `distancias_en_paralelo`
+    entre los procesos de un único pool, reutilizado en todos los bloques; con
+    filas de consulta, cada una se compara contra el resto en una sola llamada a
+    `distancias_uno_contra_muchos` (motor vectorial para consultas cortas y,
+    para abstracts completos, el mismo reparto entre procesos).
+    """
+    if filas_consulta is not None:
+        for fila in filas_consulta:
+            otras = [otra for otra in range(len(ids)) if otra != fila]
+            distancias = levenshtein.distancias_uno_contra_muchos(
+                abstracts[fila], [abstracts[otra] for otra in otras], max_workers=max_workers
+            )
+            heap = []
+            for otra, distancia in zip(otras, distancias):
+                agregar_heap(heap, k, similitud_levenshtein(abstracts[fila], abstracts[otra], distancia), otra)
+            yield _resultado_heap(ids, fila, heap)
+        return
+
+    # Un solo pool para todos los bloques, creado con el primero que lo necesita.
+    pool = None
+
+    def puntuar(pares):
+        nonlocal pool
+        if pool is None and levenshtein.conviene_paralelo(pares, abstracts, max_workers):
+            pool = levenshtein.crear_pool(max_workers)
+        distancias = levenshtein.distancias_en_paralelo(pares, abstracts, max_workers, executor=pool)
+        return [similitud_levenshtein(abstracts[i], abstracts[j], d) for (i, j), d in zip(pares, distancias)]
+
+    try:
+        yield from iterar_top_k_pares(ids, k, puntuar)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def top_k_levenshtein(ids, abstracts, k, filas_consulta=None, max_workers=None):
+    """Versión de `iterar_top_k_levenshtein` que devuelve la lista completa."""
+    return list(iterar_top_k_levenshtein(ids, abstracts, k, filas_consulta, max_workers))
+
+
+def agregar_heap(heap, k, puntaje, indice):
+    """Mantiene en `heap` los k pares (puntaje, índice) más altos."""
+    if k <= 0:
+        return
+    # A igual puntaje se prefiere el índice menor.
+    elemento = (puntaje, -indice)
+    if len(heap) < k:
+        heapq.heappush(heap, elemento)
+    elif elemento > heap[0]:
+        heapq.heapreplace(heap, elemento)
@@ -0,0 +1,200 @@
+import hashlib
+import os
+from collections import defaultdict
+
+import numpy as np
+
+try:
+    from . import tokenizacion
+except ImportError:  # Ejecución directa como script
+    import tokenizacion
+
+# Primo de Mersenne 2^61 - 1 para la familia de hashes (a·x + b) mod p.
+PRIMO_MERSENNE = np.uint64((1 << 61) - 1)
+MAXIMO_HASH = np.uint64((1 << 32) - 1)
+
+NUM_PERMUTACIONES = 128
+# 64 bandas de 2 filas: umbral aproximado (1/64)^(1/2) ≈ 0.125, adecuado para
+# abstracts, cuyo índice de Jaccard entre artículos afines ronda 0.15-0.3.
+NUM_BANDAS = 64
+SEMILLA = 1
+# Versión del formato de las firmas persistidas; cambia si cambia la tokenización.
+VERSION_FORMATO = 2
+
+
+def hash_token(token):
+    """Hash estable de 32 bits (no depende de PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+class IndiceMinHash:
+    """
+    Firmas MinHash de los abstracts del corpus con un índice LSH por bandas.
+
+    La firma de cada documento tiene `num_perm` valores; la fracción de valores
+    iguales entre dos firmas estima su índice de Jaccard. Las firmas se dividen
+    en `num_bandas` bandas y dos documentos son candidatos si coinciden en al
+    menos una banda completa, lo que evita recorrer todo el corpus.
+    """
+
+    def __init__(self, ids, firmas, num_perm, num_bandas, semilla, version=None):
+        if num_perm % num_bandas != 0:
+            raise ValueError("num_perm debe ser múltiplo de num_bandas.")
+        self.ids = list(ids)
+        self.fila_por_id = {id_articulo: fila for fila, id_articulo in enumerate(self.ids)}
+        self.firmas = firmas
+        self.num_perm = num_perm
+        self.num_bandas = num_bandas
+        self.semilla = semilla
+        self.version = version
+        self.corpus_tokenizado = None
+        self._construir_buckets()
+
+    @staticmethod
+    def _permutaciones(num_perm, semilla):
+        generador = np.random.RandomState(semilla)
+        a = generador.randint(1, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        b = generador.randint(0, (1 << 61) - 1, size=num_perm, dtype=np.uint64)
+        return a, b
+
+    @staticmethod
+    def calcular_firma(hashes, a, b):
+        """Calcula la firma MinHash a partir de los hashes de los tokens distintos."""
+        if len(hashes) == 0:
+            return np.full(len(a), MAXIMO_HASH, dtype=np.uint64)
+        # El producto desborda a 64 bits de forma intencional, como en datasketch.
+        with np.errstate(over='ignore'):
+            valores = ((a[:, None] * hashes[None, :] + b[:, None]) % PRIMO_MERSENNE) & MAXIMO_HASH
+        return valores.min(axis=1)
+
+    @classmethod
+    def construir(cls, articulos, num_perm=NUM_PERMUTACIONES, num_bandas=NUM_BANDAS, semilla=SEMILLA):
+        """Construye el índice a partir de la tokenización compartida del corpus."""
+        a, b = cls._permutaciones(num_perm, semilla)
+        corpus_tokenizado = tokenizacion.obtener_corpus_tokenizado(articulos)
+        # Un hash por token del vocabulario; cada documento usa los de sus IDs.
+        hashes_vocabulario = np.fromiter(
+            (hash_token(token) for token in corpus_tokenizado.vocabulario.tokens),
+            dtype=np.uint64,
+            count=len(corpus_tokenizado.vocabulario),
+        )
+        ids = corpus_tokenizado.ids
+        firmas = [
+            cls.calcular_firma(hashes_vocabulario[corpus_tokenizado.documentos[id_articulo].unicos], a, b)
+            for id_articulo in ids
+        ]
+        matriz = np.vstack(firmas) if firmas else np.zeros((0, num_perm), dtype=np.uint64)
+        indice = cls(ids, matriz, num_perm, num_bandas, semilla, getattr(articulos, 'version', None))
+        indice.corpus_tokenizado = corpus_tokenizado
+        return indice
+
+    def _construir_buckets(self):
+        filas_banda = self.num_perm // self.num_bandas
+        self.buckets = [defaultdict(list) for _ in range(self.num_bandas)]
+        for fila, firma in enumerate(self.firmas):
+            for banda in range(self.num_bandas):
+                clave = firma[banda * filas_banda:(banda + 1) * filas_banda].tobytes()
+                self.buckets[banda][clave].append(fila)
+
+    def candidatos(self, fila):
+        """Filas que comparten al menos una banda con la fila dada (sin incluirla)."""
+        filas_banda = self.num_perm // self.num_bandas
+        firma = self.firmas[fila]
+        encontrados = set()
+        for banda in range(self.num_bandas):
+            clave = firma[banda * filas_banda:(banda + 1) * filas_banda].tobytes()
+            encontrados.update(self.buckets[banda].get(clave, ()))
+        encontrados.discard(fila)
+        return encontrados
+
+    def jaccard_estimado(self, fila1, fila2):
+        """Fracción de posiciones iguales entre dos firmas."""
+        return float(np.mean(self.firmas[fila1] == self.firmas[fila2]))
+
+    def consultar(self, id_articulo, k=10, articulos=None, exacto=False):
+        """
+        Devuelve hasta k pares (id, similitud) de los candidatos LSH del artículo,
+        ordenados de mayor a menor. Con `exacto=True` los candidatos se vuelven a
+        puntuar con el índice de Jaccard real usando los tokens de `articulos`.
+        Devuelve None si el artículo no está en el índice.
+        """
+        fila = self.fila_por_id.get(id_articulo)
+        if fila is None:
+            return None
+        candidatos = sorted(self.candidatos(fila))
+        if not candidatos:
+            return []
+
+        if exacto:
+            corpus_tokenizado = self._corpus_tokenizado(articulos)
+            propio = corpus_tokenizado.documento(id_articulo).unicos
+            puntajes = []
+            for candidato in candidatos:
+                otro = corpus_tokenizado.documento(self.ids[candidato]).unicos
+                interseccion = len(np.intersect1d(propio, otro, assume_unique=True))
+                union = len(propio) + len(otro) - interseccion
+                puntajes.append(interseccion / union if union else 0.0)
+            puntajes = np.array(puntajes)
+        else:
+            puntajes = np.mean(self.firmas[candidatos] == self.firmas[fila], axis=1)
+
+        orden = np.argsort(-puntajes, kind='stable')[:k]
+        return [(self.ids[candidatos[i]], float(puntajes[i])) for i in orden]
+
+    def _corpus_tokenizado(self, articulos):
+        if self.corpus_tokenizado is None:
+            if articulos is None:
+                raise ValueError("Se necesitan los artículos para el re-puntaje exacto.")
+            self.corpus_tokenizado = tokenizacion.obtener_corpus_tokenizado(articulos)
+        return self.corpus_tokenizado
+
+    def guardar(self, ruta):
+        """Guarda las firmas en un archivo .npz (los buckets se reconstruyen al cargar)."""
+        version = np.array(self.version if self.version is not None else (-1, -1), dtype=np.int64)
+        with open(ruta, 'wb') as archivo:
+            np.savez_compressed(
+                archivo,
+                ids=np.array(self.ids, dtype=str),
+                firmas=self.firmas,
+                parametros=np.array([self.num_perm, self.num_bandas, self.semilla, VERSION_FORMATO], dtype=np.int64),
+                version=version,
+            )
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un índice guardado con `guardar`. Devuelve None si no existe, está dañado o es de otro formato."""
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta) as datos:
+                parametros = [int(v) for v in datos['parametros']]
+                if len(parametros) != 4 or parametros[3] != VERSION_FORMATO:
+                    return None
+                num_perm, num_bandas, semilla = parametros[:3]
+                version = tuple(int(v) for v in datos['version'])
+                return cls(datos['ids'].tolist(), datos['firmas'], num_perm, num_bandas, semilla,
+                           None if version == (-1, -1) else version)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[ERROR] No se pudo cargar el índice MinHash de {ruta}: {e}")
+            return None
+
+
+def obtener_indice(articulos, ruta, num_perm=NUM_PERMUTACIONES, num_bandas=NUM_BANDAS, semilla=SEMILLA):
+    """
+    Carga el índice persistido en `ruta` si corresponde a la versión actual del
+    corpus y a los mismos parámetros; si no, lo construye y lo guarda.
+    """
+    version = getattr(articulos, 'version', None)
+    indice = IndiceMinHash.cargar(ruta) if version is not None else None
+    if (indice is not None and indice.version == version and indice.num_perm == num_perm
+            and indice.num_bandas == num_bandas and indice.semilla == semilla):
+        return indice
+
+    indice = IndiceMinHash.construir(articulos, num_perm, num_bandas, semilla)
+    if version is not None:
+        try:
+            indice.guardar(ruta)
+            print(f"[INFO] Índice MinHash guardado en: {ruta}")
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar el índice MinHash: {e}")
+    return indice
@@ -0,0 +1,155 @@
+import threading
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
+
+try:
+    from . import tokenizacion
+except ImportError:  # Ejecución directa como script
+    import tokenizacion
+
+
+def matriz_conteos(corpus_tokenizado, ids=None):
+    """
+    Matriz dispersa de frecuencias (documentos x vocabulario) a partir de las
+    secuencias de IDs de tokens, sin volver a tokenizar los textos. Por defecto
+    incluye todos los documentos del corpus; `ids` permite elegir algunos.
+    """
+    ids = corpus_tokenizado.ids if ids is None else ids
+    indptr = [0]
+    indices = [np.zeros(0, dtype=np.int32)]
+    datos = [np.zeros(0, dtype=np.int64)]
+    for id_articulo in ids:
+        terminos, conteos = np.unique(corpus_tokenizado.documentos[id_articulo].como_arreglo(), return_counts=True)
+        indices.append(terminos)
+        datos.append(conteos)
+        indptr.append(indptr[-1] + len(terminos))
+    return csr_matrix(
+        (np.concatenate(datos).astype(np.float64), np.concatenate(indices), np.array(indptr)),
+        shape=(len(ids), len(corpus_tokenizado.vocabulario)),
+    )
+
+
+def frecuencia_documentos(conteos):
+    """Cantidad de documentos en los que aparece cada término."""
+    return np.bincount(conteos.indices, minlength=conteos.shape[1]).astype(np.int64)
+
+
+def _ampliar_columnas(matriz, columnas):
+    """La misma matriz CSR con más columnas (términos nuevos del vocabulario)."""
+    return csr_matrix((matriz.data, matriz.indices, matriz.indptr), shape=(matriz.shape[0], columnas))
+
+
+class ModeloTfidf:
+    """
+    Modelo TF-IDF ajustado sobre todos los abstracts del corpus, a partir de la
+    tokenización compartida (mismos tokens y pesos que TfidfVectorizer).
+
+    La matriz resultante está normalizada con L2, por lo que la similitud de
+    coseno entre dos artículos es el producto punto de sus filas. Cada fila se
+    puede ubicar a partir del ID del artículo.
+
+    El modelo guarda las frecuencias crudas (`conteos`) y la frecuencia de
+    documentos de cada término (`df`). Si se construye a partir del modelo de la
+    versión `anterior` del corpus, reutiliza las filas de los documentos que no
+    cambiaron, actualiza `df` sumando los documentos nuevos y restando los que
+    ya no están, y solo recalcula los pesos IDF: el resultado es el mismo que
+    un ajuste completo, sin volver a contar el corpus existente.
+    """
+
+    def __init__(self, articulos, version=None, anterior=None):
+        self.version = version
+        corpus_tokenizado = tokenizacion.obtener_corpus_tokenizado(articulos)
+        self.ids = corpus_tokenizado.ids
+        self.fila_por_id = {id_articulo: fila for fila, id_articulo in enumerate(self.ids)}
+        # Documentos tokenizados de cada fila, para reconocer en la próxima
+        # versión los que no cambiaron.
+        self.documentos = {id_articulo: corpus_tokenizado.documentos[id_articulo] for id_articulo in self.ids}
+        self.tokens = corpus_tokenizado.vocabulario.tokens
+
+        # Solo se puede partir del modelo anterior si el vocabulario conserva
+        # sus IDs (la tokenización se amplió en lugar de rehacerse).
+        if anterior is not None and self.tokens[:len(anterior.tokens)] != anterior.tokens:
+            anterior = None
+        if anterior is None:
+            self.conteos = matriz_conteos(corpus_tokenizado)
+            self.df = frecuencia_documentos(self.conteos)
+        else:
+            self.conteos, self.df = self._actualizar_conteos(anterior, corpus_tokenizado)
+
+        self.idf = None
+        self.matriz = None
+        if self.ids:
+            # Mismo IDF suavizado que TfidfTransformer: ln((1 + n) / (1 + df)) + 1.
+            self.idf = np.log((1 + len(self.ids)) / (1 + self.df)) + 1
+            # Matriz dispersa CSR (documentos x términos) con filas de norma 1.
+            self.matriz = normalize(csr_matrix(self.conteos.multiply(self.idf)), norm='l2')
+
+    def _actualizar_conteos(self, anterior, corpus_tokenizado):
+        """Conteos y df de esta versión a partir de los del modelo anterior."""
+        columnas = len(corpus_tokenizado.vocabulario)
+        conteos_anteriores = _ampliar_columnas(anterior.conteos, columnas)
+        df = np.zeros(columnas, dtype=np.int64)
+        df[:len(anterior.df)] = anterior.df
+
+        # Filas que se conservan (mismo documento tokenizado) y filas nuevas.
+        reutilizadas = {
+            id_articulo: anterior.fila_por_id[id_articulo] for id_articulo in self.ids
+            if anterior.documentos.get(id_articulo) is self.documentos[id_articulo]
+        }
+        nuevos = [id_articulo for id_articulo in self.ids if id_articulo not in reutilizadas]
+        conservadas = np.zeros(len(anterior.ids), dtype=bool)
+        conservadas[list(reutilizadas.values())] = True
+
+        conteos_nuevos = matriz_conteos(corpus_tokenizado, nuevos)
+        df -= frecuencia_documentos(conteos_anteriores[~conservadas])
+        df += frecuencia_documentos(conteos_nuevos)
+
+        # Se apilan las filas anteriores y las nuevas y se reordenan según el corpus.
+        posicion_nueva = {id_articulo: len(anterior.ids) + i for i, id_articulo in enumerate(nuevos)}
+        orden = [reutilizadas.get(id_articulo, posicion_nueva.get(id_articulo)) for id_articulo in self.ids]
+        conteos = vstack([conteos_anteriores, conteos_nuevos], format='csr')[orden]
+        print(f"[INFO] TF-IDF incremental: {len(nuevos)} documentos nuevos, "
+              f"{len(anterior.ids) - len(reutilizadas)} retirados.")
+        return conteos, df
+
+    def vector(self, id_articulo):
+        """Devuelve la fila (1 x términos) del artículo o None si no tiene abstract."""
+        fila = self.fila_por_id.get(id_articulo)
+        if fila is None:
+            return None
+        return self.matriz[fila]
+
+    def similitud(self, id1, id2):
+        """Similitud de coseno entre dos artículos del corpus (None si falta alguno)."""
+        fila1 = self.fila_por_id.get(id1)
+        fila2 = self.fila_por_id.get(id2)
+        if fila1 is None or fila2 is None:
+            return None
+        return float(self.matriz[fila1].multiply(self.matriz[fila2]).sum())
+
+
+_modelo = None
+_lock = threading.Lock()
+
+
+def obtener_modelo(articulos):
+    """
+    Devuelve el modelo TF-IDF del corpus, ajustándolo solo la primera vez o
+    cuando cambia la versión del corpus; en ese caso se actualiza a partir del
+    modelo anterior en lugar de ajustarlo de cero. Para listas sin versión (que
+    no provienen del almacén) se ajusta un modelo nuevo en cada llamada.
+    """
+    global _modelo
+    version = getattr(articulos, 'version', None)
+    if version is None:
+        return ModeloTfidf(articulos)
+
+    modelo = _modelo
+    if modelo is not None and modelo.version == version:
+        return modelo
+    with _lock:
+        if _modelo is None or _modelo.version != version:
+            _modelo = ModeloTfidf(articulos, version, anterior=_modelo)
+        return _modelo
@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+
+try:
+    from . import matriz_similitud
+except ImportError:  # Ejecución directa como script
+    import matriz_similitud
+
+
+class AlgoritmoSimilitud(ABC):
+    """
+    Clase base de los algoritmos de similitud registrables.
+
+    Cada algoritmo declara sus capacidades para que la API elija el camino más
+    rápido disponible:
+    - `preprocesamiento`: representación del abstract que usa el algoritmo.
+    - `vectorizado`: si `modelo` devuelve una matriz del corpus con la que se
+      pueden puntuar lotes y top-k mediante operaciones matriciales.
+    - `usa_indice`: si puede responder top-k con un índice precalculado
+      (búsqueda aproximada); lo declaran las subclases de `AlgoritmoConIndice`.
+
+    Para agregar un algoritmo basta con heredar de esta clase, implementar
+    `comparar` (y opcionalmente los caminos rápidos) y decorarla con `registrar`.
+    """
+
+    nombre = None
+    descripcion = None
+    preprocesamiento = "texto"
+    vectorizado = False
+    usa_indice = False
+
+    @abstractmethod
+    def comparar(self, articulos, id1, id2):
+        """Compara dos artículos; devuelve el mismo diccionario que analizar_similitud_*."""
+
+    def modelo(self, articulos):
+        """
+        Modelo matricial del corpus (con `ids`, `fila_por_id`, `puntajes_pares`
+        y `puntajes_bloque`) o None si el algoritmo no está vectorizado.
+        """
+        return None
+
+    def puntuar_lote(self, articulos, pares, abstracts):
+        """
+        Puntúa una lista de pares (id1, id2) válidos. Devuelve, para cada par,
+        un diccionario con los campos del puntaje (p. ej. similitud, distancia).
+        """
+        resultados = []
+        for id1, id2 in pares:
+            resultado = self.comparar(articulos, id1, id2)
+            resultados.append({
+                clave: valor for clave, valor in resultado.items()
+                if clave not in ("articulo1_id", "articulo2_id", "algoritmo")
+            })
+        return resultados
+
+    def iterar_top_k(self, articulos, ids, abstracts, k, filas_consulta=None):
+        """
+        Vecinos más similares sin modelo matricial: puntúa los pares con
+        `puntuar_lote` y genera los k mejores de cada fila de consulta a medida
+        que se completan.
+        """
+        abstracts_por_id = dict(zip(ids, abstracts))
+
+        def puntuar(pares):
+            puntajes = self.puntuar_lote(articulos, [(ids[i], ids[j]) for i, j in pares], abstracts_por_id)
+            return [puntaje["similitud"] for puntaje in puntajes]
+
+        return matriz_similitud.iterar_top_k_pares(ids, k, puntuar, filas_consulta)
+
+    def top_k(self, articulos, ids, abstracts, k, filas_consulta=None):
+        """Versión de `iterar_top_k` que devuelve la lista completa."""
+        return list(self.iterar_top_k(articulos, ids, abstracts, k, filas_consulta))
+
+    def capacidades(self):
+        """Descripción del algoritmo y de los caminos rápidos que soporta."""
+        return {
+            "nombre": self.nombre,
+            "descripcion": self.descripcion,
+            "preprocesamiento": self.preprocesamiento,
+            "vectorizado": self.vectorizado,
+            "usa_indice": self.usa_indice,
+        }
+
+
+class AlgoritmoConIndice(AlgoritmoSimilitud):
+    """Algoritmo que además responde top-k aproximado con un índice precalculado."""
+
+    usa_indice = True
+
+    @abstractmethod
+    def vecinos_indice(self, articulos, id_articulo, k, exacto=False, nprobe=None):
+        """
+        Top-k aproximado con el índice: lista de (id, similitud) o None si el
+        artículo no está en el índice. `nprobe` (listas a revisar) solo lo usan
+        los índices IVF; None toma el valor por defecto del índice.
+        """
+
+
+_registro = {}
+
+
+def registrar(clase):
+    """Decorador de clase: registra una instancia del algoritmo bajo su `nombre`."""
+    if not clase.nombre:
+        raise ValueError("El algoritmo debe definir un nombre.")
+    _registro[clase.nombre] = clase()
+    return clase
+
+
+def obtener(nombre):
+    """Devuelve el algoritmo registrado con ese nombre o None."""
+    return _registro.get(nombre)
+
+
+def listar():
+    """Algoritmos registrados, en orden de registro."""
+    return list(_registro.values())
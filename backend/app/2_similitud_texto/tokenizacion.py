@@ -0,0 +1,124 @@
+import re
+import threading
+from array import array
+
+import numpy as np
+
+# Mismo patrón que usa por defecto TfidfVectorizer: palabras de 2 o más
+# caracteres alfanuméricos. Es la tokenización común de todos los algoritmos.
+PATRON_TOKEN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def tokenizar(texto):
+    """Divide un texto en tokens en minúsculas."""
+    return PATRON_TOKEN.findall(texto.lower())
+
+
+class Vocabulario:
+    """Asocia cada token con un ID entero consecutivo, compartido por todo el corpus."""
+
+    def __init__(self):
+        self.id_por_token = {}
+        self.tokens = []
+
+    def agregar(self, token):
+        """Devuelve el ID del token, asignándole uno nuevo si no existía."""
+        id_token = self.id_por_token.get(token)
+        if id_token is None:
+            id_token = len(self.tokens)
+            self.id_por_token[token] = id_token
+            self.tokens.append(token)
+        return id_token
+
+    def buscar(self, token):
+        """ID del token o None si no aparece en el corpus."""
+        return self.id_por_token.get(token)
+
+    def copiar(self):
+        """Copia con los mismos IDs, que se puede ampliar sin tocar el original."""
+        copia = Vocabulario()
+        copia.id_por_token = dict(self.id_por_token)
+        copia.tokens = list(self.tokens)
+        return copia
+
+    def __len__(self):
+        return len(self.tokens)
+
+
+class DocumentoTokenizado:
+    """
+    Abstract tokenizado: la secuencia de IDs en orden (`secuencia`, array('i'))
+    y el conjunto de IDs distintos ordenado (`unicos`, arreglo NumPy int32).
+    """
+
+    __slots__ = ('secuencia', 'unicos')
+
+    def __init__(self, secuencia):
+        self.secuencia = secuencia
+        self.unicos = np.unique(np.frombuffer(secuencia, dtype=np.int32)) if secuencia else np.zeros(0, dtype=np.int32)
+
+    def como_arreglo(self):
+        """Vista NumPy (sin copia) de la secuencia de IDs."""
+        return np.frombuffer(self.secuencia, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.secuencia)
+
+
+class CorpusTokenizado:
+    """
+    Abstracts del corpus tokenizados una sola vez. `documentos` asocia el ID del
+    artículo con su `DocumentoTokenizado`; `ids` conserva el orden del corpus.
+
+    Si se pasa la tokenización `anterior` (la de la versión previa del corpus),
+    se parte de su vocabulario, de modo que los IDs de tokens se mantienen, y se
+    reutilizan los documentos cuyo abstract no cambió: solo se tokenizan los
+    artículos nuevos o modificados.
+    """
+
+    def __init__(self, articulos, version=None, anterior=None):
+        self.version = version
+        self.vocabulario = anterior.vocabulario.copiar() if anterior is not None else Vocabulario()
+        self.documentos = {}
+        self.abstracts = {}
+        self.ids = []
+        self.reutilizados = 0
+        agregar = self.vocabulario.agregar
+        for articulo in articulos:
+            abstract = articulo.get('abstract', '')
+            id_articulo = articulo.get('ID')
+            if not abstract or id_articulo is None or id_articulo in self.documentos:
+                continue
+            if anterior is not None and anterior.abstracts.get(id_articulo) == abstract:
+                self.documentos[id_articulo] = anterior.documentos[id_articulo]
+                self.reutilizados += 1
+            else:
+                secuencia = array('i', (agregar(token) for token in tokenizar(abstract)))
+                self.documentos[id_articulo] = DocumentoTokenizado(secuencia)
+            self.abstracts[id_articulo] = abstract
+            self.ids.append(id_articulo)
+
+    def documento(self, id_articulo):
+        """Documento tokenizado del artículo o None si no tiene abstract."""
+        return self.documentos.get(id_articulo)
+
+
+_lock = threading.Lock()
+
+
+def obtener_corpus_tokenizado(articulos):
+    """
+    Devuelve la tokenización del corpus. Se calcula una sola vez por cada carga
+    del corpus y se guarda junto a él; las listas simples se tokenizan en cada
+    llamada.
+    """
+    tokenizado = getattr(articulos, 'tokenizado', None)
+    if tokenizado is not None:
+        return tokenizado
+    version = getattr(articulos, 'version', None)
+    if version is None:
+        return CorpusTokenizado(articulos)
+    with _lock:
+        if getattr(articulos, 'tokenizado', None) is None:
+            articulos.tokenizado = CorpusTokenizado(articulos, version)
+        return articulos.tokenizado
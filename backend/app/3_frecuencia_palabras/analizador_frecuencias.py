@@ -1,11 +1,66 @@
 
 import os
+import sys
+import importlib
+import threading
 import bibtexparser
-import re
-from collections import Counter
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from collections import Counter, OrderedDict
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 from bibtexparser.bparser import BibTexParser
 
+# Agregar el directorio 'backend' al PYTHONPATH para poder ejecutar este archivo como script
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
+
+# Tokenización compartida con el análisis de similitud (Requerimiento 2)
+tokenizacion = importlib.import_module("app.2_similitud_texto.tokenizacion")
+
+try:
+    from . import buscador_palabras_clave
+    from . import conteo_paralelo
+    from . import cubo_tendencias
+    from . import indice_invertido
+    from . import lector_bib
+    from . import matriz_frecuencias
+    from . import modelo_palabras_clave
+except ImportError:  # Ejecución directa como script
+    import buscador_palabras_clave
+    import conteo_paralelo
+    import cubo_tendencias
+    import indice_invertido
+    import lector_bib
+    import matriz_frecuencias
+    import modelo_palabras_clave
+
+BIB_FILE_PATH = os.path.join(os.path.dirname(BACKEND_DIR), 'datos', 'procesados', 'articulos_unicos.bib')
+# Índice invertido posicional persistido junto al archivo .bib.
+INDICE_INVERTIDO_FILE_PATH = os.path.splitext(BIB_FILE_PATH)[0] + '.indice_invertido.npz'
+# Prefijo del vectorizador TF-IDF de la Parte 2 (vocabulario, IDF y matriz)
+# persistido junto al archivo .bib. Solo se guarda el del rango de n-gramas por
+# defecto; el nombre del archivo lleva el rango.
+MODELO_PALABRAS_CLAVE_FILE_PREFIX = os.path.splitext(BIB_FILE_PATH)[0] + '.palabras_clave'
+# Cubo de tendencias (palabra clave x año x fuente) de las palabras clave dadas,
+# persistido junto al archivo .bib.
+TENDENCIAS_FILE_PATH = os.path.splitext(BIB_FILE_PATH)[0] + '.tendencias.npz'
+
+# Palabras clave dadas en el requerimiento.
+PALABRAS_CLAVE_DADAS = [
+    "Generative models", "Prompting", "Machine learning", "Multimodality",
+    "Fine-tuning", "Training data", "Algorithmic bias", "Explainability",
+    "Transparency", "Ethics", "Privacy", "Personalization",
+    "Human-AI interaction", "AI literacy", "Co-creation"
+]
+
+# Resultados de `analizar_frecuencias` y `analizar_palabras_clave` que se
+# conservan en memoria (los más recientes).
+CAPACIDAD_CACHE_RESULTADOS = 256
+# Cubos de tendencias de otros conjuntos de palabras clave que se conservan en memoria.
+CAPACIDAD_CACHE_CUBOS = 32
+# Vectorizadores TF-IDF (uno por rango de n-gramas) que se conservan en memoria.
+CAPACIDAD_CACHE_MODELOS = 4
+
 # --- Funciones Auxiliares (copiadas de analizador_similitud.py) ---
 
 def cargar_base_de_datos(ruta_archivo_bib):
@@ -24,46 +79,173 @@ def encontrar_articulos_con_abstract(db):
 
 # --- Requerimiento 3: Funciones Principales ---
 
-def calcular_frecuencia_palabras_dadas(abstracts, palabras_clave):
+def calcular_frecuencia_palabras_dadas(abstracts, palabras_clave, max_workers=None):
     """
     Parte 1: Calcula la frecuencia de aparición de una lista dada de palabras clave.
+
+    Todas las palabras clave se cuentan en una sola pasada por los abstracts,
+    que pueden venir de un generador. Se cuentan palabras completas sin
+    distinguir mayúsculas, y los guiones equivalen a espacios ("Fine-tuning"
+    también cuenta "fine tuning"). Si se recibe una lista grande, se divide en
+    fragmentos que se cuentan en varios procesos (ver `conteo_paralelo`).
     """
-    # Se combinan todos los abstracts en un solo texto en minúsculas.
-    texto_completo = ' '.join(abstracts).lower()
-    
-    frecuencias = {}
-    # Para cada palabra clave, se cuentan sus apariciones en el texto completo.
-    for palabra in palabras_clave:
-        # Se usa re.findall para contar solapamientos y asegurar que se cuenten palabras completas.
-        frecuencias[palabra] = len(re.findall(r'\b' + re.escape(palabra.lower()) + r'\b', texto_completo))
-    
-    return frecuencias
+    if isinstance(abstracts, (list, tuple)):
+        return conteo_paralelo.contar_palabras_clave(list(abstracts), palabras_clave, max_workers)
+    buscador = buscador_palabras_clave.BuscadorPalabrasClave(palabras_clave)
+    return buscador.contar(abstracts)
+
+# --- Índice invertido posicional ---
+
+_indice_invertido = None
+
+def obtener_indice_invertido(articulos, ruta=INDICE_INVERTIDO_FILE_PATH):
+    """
+    Devuelve el índice invertido del corpus. Se mantiene en memoria y se
+    persiste junto a 'articulos_unicos.bib'; solo se reconstruye cuando el
+    corpus cambia. Las listas sin versión (que no vienen del almacén) se
+    indexan en cada llamada y no se guardan.
+    """
+    global _indice_invertido
+    version = getattr(articulos, 'version', None)
+    if version is None:
+        return indice_invertido.obtener_indice(articulos)
+    indice = _indice_invertido
+    if indice is not None and indice.version == version:
+        return indice
+    indice = indice_invertido.obtener_indice(articulos, ruta)
+    _indice_invertido = indice
+    return indice
+
+def calcular_frecuencia_palabras_indexadas(articulos, palabras_clave, indice=None):
+    """
+    Variante de la Parte 1 que responde con el índice invertido del corpus en
+    lugar de recorrer los abstracts. Las palabras clave con signos que el
+    índice no guarda (por ejemplo "C++") se cuentan sobre el texto.
+    """
+    indice = indice if indice is not None else obtener_indice_invertido(articulos)
+    frecuencias = indice.frecuencias(palabras_clave)
+    faltantes = [palabra for palabra in palabras_clave if palabra not in frecuencias]
+    if faltantes:
+        abstracts = (articulo['abstract'] for articulo in articulos if articulo.get('abstract', '').strip())
+        frecuencias.update(calcular_frecuencia_palabras_dadas(abstracts, faltantes))
+    return {palabra: frecuencias[palabra] for palabra in palabras_clave}
 
-def generar_nuevas_palabras_clave(abstracts, num_palabras=15):
+_modelos_palabras_clave = OrderedDict()
+_lock_modelos = threading.Lock()
+
+def obtener_modelo_palabras_clave(abstracts, ngramas=modelo_palabras_clave.RANGO_NGRAMAS, persistir=True):
+    """
+    Devuelve el vectorizador TF-IDF ajustado sobre los abstracts. Se mantienen
+    en memoria los de los últimos `CAPACIDAD_CACHE_MODELOS` rangos de n-gramas
+    usados y, con `persistir`, el del rango por defecto se guarda junto a
+    'articulos_unicos.bib'; solo se vuelve a ajustar cuando cambian los
+    abstracts (se comparan por su hash).
+    """
+    ngramas = tuple(ngramas)
+    abstracts = list(abstracts)
+    with _lock_modelos:
+        modelo = _modelos_palabras_clave.get(ngramas)
+    if modelo is not None and modelo.huella == modelo_palabras_clave.huella_corpus(abstracts):
+        with _lock_modelos:
+            if ngramas in _modelos_palabras_clave:
+                _modelos_palabras_clave.move_to_end(ngramas)
+        return modelo
+    ruta = None
+    if persistir and ngramas == modelo_palabras_clave.RANGO_NGRAMAS:
+        ruta = f"{MODELO_PALABRAS_CLAVE_FILE_PREFIX}-{ngramas[0]}-{ngramas[1]}.npz"
+    modelo = modelo_palabras_clave.obtener_modelo(abstracts, ngramas, ruta)
+    with _lock_modelos:
+        _modelos_palabras_clave[ngramas] = modelo
+        _modelos_palabras_clave.move_to_end(ngramas)
+        while len(_modelos_palabras_clave) > CAPACIDAD_CACHE_MODELOS:
+            _modelos_palabras_clave.popitem(last=False)
+    return modelo
+
+def generar_nuevas_palabras_clave(abstracts, num_palabras=15, ngramas=modelo_palabras_clave.RANGO_NGRAMAS,
+                                  criterio='frecuencia', persistir=True):
     """
     Parte 2: Analiza todos los abstracts y genera un listado de nuevas palabras asociadas.
     Se utiliza el algoritmo TF-IDF para encontrar los términos más significativos.
+
+    El vocabulario incluye n-gramas (por defecto de una a tres palabras, sin
+    stop words en inglés), así que también se generan frases como "machine
+    learning". El vectorizador ajustado se reutiliza mientras los abstracts no
+    cambien: pedir otra cantidad de palabras solo vuelve a ordenar los términos.
+    Con `ngramas=(1, 1)` y el criterio 'frecuencia' el resultado es el de un
+    TfidfVectorizer con `max_features=num_palabras`, incluidos los empates,
+    mientras el vocabulario no supere `modelo_palabras_clave.MAX_TERMINOS`
+    (si lo supera, el desempate se hace sobre el vocabulario ya podado). Para
+    abstracts que no son los de
+    'articulos_unicos.bib' conviene usar `persistir=False`.
     """
-    # Se configura el vectorizador TF-IDF, indicando que use stop words en inglés.
-    # Las stop words son palabras comunes como 'the', 'a', 'is' que no aportan significado.
-    vectorizer = TfidfVectorizer(stop_words='english', max_features=num_palabras)
-    
-    # Se ajusta el modelo a los abstracts.
-    vectorizer.fit_transform(abstracts)
-    
-    # Se obtienen los nombres de las características (las palabras clave generadas).
-    palabras_generadas = vectorizer.get_feature_names_out()
-    
-    return list(palabras_generadas)
+    modelo = obtener_modelo_palabras_clave(abstracts, ngramas, persistir)
+    return modelo.mas_relevantes(num_palabras, criterio)
+
+class AcumuladorTerminos:
+    """
+    Acumula, texto por texto, la frecuencia de cada término con la misma
+    tokenización y stop words que `generar_nuevas_palabras_clave` con
+    palabras sueltas (`ngramas=(1, 1)`), para poder
+    elegir los términos más frecuentes sin guardar los textos. La memoria crece
+    con el vocabulario, no con el corpus.
+    """
+
+    def __init__(self):
+        self.frecuencias = Counter()
+        self.documentos = 0
+
+    def agregar(self, texto):
+        self.frecuencias.update(
+            token for token in tokenizacion.tokenizar(texto) if token not in ENGLISH_STOP_WORDS
+        )
+        self.documentos += 1
+
+    def mas_frecuentes(self, num_palabras=15):
+        """
+        Los `num_palabras` términos más frecuentes en orden alfabético: los
+        mismos que elige TfidfVectorizer con `max_features` (que selecciona por
+        frecuencia en el corpus), incluido su criterio de desempate.
+        """
+        terminos = sorted(self.frecuencias)
+        frecuencias = np.array([self.frecuencias[termino] for termino in terminos], dtype=np.int64)
+        elegidos = (-frecuencias).argsort()[:num_palabras]
+        return sorted(terminos[i] for i in elegidos)
+
+def analizar_frecuencias_en_flujo(ruta_archivo_bib, palabras_clave, num_palabras=15):
+    """
+    Variante de las Partes 1 y 2 que lee el archivo .bib entrada por entrada:
+    cada abstract se pasa al contador de palabras clave y al acumulador de
+    términos y se descarta, de modo que nunca se tiene en memoria la base de
+    datos completa ni la lista de abstracts.
+    """
+    if not os.path.exists(ruta_archivo_bib):
+        print(f"Error: El archivo {ruta_archivo_bib} no fue encontrado.")
+        return None
+
+    buscador = buscador_palabras_clave.BuscadorPalabrasClave(palabras_clave)
+    acumulador = AcumuladorTerminos()
+    conteos = {}
+    for abstract in lector_bib.iterar_abstracts(ruta_archivo_bib):
+        buscador.contar_frases(abstract, conteos)
+        acumulador.agregar(abstract)
+
+    return {
+        "articulos_con_abstract": acumulador.documentos,
+        "frecuencias": buscador.por_palabra_clave(conteos),
+        "palabras_generadas": acumulador.mas_frecuentes(num_palabras),
+    }
 
 def calcular_precision_nuevas_palabras(palabras_generadas, palabras_originales):
     """
     Parte 3: Determina qué tan precisas son las nuevas palabras generadas.
     La precisión se calcula como la proporción de palabras generadas que estaban en la lista original.
     """
-    # Se convierten ambas listas a conjuntos para una comparación eficiente.
+    # Se convierten ambas listas a conjuntos para una comparación eficiente. Las
+    # palabras originales se normalizan como los n-gramas generados ("Fine-tuning"
+    # se compara como "fine tuning").
     set_generadas = set(palabras_generadas)
-    set_originales = set(palabra.lower() for palabra in palabras_originales)
+    set_originales = set(' '.join(buscador_palabras_clave.normalizar_palabra_clave(palabra))
+                         for palabra in palabras_originales)
     
     # Se encuentra la intersección (palabras en común).
     palabras_comunes = set_generadas.intersection(set_originales)
@@ -73,20 +255,167 @@ def calcular_precision_nuevas_palabras(palabras_generadas, palabras_originales):
     
     return precision, list(palabras_comunes)
 
+# --- Análisis completo con caché (usado por la API) ---
+
+_resultados = OrderedDict()
+_lock_resultados = threading.Lock()
+
+def _con_cache_resultados(clave, calcular):
+    """
+    Devuelve el resultado guardado para `clave` o lo calcula con `calcular()`.
+    Los resultados con error no se guardan; se descartan los menos usados
+    cuando se supera `CAPACIDAD_CACHE_RESULTADOS`.
+    """
+    with _lock_resultados:
+        resultado = _resultados.get(clave)
+        if resultado is not None:
+            _resultados.move_to_end(clave)
+            return resultado
+    resultado = calcular()
+    if "error" not in resultado:
+        with _lock_resultados:
+            _resultados[clave] = resultado
+            _resultados.move_to_end(clave)
+            while len(_resultados) > CAPACIDAD_CACHE_RESULTADOS:
+                _resultados.popitem(last=False)
+    return resultado
+
+def _palabras_unicas(palabras_clave):
+    """Palabras clave sin vacías ni repetidas, en el orden recibido."""
+    return list(dict.fromkeys(palabra.strip() for palabra in palabras_clave if palabra.strip()))
+
+def analizar_frecuencias(articulos, palabras_clave=None):
+    """
+    Parte 1 sobre el corpus en memoria: frecuencia total de cada palabra clave,
+    cantidad de artículos en los que aparece y desglose por base de datos. Se
+    responde con el índice invertido y la matriz de frecuencias del corpus, y
+    el resultado queda en caché por conjunto de palabras clave y versión del
+    corpus.
+    """
+    palabras_clave = _palabras_unicas(PALABRAS_CLAVE_DADAS if palabras_clave is None else palabras_clave)
+    if not palabras_clave:
+        return {"error": "La lista de palabras clave está vacía."}
+    version = getattr(articulos, 'version', None)
+
+    def calcular():
+        indice = obtener_indice_invertido(articulos)
+        matriz = matriz_frecuencias.obtener_matriz_frecuencias(articulos, palabras_clave, indice)
+        return {
+            "articulos_con_abstract": len(matriz.ids),
+            "frecuencias": matriz.frecuencia_total(),
+            "frecuencia_documentos": matriz.frecuencia_documentos(),
+            "por_fuente": matriz.por_fuente(),
+            "documentos_por_fuente": matriz.documentos_por_fuente(),
+            "articulos_por_fuente": matriz.articulos_por_fuente(),
+        }
+
+    if version is None:
+        return calcular()
+    return _con_cache_resultados(("frecuencias", version, frozenset(palabras_clave)), calcular)
+
+def analizar_palabras_clave(articulos, num_palabras=15, palabras_clave=None,
+                            ngramas=modelo_palabras_clave.RANGO_NGRAMAS, criterio='frecuencia'):
+    """
+    Partes 2 y 3 sobre el corpus en memoria: las `num_palabras` palabras clave
+    generadas con TF-IDF y su precisión respecto de `palabras_clave`. El
+    vectorizador ajustado se reutiliza (ver `generar_nuevas_palabras_clave`) y
+    el resultado queda en caché por parámetros, conjunto de palabras clave y
+    versión del corpus.
+    """
+    palabras_clave = _palabras_unicas(PALABRAS_CLAVE_DADAS if palabras_clave is None else palabras_clave)
+    if num_palabras < 1:
+        return {"error": "La cantidad de palabras debe ser al menos 1."}
+    if criterio not in modelo_palabras_clave.CRITERIOS:
+        return {"error": f"Criterio '{criterio}' no reconocido. Opciones: {', '.join(modelo_palabras_clave.CRITERIOS)}."}
+    ngramas = tuple(ngramas)
+    if len(ngramas) != 2 or not 1 <= ngramas[0] <= ngramas[1] <= modelo_palabras_clave.NGRAMA_MAXIMO:
+        return {"error": "El rango de n-gramas debe ser [mínimo, máximo] con "
+                         f"1 <= mínimo <= máximo <= {modelo_palabras_clave.NGRAMA_MAXIMO}."}
+    version = getattr(articulos, 'version', None)
+
+    def calcular():
+        abstracts = [articulo['abstract'] for articulo in articulos if articulo.get('abstract', '').strip()]
+        if not abstracts:
+            return {"error": "No se encontraron artículos con resúmenes en la base de datos."}
+        palabras_generadas = generar_nuevas_palabras_clave(abstracts, num_palabras, ngramas, criterio)
+        precision, comunes = calcular_precision_nuevas_palabras(palabras_generadas, palabras_clave)
+        return {
+            "num_palabras": num_palabras,
+            "ngramas": list(ngramas),
+            "criterio": criterio,
+            "palabras_generadas": palabras_generadas,
+            "precision": round(precision, 4),
+            "palabras_comunes": sorted(comunes),
+        }
+
+    if version is None:
+        return calcular()
+    clave = ("palabras_clave", version, num_palabras, ngramas, criterio, frozenset(palabras_clave))
+    return _con_cache_resultados(clave, calcular)
+
+# --- Cubo de tendencias por año, fuente y venue ---
+
+_cubos = OrderedDict()
+_lock_cubos = threading.Lock()
+
+def obtener_cubo_tendencias(articulos, palabras_clave=None):
+    """
+    Devuelve el cubo de tendencias del corpus para las palabras clave (por
+    defecto, las del requerimiento). Se arma una sola vez por versión del
+    corpus a partir de su matriz de frecuencias; el de las palabras clave dadas
+    se persiste junto a 'articulos_unicos.bib', de modo que tras reiniciar el
+    servidor no hay que volver a contar.
+    """
+    palabras_clave = _palabras_unicas(PALABRAS_CLAVE_DADAS if palabras_clave is None else palabras_clave)
+    version = getattr(articulos, 'version', None)
+    if version is None:
+        return cubo_tendencias.obtener_cubo(articulos, palabras_clave, indice=obtener_indice_invertido(articulos))
+
+    clave = tuple(palabras_clave)
+    with _lock_cubos:
+        cubo = _cubos.get(clave)
+        if cubo is not None and cubo.version == version:
+            _cubos.move_to_end(clave)
+            return cubo
+    ruta = TENDENCIAS_FILE_PATH if palabras_clave == PALABRAS_CLAVE_DADAS else None
+    cubo = cubo_tendencias.obtener_cubo(articulos, palabras_clave, ruta, obtener_indice_invertido(articulos))
+    with _lock_cubos:
+        _cubos[clave] = cubo
+        _cubos.move_to_end(clave)
+        while len(_cubos) > CAPACIDAD_CACHE_CUBOS:
+            _cubos.popitem(last=False)
+    return cubo
+
+def consultar_tendencias(articulos, palabra_clave, fuente=None, limite_venues=10):
+    """
+    Serie anual de una palabra clave (apariciones, artículos en los que aparece
+    y artículos publicados por año), en todas las fuentes o solo en `fuente`, y
+    los venues donde más aparece. Si la palabra clave no es una de las dadas,
+    se arma (y conserva) un cubo solo para ella.
+    """
+    palabra_clave = palabra_clave.strip()
+    if not palabra_clave:
+        return {"error": "Indica una palabra clave."}
+    cubo = obtener_cubo_tendencias(articulos)
+    if palabra_clave not in cubo.columna_por_palabra:
+        cubo = obtener_cubo_tendencias(articulos, [palabra_clave])
+    if fuente is not None and fuente not in cubo.fuentes:
+        return {"error": f"Fuente '{fuente}' no encontrada. Opciones: {', '.join(cubo.fuentes)}."}
+    return {
+        "palabra_clave": palabra_clave,
+        "fuente": fuente,
+        "por_anio": cubo.serie_anual(palabra_clave, fuente),
+        "documentos_por_anio": cubo.serie_anual(palabra_clave, fuente, documentos=True),
+        "articulos_por_anio": cubo.articulos_por_anio(fuente),
+        "por_venue": cubo.por_venue(palabra_clave, limite_venues) if fuente is None else None,
+    }
+
 # --- Punto de Entrada del Script ---
 
 if __name__ == '__main__':
     # --- Configuración Inicial ---
-    ruta_bib = os.path.join('..', 'datos', 'procesados', 'articulos_unicos.bib')
-    db = cargar_base_de_datos(ruta_bib)
-
-    # Palabras clave dadas en el requerimiento.
-    palabras_clave_dadas = [
-        "Generative models", "Prompting", "Machine learning", "Multimodality", 
-        "Fine-tuning", "Training data", "Algorithmic bias", "Explainability", 
-        "Transparency", "Ethics", "Privacy", "Personalization", 
-        "Human-AI interaction", "AI literacy", "Co-creation"
-    ]
+    db = cargar_base_de_datos(BIB_FILE_PATH)
+    palabras_clave_dadas = PALABRAS_CLAVE_DADAS
 
     if db:
         articulos_con_abstract = encontrar_articulos_con_abstract(db)
@@ -96,12 +425,31 @@ if __name__ == '__main__':
             # --- Ejecución y Resultados ---
             print("--- Requerimiento 3: Análisis de Frecuencia de Palabras ---")
 
-            # 1. Calcular frecuencia de palabras dadas
-            frecuencias = calcular_frecuencia_palabras_dadas(abstracts, palabras_clave_dadas)
+            # 1. Calcular frecuencia de palabras dadas (con el índice invertido)
+            indice = obtener_indice_invertido(articulos_con_abstract)
+            frecuencias = calcular_frecuencia_palabras_indexadas(articulos_con_abstract, palabras_clave_dadas, indice)
             print("\n1. Frecuencia de palabras clave dadas en todos los resúmenes:")
             for palabra, freq in frecuencias.items():
                 print(f"  - {palabra}: {freq}")
 
+            # Frecuencia de documentos y desglose por fuente (misma pasada por los abstracts)
+            matriz = matriz_frecuencias.obtener_matriz_frecuencias(articulos_con_abstract, palabras_clave_dadas, indice)
+            print("\n   Artículos en los que aparece cada palabra clave:")
+            for palabra, df in matriz.frecuencia_documentos().items():
+                print(f"  - {palabra}: {df}")
+            print("\n   Frecuencia por fuente:")
+            for fuente, frecuencias_fuente in matriz.por_fuente().items():
+                print(f"  [{fuente}] {frecuencias_fuente}")
+
+            # Proximidad: "ethics" a 10 palabras o menos de "privacy"
+            print("\n   Apariciones de 'ethics' a 10 palabras o menos de 'privacy': "
+                  f"{indice.contar_cercanos('ethics', 'privacy', 10)}")
+
+            # Tendencia por año: "Ethics" en SAGE (cubo precalculado)
+            cubo = cubo_tendencias.CuboTendencias.desde_matriz(matriz)
+            print("\n   Apariciones de 'Ethics' por año en SAGE:")
+            print(f"  {cubo.serie_anual('Ethics', 'sage')}")
+
             # 2. Generar nuevas palabras clave
             palabras_generadas = generar_nuevas_palabras_clave(abstracts, num_palabras=15)
             print("\n2. Nuevas palabras clave generadas con TF-IDF (Top 15):")
@@ -0,0 +1,121 @@
+import re
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Separadores que se consideran equivalentes dentro de una frase clave:
+# espacios y guiones (incluidos los guiones Unicode), de modo que
+# "Human-AI interaction" coincide con "human AI interaction".
+SEPARADOR = r"[\s\-‐‑‒–]+"
+_SEPARADOR = re.compile(SEPARADOR)
+
+
+def normalizar_palabra_clave(palabra_clave):
+    """Palabras de una frase clave en minúsculas, sin guiones ni espacios."""
+    return tuple(palabra for palabra in _SEPARADOR.split(palabra_clave.lower().strip()) if palabra)
+
+
+class BuscadorPalabrasClave:
+    """
+    Cuenta todas las palabras clave (y frases de varias palabras) en una sola
+    pasada sobre los textos.
+
+    Se compila una única expresión regular que encuentra los tramos de texto
+    formados solo por palabras que aparecen en alguna palabra clave, separadas
+    por espacios o guiones. Ese recorrido lo hace el motor de expresiones
+    regulares; después, dentro de cada tramo (normalmente de una o dos
+    palabras) se buscan las frases con un trie de palabras. Así se cuentan
+    también las frases contenidas en otras ("learning" dentro de "machine
+    learning"), igual que con una búsqueda independiente por palabra clave.
+    """
+
+    def __init__(self, palabras_clave):
+        self.palabras_clave = list(palabras_clave)
+        self.frase_por_palabra_clave = {palabra: normalizar_palabra_clave(palabra) for palabra in self.palabras_clave}
+        frases = {frase for frase in self.frase_por_palabra_clave.values() if frase}
+
+        # Trie de frases: cada nodo es un diccionario palabra -> nodo; la clave
+        # None marca el final de una frase.
+        self.trie = {}
+        self.longitud_maxima = max((len(frase) for frase in frases), default=0)
+        for frase in frases:
+            nodo = self.trie
+            for palabra in frase:
+                nodo = nodo.setdefault(palabra, {})
+            nodo[None] = frase
+
+        # Las palabras más largas primero, para que la alternación no corte una
+        # palabra que empieza como otra más corta.
+        palabras = sorted({palabra for frase in frases for palabra in frase}, key=len, reverse=True)
+        if palabras:
+            alternacion = "(?:" + "|".join(re.escape(palabra) for palabra in palabras) + ")"
+            palabra = rf"(?<!\w){alternacion}(?!\w)"
+            self.patron = re.compile(rf"{palabra}(?:{SEPARADOR}{palabra})*")
+        else:
+            self.patron = None
+
+    def _contar_tramo(self, palabras, conteos):
+        """Suma las frases que empiezan en cada posición de un tramo de palabras."""
+        for inicio in range(len(palabras)):
+            nodo = self.trie
+            for palabra in palabras[inicio:inicio + self.longitud_maxima]:
+                nodo = nodo.get(palabra)
+                if nodo is None:
+                    break
+                frase = nodo.get(None)
+                if frase is not None:
+                    conteos[frase] = conteos.get(frase, 0) + 1
+
+    def contar_frases(self, texto, conteos=None):
+        """
+        Suma en `conteos` (frase normalizada -> apariciones) las apariciones en
+        un texto. Devuelve el diccionario.
+        """
+        conteos = {} if conteos is None else conteos
+        if self.patron is None:
+            return conteos
+        for tramo in self.patron.finditer(texto.lower()):
+            self._contar_tramo(_SEPARADOR.split(tramo.group()), conteos)
+        return conteos
+
+    def contar(self, textos):
+        """
+        Cuenta las apariciones de cada palabra clave en un iterable de textos,
+        que se recorre una sola vez (puede ser un generador). Devuelve un
+        diccionario con las palabras clave originales como claves.
+        """
+        conteos = {}
+        for texto in textos:
+            self.contar_frases(texto, conteos)
+        return self.por_palabra_clave(conteos)
+
+    def matriz_conteos(self, textos):
+        """
+        Matriz dispersa CSR (textos x palabras clave) con las apariciones de
+        cada palabra clave en cada texto, en la misma pasada que `contar`. Las
+        columnas siguen el orden de `palabras_clave`.
+        """
+        columnas_por_frase = {}
+        for columna, palabra in enumerate(self.palabras_clave):
+            frase = self.frase_por_palabra_clave[palabra]
+            columnas_por_frase.setdefault(frase, []).append(columna)
+
+        indptr = [0]
+        indices = []
+        datos = []
+        for texto in textos:
+            for frase, conteo in self.contar_frases(texto).items():
+                for columna in columnas_por_frase[frase]:
+                    indices.append(columna)
+                    datos.append(conteo)
+            indptr.append(len(indices))
+        matriz = csr_matrix(
+            (np.array(datos, dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(indptr) - 1, len(self.palabras_clave)),
+        )
+        matriz.sort_indices()
+        return matriz
+
+    def por_palabra_clave(self, conteos):
+        """Traduce conteos por frase normalizada a las palabras clave originales."""
+        return {palabra: conteos.get(frase, 0) for palabra, frase in self.frase_por_palabra_clave.items()}
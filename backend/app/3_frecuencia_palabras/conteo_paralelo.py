@@ -0,0 +1,169 @@
+import multiprocessing
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.sparse import vstack
+from sklearn.feature_extraction.text import CountVectorizer
+
+try:
+    from .buscador_palabras_clave import BuscadorPalabrasClave
+except ImportError:  # Ejecución directa como script
+    from buscador_palabras_clave import BuscadorPalabrasClave
+
+# Por debajo de esta cantidad de textos, crear los procesos cuesta más de lo
+# que se gana, y el conteo automático se hace en el proceso actual.
+TEXTOS_MINIMOS_PARALELO = 20_000
+# Fragmentos por proceso: más de uno para repartir mejor la carga si los textos
+# de un fragmento son más largos que los de otro.
+FRAGMENTOS_POR_PROCESO = 4
+# Textos por fragmento al contar términos: acota el vocabulario completo (con
+# n-gramas) que se arma de una vez, que crece con los textos del fragmento.
+TEXTOS_POR_FRAGMENTO_TERMINOS = 2000
+# Candidatos por término pedido que se conservan de cada fragmento y en la suma
+# global al elegir los `max_terminos` más frecuentes.
+CANDIDATOS_POR_TERMINO = 4
+
+
+def _procesos(textos, max_workers):
+    """
+    Cantidad de procesos a usar. Sin `max_workers` se usan todos los núcleos
+    solo si hay al menos `TEXTOS_MINIMOS_PARALELO` textos.
+    """
+    if max_workers is None:
+        if len(textos) < TEXTOS_MINIMOS_PARALELO:
+            return 1
+        max_workers = os.cpu_count() or 1
+    return max(1, min(max_workers, len(textos)))
+
+
+def dividir_en_fragmentos(textos, num_fragmentos):
+    """Divide la lista en fragmentos contiguos de tamaño parejo, conservando el orden."""
+    limites = np.linspace(0, len(textos), num_fragmentos + 1).astype(int)
+    return [textos[inicio:fin] for inicio, fin in zip(limites[:-1], limites[1:]) if fin > inicio]
+
+
+def _iterar_fragmentos(funcion, fragmentos, procesos, *argumentos):
+    """
+    Aplica `funcion(*argumentos, fragmento)` a cada fragmento en un pool de
+    procesos y entrega los resultados en orden a medida que se consumen, sin
+    retenerlos todos. Con un solo proceso se calcula en el actual.
+    """
+    if procesos == 1:
+        for fragmento in fragmentos:
+            yield funcion(*argumentos, fragmento)
+        return
+    # 'spawn' evita heredar hilos y locks del servidor al crear los procesos.
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(procesos, len(fragmentos)), mp_context=contexto) as executor:
+        futuros = deque(executor.submit(funcion, *argumentos, fragmento) for fragmento in fragmentos)
+        while futuros:
+            yield futuros.popleft().result()
+
+
+def _contar_frases_fragmento(palabras_clave, textos):
+    conteos = {}
+    buscador = BuscadorPalabrasClave(palabras_clave)
+    for texto in textos:
+        buscador.contar_frases(texto, conteos)
+    return conteos
+
+
+def contar_palabras_clave(textos, palabras_clave, max_workers=None):
+    """
+    Apariciones de cada palabra clave en una lista de textos. Los textos se
+    dividen en fragmentos que se cuentan en procesos separados con
+    `BuscadorPalabrasClave`, y los conteos parciales se suman: el resultado es
+    el mismo que el de `BuscadorPalabrasClave.contar`.
+    """
+    buscador = BuscadorPalabrasClave(palabras_clave)
+    procesos = _procesos(textos, max_workers)
+    if procesos == 1:
+        return buscador.contar(textos)
+
+    fragmentos = dividir_en_fragmentos(textos, procesos * FRAGMENTOS_POR_PROCESO)
+    conteos = Counter()
+    for parcial in _iterar_fragmentos(_contar_frases_fragmento, fragmentos, procesos, buscador.palabras_clave):
+        conteos.update(parcial)
+    return buscador.por_palabra_clave(conteos)
+
+
+def _mas_frecuentes(totales, limite):
+    """Los `limite` términos de mayor total (desempate alfabético) de un diccionario término -> total."""
+    if limite is None or len(totales) <= limite:
+        return totales
+    return dict(sorted(totales.items(), key=lambda item: (-item[1], item[0]))[:limite])
+
+
+def _frecuencias_terminos_fragmento(parametros, limite, textos):
+    contador = CountVectorizer(**parametros)
+    try:
+        conteos = contador.fit_transform(textos)
+    except ValueError:
+        # Fragmento sin ningún término (p. ej. solo stop words).
+        return {}
+    totales = np.asarray(conteos.sum(axis=0)).ravel()
+    return _mas_frecuentes(dict(zip(contador.get_feature_names_out().tolist(), totales.tolist())), limite)
+
+
+def _conteos_fragmento(parametros, vocabulario, textos):
+    return CountVectorizer(vocabulary=vocabulario, **parametros).transform(textos)
+
+
+def matriz_conteos_terminos(textos, parametros, max_terminos=None, max_workers=None):
+    """
+    Equivalente de `CountVectorizer(**parametros, max_features=max_terminos).fit_transform(textos)`
+    por fragmentos, repartidos entre procesos en corpus grandes. Devuelve
+    (términos, matriz de conteos).
+
+    Se hacen dos pasadas por fragmentos de hasta `TEXTOS_POR_FRAGMENTO_TERMINOS`
+    textos: la primera cuenta los términos de cada fragmento y la segunda
+    cuenta solo los elegidos, con un vocabulario fijo; las matrices parciales se
+    apilan en el orden de los textos. Un corpus de un solo fragmento se cuenta
+    directamente con `max_features`.
+
+    Memoria: el vocabulario completo (con n-gramas) solo existe para un
+    fragmento a la vez. Con `max_terminos`, cada fragmento conserva sus
+    `CANDIDATOS_POR_TERMINO * max_terminos` términos más frecuentes y la suma
+    global se recorta a esa misma cantidad cada vez que la duplica, así que el
+    pico no crece con el vocabulario del corpus; sin `max_terminos` la suma
+    guarda todo el vocabulario. La matriz devuelta solo tiene las columnas
+    elegidas.
+
+    Mientras no se descarte ningún término (vocabulario total por debajo del
+    límite de candidatos) la selección es la de `max_features`, incluido su
+    desempate. Si no, es aproximada: un término que no entra entre los
+    candidatos de ningún fragmento puede quedar fuera aunque su total lo
+    merezca. Los conteos de los términos elegidos siempre son exactos, porque
+    salen de la segunda pasada.
+    """
+    procesos = _procesos(textos, max_workers)
+    num_fragmentos = max(procesos * FRAGMENTOS_POR_PROCESO if procesos > 1 else 1,
+                         -(-len(textos) // TEXTOS_POR_FRAGMENTO_TERMINOS))
+    if num_fragmentos == 1:
+        contador = CountVectorizer(max_features=max_terminos, **parametros)
+        conteos = contador.fit_transform(textos)
+        return contador.get_feature_names_out(), conteos
+
+    fragmentos = dividir_en_fragmentos(textos, num_fragmentos)
+    limite = CANDIDATOS_POR_TERMINO * max_terminos if max_terminos is not None else None
+    totales = Counter()
+    for parcial in _iterar_fragmentos(_frecuencias_terminos_fragmento, fragmentos, procesos, parametros, limite):
+        totales.update(parcial)
+        if limite is not None and len(totales) > 2 * limite:
+            totales = Counter(_mas_frecuentes(totales, limite))
+    if not totales:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+
+    # Mismo orden y selección que CountVectorizer: vocabulario alfabético y,
+    # si hay límite, los más frecuentes según (-frecuencia).argsort().
+    terminos = np.array(sorted(totales))
+    if max_terminos is not None and max_terminos < len(terminos):
+        frecuencias = np.array([totales[termino] for termino in terminos.tolist()], dtype=np.int64)
+        terminos = np.sort(terminos[(-frecuencias).argsort()[:max_terminos]])
+    del totales
+
+    vocabulario = {termino: columna for columna, termino in enumerate(terminos.tolist())}
+    parciales = list(_iterar_fragmentos(_conteos_fragmento, fragmentos, procesos, parametros, vocabulario))
+    return terminos.astype(object), vstack(parciales, format='csr')
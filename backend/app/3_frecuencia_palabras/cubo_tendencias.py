@@ -0,0 +1,180 @@
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+try:
+    from . import matriz_frecuencias
+except ImportError:  # Ejecución directa como script
+    import matriz_frecuencias
+
+# Versión del formato del archivo persistido.
+VERSION_FORMATO = 1
+
+
+def _sumar_por_grupo(matriz, grupos, num_grupos):
+    """Suma las filas de `matriz` (CSR) que comparten grupo: devuelve un arreglo denso (grupos x columnas)."""
+    pertenencia = csr_matrix(
+        (np.ones(len(grupos), dtype=np.int32), (grupos, np.arange(len(grupos)))),
+        shape=(num_grupos, len(grupos)),
+    )
+    return (pertenencia @ matriz).toarray().astype(np.int32)
+
+
+class CuboTendencias:
+    """
+    Agregados precalculados de las frecuencias de un conjunto de palabras clave
+    por año de publicación, base de datos de origen y venue (revista o
+    congreso).
+
+    - `conteos[k, a, f]`: apariciones de la palabra clave k en los artículos
+      del año `anios[a]` de la fuente `fuentes[f]`.
+    - `documentos[k, a, f]`: artículos de ese grupo en los que aparece.
+    - `articulos[a, f]`: artículos con abstract del grupo.
+    - `conteos_venue[k, v]`: apariciones de k en los artículos de `venues[v]`.
+
+    Se arma a partir de la `MatrizFrecuencias` del corpus (una pasada por los
+    abstracts o el índice invertido), de modo que las consultas por año, fuente
+    o venue son sumas sobre arreglos pequeños y no recorren el texto.
+    """
+
+    def __init__(self, palabras_clave, anios, fuentes, venues, conteos, documentos, articulos, conteos_venue,
+                 version=None):
+        self.palabras_clave = list(palabras_clave)
+        self.columna_por_palabra = {palabra: k for k, palabra in enumerate(self.palabras_clave)}
+        self.anios = np.asarray(anios, dtype=np.int32)
+        self.fuentes = list(fuentes)
+        self.venues = list(venues)
+        self.conteos = conteos
+        self.documentos = documentos
+        self.articulos = articulos
+        self.conteos_venue = conteos_venue
+        self.version = version
+
+    @classmethod
+    def desde_matriz(cls, frecuencias):
+        """Construye el cubo agrupando las filas de una `MatrizFrecuencias`."""
+        matriz = frecuencias.matriz
+        num_palabras = len(frecuencias.palabras_clave)
+        anios, fila_anio = np.unique(frecuencias.anios, return_inverse=True)
+        fuentes = list(frecuencias.nombres_fuentes)
+        fila_fuente = np.searchsorted(np.array(fuentes, dtype=object), frecuencias.fuentes)
+        venues, fila_venue = np.unique(frecuencias.venues.astype(str), return_inverse=True)
+
+        num_anios, num_fuentes = len(anios), len(fuentes)
+        grupos = fila_anio * num_fuentes + fila_fuente
+        forma = (num_anios, num_fuentes, num_palabras)
+        # (años x fuentes x palabras) -> (palabras x años x fuentes)
+        conteos = _sumar_por_grupo(matriz, grupos, num_anios * num_fuentes).reshape(forma).transpose(2, 0, 1)
+        presencia = (matriz > 0).astype(np.int32)
+        documentos = _sumar_por_grupo(presencia, grupos, num_anios * num_fuentes).reshape(forma).transpose(2, 0, 1)
+        articulos = np.bincount(grupos, minlength=num_anios * num_fuentes).astype(np.int32).reshape(num_anios, num_fuentes)
+        conteos_venue = _sumar_por_grupo(matriz, fila_venue, len(venues)).T
+
+        return cls(frecuencias.palabras_clave, anios, fuentes, venues.tolist(),
+                   np.ascontiguousarray(conteos), np.ascontiguousarray(documentos), articulos,
+                   np.ascontiguousarray(conteos_venue), frecuencias.version)
+
+    def _filtro_fuente(self, fuente):
+        """Índices de fuente a sumar: todas si `fuente` es None, ninguna si no existe."""
+        if fuente is None:
+            return slice(None)
+        return [self.fuentes.index(fuente)] if fuente in self.fuentes else []
+
+    def serie_anual(self, palabra_clave, fuente=None, documentos=False):
+        """
+        Apariciones (o artículos, con `documentos`) de la palabra clave por año,
+        en todas las fuentes o solo en `fuente`. Devuelve {año: valor} en orden
+        de año; el año `ANIO_DESCONOCIDO` (0) agrupa las entradas sin año. None
+        si la palabra clave no está en el cubo.
+        """
+        k = self.columna_por_palabra.get(palabra_clave)
+        if k is None:
+            return None
+        cubo = self.documentos if documentos else self.conteos
+        valores = cubo[k][:, self._filtro_fuente(fuente)].sum(axis=1)
+        return {int(anio): int(valor) for anio, valor in zip(self.anios, valores)}
+
+    def articulos_por_anio(self, fuente=None):
+        """Artículos con abstract por año, en todas las fuentes o solo en `fuente`."""
+        valores = self.articulos[:, self._filtro_fuente(fuente)].sum(axis=1)
+        return {int(anio): int(valor) for anio, valor in zip(self.anios, valores)}
+
+    def valor(self, palabra_clave, anio=None, fuente=None, documentos=False):
+        """Apariciones (o artículos) de la palabra clave en un año y una fuente; None en cualquiera de ellos suma todos."""
+        k = self.columna_por_palabra.get(palabra_clave)
+        if k is None:
+            return None
+        cubo = (self.documentos if documentos else self.conteos)[k]
+        if anio is not None:
+            cubo = cubo[self.anios == anio]
+        return int(cubo[:, self._filtro_fuente(fuente)].sum())
+
+    def por_venue(self, palabra_clave, limite=None):
+        """Venues con apariciones de la palabra clave, de más a menos: [(venue, apariciones)]."""
+        k = self.columna_por_palabra.get(palabra_clave)
+        if k is None:
+            return None
+        valores = self.conteos_venue[k]
+        orden = [v for v in np.argsort(-valores, kind='stable') if valores[v] > 0][:limite]
+        return [(self.venues[v] or 'desconocido', int(valores[v])) for v in orden]
+
+    def guardar(self, ruta):
+        """Guarda el cubo en un archivo .npz."""
+        version = np.array(self.version if self.version is not None else (-1, -1), dtype=np.int64)
+        with open(ruta, 'wb') as archivo:
+            np.savez_compressed(
+                archivo,
+                palabras_clave=np.array(self.palabras_clave, dtype=str),
+                anios=self.anios,
+                fuentes=np.array(self.fuentes, dtype=str),
+                venues=np.array(self.venues, dtype=str),
+                conteos=self.conteos,
+                documentos=self.documentos,
+                articulos=self.articulos,
+                conteos_venue=self.conteos_venue,
+                formato=np.array([VERSION_FORMATO], dtype=np.int64),
+                version=version,
+            )
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un cubo guardado con `guardar`. Devuelve None si no existe, está dañado o es de otro formato."""
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta) as datos:
+                if int(datos['formato'][0]) != VERSION_FORMATO:
+                    return None
+                version = tuple(int(v) for v in datos['version'])
+                return cls(datos['palabras_clave'].tolist(), datos['anios'], datos['fuentes'].tolist(),
+                           datos['venues'].tolist(), datos['conteos'], datos['documentos'], datos['articulos'],
+                           datos['conteos_venue'], None if version == (-1, -1) else version)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[ERROR] No se pudo cargar el cubo de tendencias de {ruta}: {e}")
+            return None
+
+
+def obtener_cubo(articulos, palabras_clave, ruta=None, indice=None):
+    """
+    Carga el cubo persistido en `ruta` si corresponde a la versión actual del
+    corpus y a las mismas palabras clave; si no, lo construye a partir de la
+    matriz de frecuencias (con el índice invertido, si se pasa) y, si hay ruta
+    y versión, lo guarda.
+    """
+    palabras_clave = list(palabras_clave)
+    version = getattr(articulos, 'version', None)
+    if ruta is not None and version is not None:
+        cubo = CuboTendencias.cargar(ruta)
+        if cubo is not None and cubo.version == version and cubo.palabras_clave == palabras_clave:
+            return cubo
+
+    matriz = matriz_frecuencias.obtener_matriz_frecuencias(articulos, palabras_clave, indice)
+    cubo = CuboTendencias.desde_matriz(matriz)
+    if ruta is not None and version is not None:
+        try:
+            cubo.guardar(ruta)
+            print(f"[INFO] Cubo de tendencias guardado en: {ruta}")
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar el cubo de tendencias: {e}")
+    return cubo
@@ -0,0 +1,239 @@
+import os
+import re
+
+import numpy as np
+
+try:
+    from .buscador_palabras_clave import SEPARADOR, normalizar_palabra_clave
+except ImportError:  # Ejecución directa como script
+    from buscador_palabras_clave import SEPARADOR, normalizar_palabra_clave
+
+CAMPOS = ('abstract', 'title')
+# Versión del formato del archivo persistido.
+VERSION_FORMATO = 2
+
+_PALABRAS_Y_SEPARADORES = re.compile(r"(\W+)")
+_SOLO_SEPARADOR = re.compile(SEPARADOR)
+_PALABRA = re.compile(r"\w+")
+# Las claves de posición combinan documento y posición en un entero de 64 bits.
+_DESPLAZAMIENTO = np.int64(1) << 32
+
+
+def tokenizar_con_posiciones(texto):
+    """
+    Palabras del texto en minúsculas con su posición (el número de palabra, de
+    modo que las distancias cuentan palabras) y si están unidas a la anterior.
+    Una palabra está unida si la separan de la anterior solo espacios o
+    guiones; después de cualquier otro signo (punto, coma...) no lo está, y una
+    frase no coincide a través de él, igual que en `BuscadorPalabrasClave`.
+    Devuelve (palabras, posiciones, unidas).
+    """
+    partes = _PALABRAS_Y_SEPARADORES.split(texto.lower())
+    palabras = []
+    unidas = []
+    unida = False
+    # `partes` alterna palabra, separador, palabra...; puede empezar o terminar vacía.
+    for i in range(0, len(partes), 2):
+        if partes[i]:
+            palabras.append(partes[i])
+            unidas.append(unida)
+        if i + 1 < len(partes):
+            unida = bool(palabras) and _SOLO_SEPARADOR.fullmatch(partes[i + 1]) is not None
+    return palabras, list(range(len(palabras))), unidas
+
+
+class IndiceInvertido:
+    """
+    Índice invertido posicional sobre los abstracts y los títulos del corpus.
+
+    Para cada campo, las apariciones de todos los términos se guardan ordenadas
+    por (término, documento, posición) en tres arreglos (`documentos`,
+    `posiciones` y `unidas`, si la palabra sigue a la anterior sin signos de
+    por medio); `inicios[t]:inicios[t + 1]` delimita las del término t. Los
+    documentos son las entradas del corpus en orden (`ids`). Con esto, las
+    frases, la proximidad y los conteos por artículo se resuelven con
+    operaciones de NumPy sobre las listas de apariciones, sin releer el texto.
+    """
+
+    def __init__(self, ids, terminos, campos, version=None):
+        self.ids = list(ids)
+        self.terminos = list(terminos)
+        self.id_por_termino = {termino: i for i, termino in enumerate(self.terminos)}
+        # campo -> (inicios, documentos, posiciones, unidas)
+        self.campos = campos
+        self.version = version
+
+    @classmethod
+    def construir(cls, articulos, version=None):
+        """Construye el índice a partir de las entradas del corpus."""
+        id_por_termino = {}
+        terminos = []
+        campos = {}
+        for campo in CAMPOS:
+            ids_termino, documentos, posiciones, unidas = [], [], [], []
+            for documento, articulo in enumerate(articulos):
+                palabras, posiciones_documento, unidas_documento = tokenizar_con_posiciones(articulo.get(campo, ''))
+                for palabra in palabras:
+                    id_termino = id_por_termino.get(palabra)
+                    if id_termino is None:
+                        id_termino = id_por_termino[palabra] = len(terminos)
+                        terminos.append(palabra)
+                    ids_termino.append(id_termino)
+                documentos.extend([documento] * len(palabras))
+                posiciones.extend(posiciones_documento)
+                unidas.extend(unidas_documento)
+            campos[campo] = (
+                np.array(ids_termino, dtype=np.int64),
+                np.array(documentos, dtype=np.int32),
+                np.array(posiciones, dtype=np.int32),
+                np.array(unidas, dtype=bool),
+            )
+
+        for campo, (ids_termino, documentos, posiciones, unidas) in campos.items():
+            # Las apariciones ya están ordenadas por documento y posición; basta
+            # un orden estable por término.
+            orden = np.argsort(ids_termino, kind='stable')
+            inicios = np.searchsorted(ids_termino[orden], np.arange(len(terminos) + 1)).astype(np.int64)
+            campos[campo] = (inicios, documentos[orden], posiciones[orden], unidas[orden])
+        ids = [articulo.get('ID', '') for articulo in articulos]
+        return cls(ids, terminos, campos, version)
+
+    def admite(self, frase):
+        """Si la frase se puede consultar en el índice (palabras sin otros signos)."""
+        palabras = normalizar_palabra_clave(frase)
+        return bool(palabras) and all(_PALABRA.fullmatch(palabra) for palabra in palabras)
+
+    def _claves(self, palabra, campo, solo_unidas=False):
+        """
+        Claves documento/posición (ordenadas) de las apariciones de una palabra;
+        con `solo_unidas`, solo las que siguen a la palabra anterior sin signos
+        de por medio (las que pueden continuar una frase).
+        """
+        id_termino = self.id_por_termino.get(palabra)
+        if id_termino is None:
+            return np.zeros(0, dtype=np.int64)
+        inicios, documentos, posiciones, unidas = self.campos[campo]
+        inicio, fin = inicios[id_termino], inicios[id_termino + 1]
+        claves = documentos[inicio:fin].astype(np.int64) * _DESPLAZAMIENTO + posiciones[inicio:fin]
+        return claves[unidas[inicio:fin]] if solo_unidas else claves
+
+    def posiciones_frase(self, frase, campo='abstract'):
+        """Claves documento/posición de cada aparición de la frase (posición de su primera palabra)."""
+        palabras = normalizar_palabra_clave(frase)
+        if not palabras:
+            return np.zeros(0, dtype=np.int64)
+        claves = self._claves(palabras[0], campo)
+        for desplazamiento, palabra in enumerate(palabras[1:], 1):
+            if len(claves) == 0:
+                break
+            siguientes = self._claves(palabra, campo, solo_unidas=True)
+            claves = claves[np.isin(claves + desplazamiento, siguientes, assume_unique=True)]
+        return claves
+
+    def contar_frase(self, frase, campo='abstract'):
+        """Apariciones de la frase en todo el corpus."""
+        return len(self.posiciones_frase(frase, campo))
+
+    def aciertos_por_documento(self, claves):
+        """Convierte claves de apariciones en (documentos, cantidad de apariciones en cada uno)."""
+        return np.unique(claves // _DESPLAZAMIENTO, return_counts=True)
+
+    def aciertos_por_articulo(self, frase, campo='abstract'):
+        """Apariciones de la frase en cada artículo que la contiene: {id: cantidad}."""
+        documentos, cantidades = self.aciertos_por_documento(self.posiciones_frase(frase, campo))
+        resultado = {}
+        for documento, cantidad in zip(documentos.tolist(), cantidades.tolist()):
+            id_articulo = self.ids[documento]
+            resultado[id_articulo] = resultado.get(id_articulo, 0) + cantidad
+        return resultado
+
+    def frecuencias(self, palabras_clave, campo='abstract'):
+        """
+        Apariciones de cada palabra clave que admite el índice (ver `admite`);
+        las demás no se incluyen en el diccionario.
+        """
+        return {palabra: self.contar_frase(palabra, campo) for palabra in palabras_clave if self.admite(palabra)}
+
+    def cercanos(self, frase_a, frase_b, distancia, campo='abstract'):
+        """
+        Apariciones de `frase_a` que tienen una aparición de `frase_b` a lo sumo
+        `distancia` palabras antes o después, en el mismo documento (los signos
+        de puntuación no cuentan: en "ethics, privacy" están a distancia 1).
+        Devuelve sus claves documento/posición.
+        """
+        claves_a = self.posiciones_frase(frase_a, campo)
+        claves_b = np.sort(self.posiciones_frase(frase_b, campo))
+        if len(claves_a) == 0 or len(claves_b) == 0:
+            return np.zeros(0, dtype=np.int64)
+        # Las claves de otro documento están a más de 2^32 - distancia, por lo
+        # que la ventana no cruza documentos.
+        desde = np.searchsorted(claves_b, claves_a - distancia, side='left')
+        hasta = np.searchsorted(claves_b, claves_a + distancia, side='right')
+        # Si la misma frase se busca cerca de sí misma, no cuenta su propia aparición.
+        propias = np.isin(claves_a, claves_b) if normalizar_palabra_clave(frase_a) == normalizar_palabra_clave(frase_b) else 0
+        return claves_a[(hasta - desde - propias) > 0]
+
+    def contar_cercanos(self, frase_a, frase_b, distancia, campo='abstract'):
+        """Cantidad de apariciones de `frase_a` a `distancia` palabras o menos de `frase_b`."""
+        return len(self.cercanos(frase_a, frase_b, distancia, campo))
+
+    def guardar(self, ruta):
+        """Guarda el índice en un archivo .npz."""
+        version = np.array(self.version if self.version is not None else (-1, -1), dtype=np.int64)
+        arreglos = {}
+        for campo, (inicios, documentos, posiciones, unidas) in self.campos.items():
+            arreglos[f"{campo}_inicios"] = inicios
+            arreglos[f"{campo}_documentos"] = documentos
+            arreglos[f"{campo}_posiciones"] = posiciones
+            arreglos[f"{campo}_unidas"] = unidas
+        with open(ruta, 'wb') as archivo:
+            np.savez_compressed(
+                archivo,
+                ids=np.array(self.ids, dtype=str),
+                terminos=np.array(self.terminos, dtype=str),
+                formato=np.array([VERSION_FORMATO], dtype=np.int64),
+                version=version,
+                **arreglos,
+            )
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un índice guardado con `guardar`. Devuelve None si no existe, está dañado o es de otro formato."""
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta) as datos:
+                if int(datos['formato'][0]) != VERSION_FORMATO:
+                    return None
+                campos = {
+                    campo: tuple(datos[f"{campo}_{arreglo}"] for arreglo in ('inicios', 'documentos', 'posiciones', 'unidas'))
+                    for campo in CAMPOS
+                }
+                version = tuple(int(v) for v in datos['version'])
+                return cls(datos['ids'].tolist(), datos['terminos'].tolist(), campos,
+                           None if version == (-1, -1) else version)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[ERROR] No se pudo cargar el índice invertido de {ruta}: {e}")
+            return None
+
+
+def obtener_indice(articulos, ruta=None):
+    """
+    Carga el índice persistido en `ruta` si corresponde a la versión actual del
+    corpus; si no, lo construye y (si hay ruta y versión) lo guarda.
+    """
+    version = getattr(articulos, 'version', None)
+    if ruta is not None and version is not None:
+        indice = IndiceInvertido.cargar(ruta)
+        if (indice is not None and indice.version == version
+                and indice.ids == [articulo.get('ID', '') for articulo in articulos]):
+            return indice
+
+    indice = IndiceInvertido.construir(articulos, version)
+    if ruta is not None and version is not None:
+        try:
+            indice.guardar(ruta)
+            print(f"[INFO] Índice invertido guardado en: {ruta}")
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar el índice invertido: {e}")
+    return indice
@@ -0,0 +1,72 @@
+import re
+
+import bibtexparser
+from bibtexparser.bibdatabase import BibDatabase
+from bibtexparser.bparser import BibTexParser
+
+# Tamaño de los bloques que se leen del archivo.
+TAMANO_BLOQUE = 1 << 20
+_DELIMITADORES = re.compile(r"[@{}]")
+
+
+def _textos_de_entradas(archivo, tamano_bloque):
+    """
+    Recorre el archivo por bloques y genera el texto de cada entrada (desde su
+    '@' hasta la llave que la cierra). Solo se revisan los caracteres '@', '{'
+    y '}', por lo que el costo en Python es proporcional a la cantidad de
+    llaves y no al tamaño del texto. Las entradas pueden estar en la misma
+    línea que la anterior, como en las descargas de IEEE.
+    """
+    pendiente = ''
+    inicio = None  # Posición del '@' de la entrada en curso dentro de `pendiente`.
+    profundidad = 0
+    while True:
+        bloque = archivo.read(tamano_bloque)
+        if not bloque:
+            break
+        desde = len(pendiente)
+        pendiente += bloque
+        for delimitador in _DELIMITADORES.finditer(pendiente, desde):
+            caracter = delimitador.group()
+            if caracter == '@':
+                if profundidad == 0:
+                    inicio = delimitador.start()
+            elif inicio is None:
+                continue
+            elif caracter == '{':
+                profundidad += 1
+            elif profundidad > 0:
+                profundidad -= 1
+                if profundidad == 0:
+                    yield pendiente[inicio:delimitador.end()]
+                    inicio = None
+        # Solo se conserva la entrada incompleta.
+        if inicio is None:
+            pendiente = ''
+        else:
+            pendiente = pendiente[inicio:]
+            inicio = 0
+
+
+def iterar_entradas_bib(ruta_archivo_bib, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera las entradas de un archivo .bib una por una, sin cargar el archivo
+    completo. Cada entrada se interpreta con el mismo parser (y opciones) que
+    `cargar_base_de_datos`, así que los campos y las entradas descartadas son
+    los mismos; en memoria solo hay una entrada a la vez.
+    """
+    parser = BibTexParser(common_strings=False)
+    parser.ignore_errors = True
+    parser.expect_multiple_parse = True
+    with open(ruta_archivo_bib, 'r', encoding='utf-8') as bibtex_file:
+        for texto in _textos_de_entradas(bibtex_file, tamano_bloque):
+            # Una base de datos nueva por entrada para no acumularlas.
+            parser.bib_database = BibDatabase()
+            yield from bibtexparser.loads(texto, parser=parser).entries
+
+
+def iterar_abstracts(ruta_archivo_bib, tamano_bloque=TAMANO_BLOQUE):
+    """Genera los abstracts no vacíos del archivo, entrada por entrada."""
+    for entrada in iterar_entradas_bib(ruta_archivo_bib, tamano_bloque):
+        if 'abstract' in entrada and entrada['abstract'].strip():
+            yield entrada['abstract']
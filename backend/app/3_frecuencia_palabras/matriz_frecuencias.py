@@ -0,0 +1,196 @@
+import re
+import threading
+
+import numpy as np
+from scipy.sparse import coo_matrix
+
+try:
+    from . import buscador_palabras_clave
+except ImportError:  # Ejecución directa como script
+    import buscador_palabras_clave
+
+# Prefijos DOI (y dominios de URL) de cada base de datos de origen.
+FUENTES_POR_DOI = {
+    '10.1109/': 'ieee',
+    '10.1177/': 'sage',
+    '10.1016/': 'sciencedirect',
+}
+FUENTES_POR_URL = {
+    'ieeexplore': 'ieee',
+    'sagepub': 'sage',
+    'sciencedirect': 'sciencedirect',
+}
+FUENTE_DESCONOCIDA = 'desconocida'
+# Matrices de frecuencias (una por conjunto de palabras clave) que se conservan
+# junto al corpus; se descartan las usadas hace más tiempo.
+CAPACIDAD_CACHE_MATRICES = 32
+# Año de las entradas sin un año reconocible.
+ANIO_DESCONOCIDO = 0
+_ANIO = re.compile(r"\d{4}")
+
+
+def detectar_fuente(entrada):
+    """Base de datos de la que proviene una entrada BibTeX, según su DOI o URL."""
+    doi = entrada.get('doi', '')
+    for prefijo, fuente in FUENTES_POR_DOI.items():
+        if prefijo in doi:
+            return fuente
+    url = entrada.get('url', '').lower()
+    for dominio, fuente in FUENTES_POR_URL.items():
+        if dominio in url:
+            return fuente
+    return FUENTE_DESCONOCIDA
+
+
+def detectar_anio(entrada):
+    """Año de publicación de una entrada ('2019b' -> 2019), o `ANIO_DESCONOCIDO`."""
+    anio = _ANIO.search(entrada.get('year', ''))
+    return int(anio.group()) if anio else ANIO_DESCONOCIDO
+
+
+def detectar_venue(entrada):
+    """Revista o congreso de una entrada (`journal` o `booktitle`), o '' si no tiene."""
+    return ' '.join((entrada.get('journal') or entrada.get('booktitle') or '').split())
+
+
+class MatrizFrecuencias:
+    """
+    Frecuencias de un conjunto de palabras clave en cada artículo con abstract.
+
+    `matriz` es una matriz dispersa CSR (artículos x palabras clave) con la
+    frecuencia de cada palabra en cada abstract; `ids`, `fuentes`, `anios` y
+    `venues` describen sus filas y `palabras_clave` sus columnas. Se construye
+    en una sola pasada por los abstracts (o, si se pasa un índice invertido de
+    `articulos`, a partir de sus listas de apariciones) y de ella salen todas
+    las estadísticas (frecuencia total, frecuencia de documentos, desgloses
+    por fuente, año o venue) sin volver a leer el texto.
+    """
+
+    def __init__(self, articulos, palabras_clave, version=None, indice=None):
+        self.version = version
+        self.palabras_clave = list(palabras_clave)
+        con_abstract = [articulo for articulo in articulos if articulo.get('abstract', '').strip()]
+        self.ids = [articulo.get('ID') for articulo in con_abstract]
+        self.fila_por_id = {}
+        for fila, id_articulo in enumerate(self.ids):
+            self.fila_por_id.setdefault(id_articulo, fila)
+        fuentes = [detectar_fuente(articulo) for articulo in con_abstract]
+        self.fuentes = np.array(fuentes, dtype=object)
+        self.nombres_fuentes = sorted(set(fuentes))
+        self.anios = np.array([detectar_anio(articulo) for articulo in con_abstract], dtype=np.int32)
+        self.venues = np.array([detectar_venue(articulo) for articulo in con_abstract], dtype=object)
+
+        # Un índice de otro corpus no sirve: sus documentos no son estas entradas.
+        if indice is not None and indice.ids != [articulo.get('ID', '') for articulo in articulos]:
+            indice = None
+        if indice is None:
+            buscador = buscador_palabras_clave.BuscadorPalabrasClave(self.palabras_clave)
+            self.matriz = buscador.matriz_conteos(articulo['abstract'] for articulo in con_abstract)
+        else:
+            self.matriz = self._matriz_desde_indice(articulos, con_abstract, indice)
+
+    def _matriz_desde_indice(self, articulos, con_abstract, indice):
+        """
+        Arma la matriz con las apariciones de cada palabra clave en el índice
+        (cuyos documentos son las entradas de `articulos`, en orden). Las
+        palabras clave que el índice no admite se cuentan sobre el texto.
+        """
+        # Fila de la matriz de cada documento del índice (-1 si no tiene abstract).
+        fila_por_documento = np.full(len(articulos), -1, dtype=np.int64)
+        filas_con_abstract = {id(articulo): fila for fila, articulo in enumerate(con_abstract)}
+        for documento, articulo in enumerate(articulos):
+            fila_por_documento[documento] = filas_con_abstract.get(id(articulo), -1)
+
+        filas, columnas, datos = [], [], []
+        sin_indice = []
+        for columna, palabra in enumerate(self.palabras_clave):
+            if not indice.admite(palabra):
+                sin_indice.append(columna)
+                continue
+            documentos, cantidades = indice.aciertos_por_documento(indice.posiciones_frase(palabra))
+            filas.append(fila_por_documento[documentos])
+            columnas.append(np.full(len(documentos), columna, dtype=np.int64))
+            datos.append(cantidades)
+        if sin_indice:
+            buscador = buscador_palabras_clave.BuscadorPalabrasClave([self.palabras_clave[c] for c in sin_indice])
+            parcial = buscador.matriz_conteos(articulo['abstract'] for articulo in con_abstract).tocoo()
+            filas.append(parcial.row)
+            columnas.append(np.array(sin_indice, dtype=np.int64)[parcial.col])
+            datos.append(parcial.data)
+
+        filas = np.concatenate(filas) if filas else np.zeros(0, dtype=np.int64)
+        columnas = np.concatenate(columnas) if columnas else np.zeros(0, dtype=np.int64)
+        datos = np.concatenate(datos).astype(np.int32) if datos else np.zeros(0, dtype=np.int32)
+        matriz = coo_matrix(
+            (datos, (filas, columnas)), shape=(len(con_abstract), len(self.palabras_clave))
+        ).tocsr()
+        matriz.sort_indices()
+        return matriz
+
+    def _por_palabra(self, valores):
+        return {palabra: int(valor) for palabra, valor in zip(self.palabras_clave, valores)}
+
+    def _filas_fuente(self, fuente):
+        return np.flatnonzero(self.fuentes == fuente)
+
+    def frecuencia_total(self):
+        """Apariciones de cada palabra clave en todo el corpus."""
+        return self._por_palabra(np.asarray(self.matriz.sum(axis=0)).ravel())
+
+    def frecuencia_documentos(self):
+        """Cantidad de artículos en los que aparece cada palabra clave."""
+        return self._por_palabra(np.bincount(self.matriz.indices, minlength=len(self.palabras_clave)))
+
+    def frecuencia_articulo(self, id_articulo):
+        """Apariciones de cada palabra clave en un artículo, o None si no está."""
+        fila = self.fila_por_id.get(id_articulo)
+        if fila is None:
+            return None
+        return self._por_palabra(self.matriz[fila].toarray().ravel())
+
+    def por_fuente(self):
+        """Frecuencia total de cada palabra clave desglosada por base de datos."""
+        return {
+            fuente: self._por_palabra(np.asarray(self.matriz[self._filas_fuente(fuente)].sum(axis=0)).ravel())
+            for fuente in self.nombres_fuentes
+        }
+
+    def documentos_por_fuente(self):
+        """Frecuencia de documentos de cada palabra clave desglosada por base de datos."""
+        resultado = {}
+        for fuente in self.nombres_fuentes:
+            submatriz = self.matriz[self._filas_fuente(fuente)]
+            resultado[fuente] = self._por_palabra(np.bincount(submatriz.indices, minlength=len(self.palabras_clave)))
+        return resultado
+
+    def articulos_por_fuente(self):
+        """Cantidad de artículos con abstract de cada base de datos."""
+        return {fuente: len(self._filas_fuente(fuente)) for fuente in self.nombres_fuentes}
+
+
+_lock = threading.Lock()
+
+
+def obtener_matriz_frecuencias(articulos, palabras_clave, indice=None):
+    """
+    Devuelve la matriz de frecuencias del corpus para esas palabras clave. Se
+    guarda junto al corpus (en `articulos.frecuencias`, un LRU por conjunto de
+    palabras clave acotado a `CAPACIDAD_CACHE_MATRICES`), de modo que se
+    calcula una sola vez por cada carga del corpus aunque la API reciba muchas
+    listas distintas; las listas simples se recorren en cada llamada. Si se
+    pasa el índice invertido del corpus, la matriz se arma a partir de él.
+    """
+    palabras_clave = tuple(palabras_clave)
+    cache = getattr(articulos, 'frecuencias', None)
+    if cache is None:
+        return MatrizFrecuencias(articulos, palabras_clave, indice=indice)
+    with _lock:
+        matriz = cache.get(palabras_clave)
+        if matriz is None:
+            matriz = cache[palabras_clave] = MatrizFrecuencias(
+                articulos, palabras_clave, getattr(articulos, 'version', None), indice
+            )
+        cache.move_to_end(palabras_clave)
+        while len(cache) > CAPACIDAD_CACHE_MATRICES:
+            cache.popitem(last=False)
+        return matriz
@@ -0,0 +1,153 @@
+import hashlib
+import os
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
+
+try:
+    from . import conteo_paralelo
+except ImportError:  # Ejecución directa como script
+    import conteo_paralelo
+
+# Rango de n-gramas del vocabulario: palabras sueltas y frases de hasta tres
+# palabras, para que "machine learning" pueda ser una palabra clave generada.
+RANGO_NGRAMAS = (1, 3)
+# Mayor n-grama que se puede pedir: cada palabra más multiplica el vocabulario
+# que hay que contar antes de podarlo.
+NGRAMA_MAXIMO = 3
+# Tamaño máximo del vocabulario (los términos más frecuentes). Acota la matriz
+# y el archivo persistido aunque el corpus crezca.
+MAX_TERMINOS = 50_000
+CRITERIOS = ('frecuencia', 'tfidf')
+# Versión del formato del archivo persistido.
+VERSION_FORMATO = 1
+
+
+def huella_corpus(abstracts):
+    """Hash SHA-256 de los abstracts (en orden); identifica el corpus con el que se ajustó un modelo."""
+    resumen = hashlib.sha256()
+    for abstract in abstracts:
+        resumen.update(abstract.encode('utf-8'))
+        resumen.update(b'\0')
+    return resumen.hexdigest()
+
+
+class ModeloPalabrasClave:
+    """
+    TfidfVectorizer ajustado sobre los abstracts, con n-gramas y vocabulario
+    podado a los `MAX_TERMINOS` términos más frecuentes.
+
+    Además del vocabulario y los pesos IDF se guardan la matriz TF-IDF y, por
+    término, su frecuencia en el corpus y la suma de sus pesos TF-IDF. Con eso
+    se eligen las `num_palabras` más relevantes para cualquier valor sin volver
+    a ajustar. `huella` es el hash de los abstracts con los que se ajustó.
+    """
+
+    def __init__(self, terminos, idf, matriz, frecuencias, huella, ngramas=RANGO_NGRAMAS):
+        self.terminos = np.asarray(terminos)
+        self.idf = idf
+        self.matriz = matriz
+        self.frecuencias = frecuencias
+        self.pesos = np.asarray(matriz.sum(axis=0)).ravel()
+        self.huella = huella
+        self.ngramas = tuple(ngramas)
+
+    @classmethod
+    def ajustar(cls, abstracts, ngramas=RANGO_NGRAMAS, max_terminos=MAX_TERMINOS, huella=None, max_workers=None):
+        """
+        Ajusta el vectorizador sobre una lista de abstracts. En corpus grandes el
+        conteo de términos (y de la frecuencia de documentos) se hace por
+        fragmentos, repartidos entre procesos, con memoria acotada por
+        `max_terminos` (ver `conteo_paralelo.matriz_conteos_terminos`).
+        """
+        # CountVectorizer + TfidfTransformer es lo mismo que TfidfVectorizer, y
+        # deja a mano los conteos con los que `max_features` eligió los términos.
+        abstracts = list(abstracts)
+        terminos, conteos = conteo_paralelo.matriz_conteos_terminos(
+            abstracts, {'stop_words': 'english', 'ngram_range': tuple(ngramas)}, max_terminos, max_workers
+        )
+        transformador = TfidfTransformer()
+        matriz = transformador.fit_transform(conteos).astype(np.float32)
+        frecuencias = np.asarray(conteos.sum(axis=0)).ravel().astype(np.int64)
+        return cls(terminos, transformador.idf_.astype(np.float32), matriz.tocsr(),
+                   frecuencias, huella if huella is not None else huella_corpus(abstracts), ngramas)
+
+    def vectorizador(self):
+        """TfidfVectorizer equivalente al ajustado, para transformar otros textos sin reajustar."""
+        vectorizer = TfidfVectorizer(stop_words='english', ngram_range=self.ngramas,
+                                     vocabulary=self.terminos.tolist(), dtype=np.float32)
+        vectorizer.fit([''])  # Valida el vocabulario fijo; los pesos IDF se reemplazan.
+        vectorizer.idf_ = self.idf
+        return vectorizer
+
+    def mas_relevantes(self, num_palabras=15, criterio='frecuencia'):
+        """
+        Los `num_palabras` términos con mayor frecuencia en el corpus (criterio
+        'frecuencia', el de `max_features`) o mayor suma de pesos TF-IDF
+        ('tfidf'), en orden alfabético. Se eligen con `(-puntajes).argsort()`
+        sobre los términos en orden alfabético, como `max_features` (y
+        `conteo_paralelo.matriz_conteos_terminos`), así que los empates se
+        resuelven igual que en TfidfVectorizer.
+        """
+        if criterio not in CRITERIOS:
+            raise ValueError(f"Criterio desconocido: {criterio}. Opciones: {', '.join(CRITERIOS)}")
+        puntajes = self.frecuencias if criterio == 'frecuencia' else self.pesos
+        elegidos = (-puntajes).argsort()[:num_palabras]
+        return sorted(self.terminos[elegidos].tolist())
+
+    def guardar(self, ruta):
+        """Guarda el modelo en un archivo .npz."""
+        with open(ruta, 'wb') as archivo:
+            np.savez_compressed(
+                archivo,
+                terminos=np.array(self.terminos, dtype=str),
+                idf=self.idf,
+                datos=self.matriz.data,
+                indices=self.matriz.indices,
+                indptr=self.matriz.indptr,
+                forma=np.array(self.matriz.shape, dtype=np.int64),
+                frecuencias=self.frecuencias,
+                huella=np.array([self.huella]),
+                ngramas=np.array(self.ngramas, dtype=np.int64),
+                formato=np.array([VERSION_FORMATO], dtype=np.int64),
+            )
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga un modelo guardado con `guardar`. Devuelve None si no existe, está dañado o es de otro formato."""
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with np.load(ruta) as datos:
+                if int(datos['formato'][0]) != VERSION_FORMATO:
+                    return None
+                matriz = csr_matrix((datos['datos'], datos['indices'], datos['indptr']),
+                                    shape=tuple(int(n) for n in datos['forma']))
+                return cls(datos['terminos'], datos['idf'], matriz, datos['frecuencias'],
+                           str(datos['huella'][0]), tuple(int(n) for n in datos['ngramas']))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[ERROR] No se pudo cargar el modelo de palabras clave de {ruta}: {e}")
+            return None
+
+
+def obtener_modelo(abstracts, ngramas=RANGO_NGRAMAS, ruta=None):
+    """
+    Carga el modelo persistido en `ruta` si se ajustó con los mismos abstracts
+    y n-gramas; si no, lo ajusta y (si hay ruta) lo guarda.
+    """
+    abstracts = list(abstracts)
+    huella = huella_corpus(abstracts)
+    if ruta is not None:
+        modelo = ModeloPalabrasClave.cargar(ruta)
+        if modelo is not None and modelo.huella == huella and modelo.ngramas == tuple(ngramas):
+            return modelo
+
+    modelo = ModeloPalabrasClave.ajustar(abstracts, ngramas, huella=huella)
+    if ruta is not None:
+        try:
+            modelo.guardar(ruta)
+            print(f"[INFO] Modelo de palabras clave guardado en: {ruta}")
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar el modelo de palabras clave: {e}")
+    return modelo
@@ -0,0 +1,276 @@
+"""
+Benchmarks de los caminos críticos del proyecto sobre corpus sintéticos.
+
+Para cada tamaño de corpus se genera (una sola vez) un conjunto de archivos
+.bib con `generador_bib.py` y se mide:
+
+- `unificar_y_deduplicar`
+- la carga del .bib (`cargar_articulos` a través del almacén y `cargar_base_de_datos`)
+- `calcular_frecuencia_palabras_dadas` y `generar_nuevas_palabras_clave` (el
+  ajuste del vectorizador con n-gramas y el reordenamiento sin reajustar), y
+  las mismas dos partes leyendo el .bib en flujo (`analizar_frecuencias_en_flujo`)
+- la construcción del índice invertido posicional y el conteo de las palabras
+  clave con él (`calcular_frecuencia_palabras_indexadas`)
+- el conteo de palabras clave y el ajuste del vectorizador de palabras clave
+  repartidos en fragmentos entre 1, 2, ... procesos (`--procesos`), para ver
+  cómo escalan con la cantidad de núcleos
+- el ajuste del modelo TF-IDF y las tres funciones de similitud por pares
+  (Levenshtein, coseno y Jaccard), sin pasar por la caché de resultados
+
+Los resultados se guardan en un archivo JSON para comparar entre versiones.
+
+Uso:
+    python ejecutar_benchmarks.py --tamanos 1000 10000 --duplicados 0.1
+    python ejecutar_benchmarks.py --tamanos 100000 1000000 --repeticiones 1 --solo unificar_y_deduplicar
+    python ejecutar_benchmarks.py --tamanos 200000 --procesos 1 2 4 8 --solo contar_palabras_clave_paralelo
+"""
+
+import argparse
+import contextlib
+import datetime
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import generador_bib
+
+unificador_deduplicador = importlib.import_module("app.1_procesamiento_datos.unificador_deduplicador")
+analizador_similitud = importlib.import_module("app.2_similitud_texto.analizador_similitud")
+almacen_articulos = importlib.import_module("app.2_similitud_texto.almacen_articulos")
+modelo_tfidf = importlib.import_module("app.2_similitud_texto.modelo_tfidf")
+analizador_frecuencias = importlib.import_module("app.3_frecuencia_palabras.analizador_frecuencias")
+
+# Directorio donde se guardan los corpus generados (se reutilizan entre corridas).
+CORPUS_DIR = os.path.join(BENCHMARKS_DIR, 'corpus')
+RESULTADOS_DIR = os.path.join(BENCHMARKS_DIR, 'resultados')
+
+TAMANOS = [1000, 10000]
+REPETICIONES = 3
+# Pares aleatorios que se comparan en cada benchmark de similitud.
+NUM_PARES = 100
+
+
+def preparar_corpus(num_entradas, tasa_duplicados, semilla):
+    """Genera el corpus si no existe y devuelve (directorio de descargas, directorio de procesados)."""
+    directorio = os.path.join(CORPUS_DIR, f"{num_entradas}_{tasa_duplicados}_{semilla}")
+    descargas = os.path.join(directorio, 'descargas')
+    procesados = os.path.join(directorio, 'procesados')
+    if not os.path.exists(os.path.join(descargas, 'sciencedirect.bib')):
+        print(f"[INFO] Generando corpus sintético de {num_entradas} entradas...")
+        generador_bib.generar_corpus(descargas, num_entradas, tasa_duplicados, semilla)
+    os.makedirs(procesados, exist_ok=True)
+    return descargas, procesados
+
+
+def medir(funcion, repeticiones):
+    """Ejecuta la función `repeticiones` veces y devuelve los tiempos y el último resultado."""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        # La salida de las funciones medidas no se muestra.
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    return tiempos, resultado
+
+
+def registro(nombre, num_entradas, tiempos, operaciones=1):
+    """Resultado de un benchmark en el formato del archivo JSON."""
+    registro = {
+        "benchmark": nombre,
+        "entradas": num_entradas,
+        "repeticiones": len(tiempos),
+        "operaciones": operaciones,
+        "segundos_min": min(tiempos),
+        "segundos_media": sum(tiempos) / len(tiempos),
+        "segundos_max": max(tiempos),
+        "operaciones_por_segundo": operaciones / min(tiempos) if min(tiempos) > 0 else None,
+    }
+    print(f"  {nombre:<40} {registro['segundos_min']:>10.4f} s  ({operaciones} op.)")
+    return registro
+
+
+def benchmarks_procesos(abstracts, num_entradas, repeticiones, procesos, activo):
+    """Conteo de palabras clave y ajuste del vectorizador con cada cantidad de procesos."""
+    conteo_paralelo = analizador_frecuencias.conteo_paralelo
+    modelo_palabras_clave = analizador_frecuencias.modelo_palabras_clave
+    funciones = {
+        'contar_palabras_clave_paralelo': lambda num_procesos: conteo_paralelo.contar_palabras_clave(
+            abstracts, generador_bib.PALABRAS_CLAVE, num_procesos
+        ),
+        'ajustar_palabras_clave_paralelo': lambda num_procesos: modelo_palabras_clave.ModeloPalabrasClave.ajustar(
+            abstracts, max_workers=num_procesos
+        ),
+    }
+    resultados = []
+    for nombre, funcion in funciones.items():
+        if not activo(nombre):
+            continue
+        for num_procesos in procesos:
+            tiempos, _ = medir(lambda: funcion(num_procesos), repeticiones)
+            resultado = registro(f"{nombre}[{num_procesos}]", num_entradas, tiempos, len(abstracts))
+            resultado["benchmark"] = nombre
+            resultado["procesos"] = num_procesos
+            resultados.append(resultado)
+    return resultados
+
+
+def benchmarks_corpus(num_entradas, tasa_duplicados, semilla, repeticiones, solo, procesos):
+    """Ejecuta todos los benchmarks sobre el corpus del tamaño indicado."""
+    descargas, procesados = preparar_corpus(num_entradas, tasa_duplicados, semilla)
+    archivo_unicos = os.path.join(procesados, 'articulos_unicos.bib')
+    archivo_duplicados = os.path.join(procesados, 'articulos_duplicados.bib')
+    resultados = []
+
+    def activo(nombre):
+        return not solo or nombre in solo
+
+    print(f"\n[INFO] Corpus de {num_entradas} entradas ({tasa_duplicados:.0%} duplicados)")
+
+    # La deduplicación produce el archivo que usan los demás benchmarks, así
+    # que se ejecuta siempre; solo se registra si fue pedida.
+    tiempos, _ = medir(
+        lambda: unificador_deduplicador.unificar_y_deduplicar(descargas, archivo_unicos, archivo_duplicados),
+        repeticiones if activo('unificar_y_deduplicar') else 1,
+    )
+    if activo('unificar_y_deduplicar'):
+        resultados.append(registro('unificar_y_deduplicar', num_entradas, tiempos, num_entradas))
+
+    tiempos, corpus = medir(lambda: almacen_articulos.AlmacenArticulos(archivo_unicos).obtener(), repeticiones)
+    if activo('cargar_articulos'):
+        resultados.append(registro('cargar_articulos', num_entradas, tiempos, len(corpus)))
+
+    if activo('cargar_base_de_datos'):
+        tiempos, _ = medir(lambda: analizador_frecuencias.cargar_base_de_datos(archivo_unicos), repeticiones)
+        resultados.append(registro('cargar_base_de_datos', num_entradas, tiempos, len(corpus)))
+
+    abstracts = [articulo['abstract'] for articulo in corpus if articulo.get('abstract')]
+    if activo('calcular_frecuencia_palabras_dadas'):
+        tiempos, _ = medir(
+            lambda: analizador_frecuencias.calcular_frecuencia_palabras_dadas(abstracts, generador_bib.PALABRAS_CLAVE),
+            repeticiones,
+        )
+        resultados.append(registro('calcular_frecuencia_palabras_dadas', num_entradas, tiempos, len(abstracts)))
+
+    if activo('generar_nuevas_palabras_clave') or activo('reordenar_palabras_clave'):
+        # Ajuste completo del vectorizador (sin la caché ni el archivo persistido).
+        modelo_palabras_clave = analizador_frecuencias.modelo_palabras_clave
+        tiempos, modelo = medir(lambda: modelo_palabras_clave.ModeloPalabrasClave.ajustar(abstracts), repeticiones)
+        if activo('generar_nuevas_palabras_clave'):
+            resultados.append(registro('generar_nuevas_palabras_clave', num_entradas, tiempos, len(abstracts)))
+        # Otra cantidad de palabras sobre el modelo ya ajustado.
+        if activo('reordenar_palabras_clave'):
+            tiempos, _ = medir(lambda: modelo.mas_relevantes(50), repeticiones)
+            resultados.append(registro('reordenar_palabras_clave', num_entradas, tiempos, 1))
+
+    if activo('analizar_frecuencias_en_flujo'):
+        tiempos, _ = medir(
+            lambda: analizador_frecuencias.analizar_frecuencias_en_flujo(archivo_unicos, generador_bib.PALABRAS_CLAVE, 15),
+            repeticiones,
+        )
+        resultados.append(registro('analizar_frecuencias_en_flujo', num_entradas, tiempos, len(abstracts)))
+
+    if activo('indice_invertido') or activo('calcular_frecuencia_palabras_indexadas'):
+        indice_invertido = analizador_frecuencias.indice_invertido
+        tiempos, indice = medir(lambda: indice_invertido.IndiceInvertido.construir(corpus), repeticiones)
+        if activo('indice_invertido'):
+            resultados.append(registro('indice_invertido', num_entradas, tiempos, len(corpus)))
+        if activo('calcular_frecuencia_palabras_indexadas'):
+            tiempos, _ = medir(
+                lambda: analizador_frecuencias.calcular_frecuencia_palabras_indexadas(
+                    corpus, generador_bib.PALABRAS_CLAVE, indice
+                ),
+                repeticiones,
+            )
+            resultados.append(registro('calcular_frecuencia_palabras_indexadas', num_entradas, tiempos,
+                                       len(generador_bib.PALABRAS_CLAVE)))
+
+    resultados.extend(benchmarks_procesos(abstracts, num_entradas, repeticiones, procesos, activo))
+
+    if activo('modelo_tfidf'):
+        tiempos, _ = medir(lambda: modelo_tfidf.ModeloTfidf(corpus), repeticiones)
+        resultados.append(registro('modelo_tfidf', num_entradas, tiempos, len(abstracts)))
+
+    # Pares aleatorios (siempre los mismos para una semilla) de artículos con abstract.
+    ids = [articulo['ID'] for articulo in corpus if articulo.get('abstract')]
+    aleatorio = random.Random(semilla)
+    pares = [tuple(aleatorio.sample(ids, 2)) for _ in range(NUM_PARES)] if len(ids) >= 2 else []
+    # `__wrapped__` es la función sin la caché de resultados.
+    funciones_similitud = {
+        'similitud_levenshtein': analizador_similitud.analizar_similitud_levenshtein.__wrapped__,
+        'similitud_coseno': analizador_similitud.analizar_similitud_coseno.__wrapped__,
+        'similitud_jaccard': analizador_similitud.analizar_similitud_jaccard.__wrapped__,
+    }
+    for nombre, funcion in funciones_similitud.items():
+        if not activo(nombre) or not pares:
+            continue
+        # Primera llamada fuera de la medición: ajusta los modelos del corpus.
+        funcion(corpus, *pares[0])
+        tiempos, _ = medir(lambda: [funcion(corpus, id1, id2) for id1, id2 in pares], repeticiones)
+        resultados.append(registro(nombre, num_entradas, tiempos, len(pares)))
+
+    for resultado in resultados:
+        resultado["duplicados"] = tasa_duplicados
+    return resultados
+
+
+def commit_actual():
+    """Commit de git del código medido, o None si no se puede obtener."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta los benchmarks sobre corpus BibTeX sintéticos.")
+    parser.add_argument("--tamanos", type=int, nargs='+', default=TAMANOS,
+                        help="Tamaños de corpus (p. ej. 1000 10000 100000 1000000).")
+    parser.add_argument("--duplicados", type=float, default=0.1, help="Fracción de entradas duplicadas.")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES, help="Repeticiones de cada medición.")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del corpus y de los pares.")
+    parser.add_argument("--solo", nargs='*', default=None, help="Nombres de los benchmarks a ejecutar.")
+    parser.add_argument("--procesos", type=int, nargs='+', default=None,
+                        help="Cantidades de procesos de los benchmarks en paralelo (por defecto 1 y todos los núcleos).")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados.")
+    args = parser.parse_args()
+
+    procesos = args.procesos or sorted({1, os.cpu_count() or 1})
+    resultados = []
+    for num_entradas in args.tamanos:
+        resultados.extend(benchmarks_corpus(num_entradas, args.duplicados, args.semilla, args.repeticiones, args.solo,
+                                            procesos))
+
+    fecha = datetime.datetime.now()
+    salida = args.salida or os.path.join(RESULTADOS_DIR, f"benchmark_{fecha:%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w', encoding='utf-8') as archivo:
+        json.dump({
+            "fecha": fecha.isoformat(timespec='seconds'),
+            "commit": commit_actual(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "procesadores": os.cpu_count(),
+            "numpy": np.__version__,
+            "resultados": resultados,
+        }, archivo, indent=2, ensure_ascii=False)
+    print(f"\n[INFO] Resultados guardados en: {salida}")
+
+
+if __name__ == '__main__':
+    main()
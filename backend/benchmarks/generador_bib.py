@@ -0,0 +1,254 @@
+"""
+Generador de corpus BibTeX sintéticos para los benchmarks.
+
+Escribe un archivo .bib por fuente (IEEE, SAGE y ScienceDirect) con el mismo
+formato que las descargas reales, de modo que el parser, la deduplicación y los
+análisis recorran el mismo camino que con datos reales. Una fracción de las
+entradas (`tasa_duplicados`) repite un artículo ya generado en otra fuente,
+con el título en otro formato (mayúsculas, llaves, signos o una errata) y,
+en SAGE, el abstract truncado como lo entrega esa base de datos.
+
+Uso:
+    python generador_bib.py --entradas 10000 --duplicados 0.1 --salida corpus_10k
+"""
+
+import argparse
+import os
+import random
+
+import numpy as np
+
+FUENTES = ('ieee', 'sage', 'sciencedirect')
+
+# Palabras clave del requerimiento 3: se insertan en los abstracts para que el
+# análisis de frecuencias encuentre coincidencias.
+PALABRAS_CLAVE = [
+    "generative models", "prompting", "machine learning", "multimodality",
+    "fine-tuning", "training data", "algorithmic bias", "explainability",
+    "transparency", "ethics", "privacy", "personalization",
+    "human-AI interaction", "AI literacy", "co-creation",
+]
+PROBABILIDAD_PALABRA_CLAVE = 0.08
+
+PALABRAS_BASE = (
+    "artificial intelligence learning education students teachers generative model models "
+    "data analysis study research results approach framework system systems design evaluation "
+    "performance language large tools use using based method methods knowledge development "
+    "higher university digital technology technologies assessment writing creativity human "
+    "social impact challenges opportunities ethical review literature survey participants "
+    "qualitative quantitative findings implications future practice policy network neural "
+    "deep chatbot chatgpt content generation image text code programming health clinical "
+    "medical engineering science computing adoption acceptance trust perception experience"
+).split()
+SILABAS = "ba be bi bo bu ca ce ci co cu da de di do du fa fe fi la le li lo lu ma me mi mo mu na ne ni no nu ra re ri ro ru sa se si so su ta te ti to tu".split()
+TAMANO_VOCABULARIO = 20000
+
+NOMBRES = "Ana Luis Maria Carlos Wei Li Priya Ahmed Sara Juan Elena David Kenji Fatima Omar Laura".split()
+APELLIDOS = "Garcia Smith Wang Kumar Silva Rossi Muller Kim Lopez Chen Haddad Novak Tanaka Reyes Brown".split()
+REVISTAS = ["Computers & Education", "SAGE Open", "Value in Health", "AI & Society", "Journal of Learning Analytics"]
+MESES = "January February March April May June July August September October November December".split()
+
+
+def _vocabulario(generador):
+    """Palabras reales del dominio seguidas de pseudo-palabras hasta completar el vocabulario."""
+    palabras = list(PALABRAS_BASE)
+    vistas = set(palabras)
+    while len(palabras) < TAMANO_VOCABULARIO:
+        palabra = ''.join(generador.choice(SILABAS) for _ in range(generador.randint(2, 4)))
+        if palabra not in vistas:
+            vistas.add(palabra)
+            palabras.append(palabra)
+    return palabras
+
+
+class GeneradorCorpus:
+    """Genera artículos sintéticos con frecuencias de palabras tipo Zipf."""
+
+    def __init__(self, semilla=1):
+        self.aleatorio = random.Random(semilla)
+        self.numpy = np.random.RandomState(semilla)
+        self.vocabulario = np.array(_vocabulario(self.aleatorio))
+        pesos = 1.0 / np.arange(1, len(self.vocabulario) + 1)
+        # Distribución acumulada para muestrear con searchsorted (más rápido
+        # que np.random.choice con probabilidades en cada llamada).
+        self.acumulada = np.cumsum(pesos / pesos.sum())
+        self.acumulada[-1] = 1.0
+
+    def _palabras(self, cantidad):
+        indices = np.searchsorted(self.acumulada, self.numpy.random_sample(cantidad), side='right')
+        return self.vocabulario[indices].tolist()
+
+    def titulo(self):
+        palabras = self._palabras(self.aleatorio.randint(6, 12))
+        return ' '.join(palabra.capitalize() for palabra in palabras)
+
+    def abstract(self):
+        palabras = self._palabras(self.aleatorio.randint(120, 260))
+        for posicion in range(0, len(palabras), 12):
+            if self.aleatorio.random() < PROBABILIDAD_PALABRA_CLAVE:
+                palabras[posicion] = self.aleatorio.choice(PALABRAS_CLAVE)
+        oraciones = [' '.join(palabras[i:i + 20]) for i in range(0, len(palabras), 20)]
+        return ' '.join(oracion[0].upper() + oracion[1:] + '.' for oracion in oraciones)
+
+    def autores(self):
+        return [
+            (self.aleatorio.choice(NOMBRES), self.aleatorio.choice(APELLIDOS))
+            for _ in range(self.aleatorio.randint(1, 6))
+        ]
+
+    def articulo(self, numero):
+        return {
+            'numero': numero,
+            'titulo': self.titulo(),
+            'abstract': self.abstract(),
+            'autores': self.autores(),
+            'anio': self.aleatorio.randint(2015, 2025),
+            'palabras_clave': self.aleatorio.sample(PALABRAS_CLAVE, 3),
+        }
+
+    def variante_titulo(self, titulo):
+        """
+        Mismo título con otra capitalización, espacios alrededor, llaves de
+        LaTeX, guiones, dos puntos, un punto final o una letra de menos, como
+        en las descargas reales.
+        """
+        opcion = self.aleatorio.randint(0, 6)
+        if opcion == 0:
+            return titulo.lower().capitalize()
+        if opcion == 1:
+            return titulo.upper()
+        if opcion == 2:
+            return f" {titulo} "
+        palabras = titulo.split()
+        if opcion == 3:
+            return ' '.join(f"{{{palabra}}}" if palabra[0].isupper() else palabra for palabra in palabras)
+        if opcion == 4:
+            posicion = self.aleatorio.randrange(1, len(palabras))
+            return ' '.join(palabras[:posicion]) + ': ' + '-'.join(palabras[posicion:posicion + 2]) + \
+                ''.join(' ' + palabra for palabra in palabras[posicion + 2:])
+        if opcion == 5:
+            return titulo + '.'
+        # Errata: falta una letra de la palabra más larga.
+        posicion = max(range(len(palabras)), key=lambda i: len(palabras[i]))
+        palabra = palabras[posicion]
+        letra = self.aleatorio.randrange(1, len(palabra)) if len(palabra) > 1 else 0
+        palabras[posicion] = palabra[:letra] + palabra[letra + 1:]
+        return ' '.join(palabras)
+
+
+def formato_ieee(articulo, titulo, abstract):
+    autores = ' and '.join(f"{apellido}, {nombre}" for nombre, apellido in articulo['autores'])
+    identificador = 10000000 + articulo['numero']
+    return (
+        f"@INPROCEEDINGS{{{identificador},\n"
+        f"  author={{{autores}}},\n"
+        f"  booktitle={{{articulo['anio']} International Conference on Artificial Intelligence in Education}}, \n"
+        f"  title={{{titulo}}}, \n"
+        f"  year={{{articulo['anio']}}},\n"
+        f"  volume={{}},\n"
+        f"  number={{}},\n"
+        f"  pages={{1-5}},\n"
+        f"  abstract={{{abstract}}},\n"
+        f"  keywords={{{';'.join(articulo['palabras_clave'])}}},\n"
+        f"  doi={{10.1109/ICAIE.{articulo['anio']}.{identificador}}},\n"
+        f"  ISSN={{}},\n"
+        f"  month={{{MESES[articulo['numero'] % 12]}}},}}"
+    )
+
+
+def formato_sage(articulo, titulo, abstract):
+    autores = ' and '.join(f"{nombre} {apellido}" for nombre, apellido in articulo['autores'])
+    doi = f"10.1177/{21580000000 + articulo['numero']}"
+    # SAGE entrega los abstracts truncados. La línea suelta `doi:...` también es
+    # de las exportaciones reales; con ella el parser actual descarta la entrada,
+    # igual que con los archivos de datos/descargas/sage.
+    if len(abstract) > 300:
+        abstract = abstract[:300].rsplit(' ', 1)[0] + ' ...'
+    return (
+        f"@article{{{doi},\n"
+        f"doi:{doi},\n"
+        f"author = {{{autores}}},\n"
+        f"title = {{{titulo}}},\n"
+        f"journal = {{SAGE Open}},\n"
+        f"volume = {{{articulo['numero'] % 20 + 1}}},\n"
+        f"number = {{{articulo['numero'] % 4 + 1}}},\n"
+        f"year = {{{articulo['anio']}}},\n"
+        f"doi = {{{doi}}},\n"
+        f"URL = {{https://doi.org/{doi}}},\n"
+        f"eprint = {{https://doi.org/{doi}}},\n"
+        f"abstract = {{{abstract}}}\n"
+        f"}}\n"
+    )
+
+
+def formato_sciencedirect(articulo, titulo, abstract):
+    autores = ' and '.join(f"{nombre} {apellido}" for nombre, apellido in articulo['autores'])
+    clave = f"{articulo['autores'][0][1].upper()}{articulo['anio']}{articulo['numero']}"
+    return (
+        f"@article{{{clave},\n"
+        f"title = {{{titulo}}},\n"
+        f"journal = {{{REVISTAS[articulo['numero'] % len(REVISTAS)]}}},\n"
+        f"year = {{{articulo['anio']}}},\n"
+        f"issn = {{1098-3015}},\n"
+        f"doi = {{https://doi.org/10.1016/j.synt.{articulo['anio']}.{articulo['numero']}}},\n"
+        f"url = {{https://www.sciencedirect.com/science/article/pii/S{articulo['numero']:016d}}},\n"
+        f"author = {{{autores}}},\n"
+        f"keywords = {{{', '.join(articulo['palabras_clave'])}}},\n"
+        f"abstract = {{{abstract}}}\n"
+        f"}}\n"
+    )
+
+
+FORMATOS = {
+    'ieee': formato_ieee,
+    'sage': formato_sage,
+    'sciencedirect': formato_sciencedirect,
+}
+
+
+def generar_corpus(directorio, num_entradas, tasa_duplicados=0.1, semilla=1):
+    """
+    Escribe `num_entradas` entradas repartidas en ieee.bib, sage.bib y
+    sciencedirect.bib dentro de `directorio`. Aproximadamente
+    `num_entradas * tasa_duplicados` de ellas son duplicados de artículos
+    anteriores. Devuelve la cantidad de entradas escritas por fuente y la de
+    duplicados.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    generador = GeneradorCorpus(semilla)
+    # Para los duplicados se guarda solo lo necesario de cada original.
+    originales = []
+    resumen = {fuente: 0 for fuente in FUENTES}
+    resumen['duplicados'] = 0
+
+    archivos = {fuente: open(os.path.join(directorio, f"{fuente}.bib"), 'w', encoding='utf-8') for fuente in FUENTES}
+    try:
+        for numero in range(num_entradas):
+            fuente = FUENTES[numero % len(FUENTES)]
+            if originales and generador.aleatorio.random() < tasa_duplicados:
+                original = generador.aleatorio.choice(originales)
+                articulo = dict(original, numero=numero)
+                titulo = generador.variante_titulo(original['titulo'])
+                resumen['duplicados'] += 1
+            else:
+                articulo = generador.articulo(numero)
+                titulo = articulo['titulo']
+                originales.append(articulo)
+            archivos[fuente].write(FORMATOS[fuente](articulo, titulo, articulo['abstract']))
+            resumen[fuente] += 1
+    finally:
+        for archivo in archivos.values():
+            archivo.close()
+    return resumen
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera un corpus BibTeX sintético (IEEE, SAGE y ScienceDirect).")
+    parser.add_argument("--entradas", type=int, default=1000, help="Cantidad total de entradas.")
+    parser.add_argument("--duplicados", type=float, default=0.1, help="Fracción de entradas duplicadas (0 a 1).")
+    parser.add_argument("--semilla", type=int, default=1, help="Semilla del generador aleatorio.")
+    parser.add_argument("--salida", required=True, help="Directorio donde se escriben los archivos .bib.")
+    args = parser.parse_args()
+
+    resumen = generar_corpus(args.salida, args.entradas, args.duplicados, args.semilla)
+    print(f"[INFO] Corpus generado en {args.salida}: {resumen}")
@@ -1,13 +1,14 @@
 import asyncio
+import json
 import subprocess
 import os
 import sys
 import traceback
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from fastapi import FastAPI, Form, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
@@ -15,6 +16,8 @@ import importlib
 
 # Importar la lógica de los requerimientos de forma dinámica
 analizador_similitud = importlib.import_module("app.2_similitud_texto.analizador_similitud")
+analizador_frecuencias = importlib.import_module("app.3_frecuencia_palabras.analizador_frecuencias")
+indice_ann = importlib.import_module("app.2_similitud_texto.indice_ann")
 
 app = FastAPI()
 
@@ -38,6 +41,57 @@ class AnalisisSimilitudRequest(BaseModel):
     article_ids: List[str]
     algoritmo: str
 
+class AnalisisSimilitudLoteRequest(BaseModel):
+    algoritmo: str
+    article_id: Optional[str] = None
+    target_ids: Optional[List[str]] = None
+    pares: Optional[List[List[str]]] = None
+    stream: bool = False
+
+class SimilitudTopKRequest(BaseModel):
+    algoritmo: str
+    k: int = 5
+    article_id: Optional[str] = None
+    aproximado: bool = False
+    exacto: bool = False
+    nprobe: int = indice_ann.NPROBE
+    stream: bool = False
+
+class FrecuenciasRequest(BaseModel):
+    palabras_clave: Optional[List[str]] = None
+
+class PalabrasClaveRequest(BaseModel):
+    num_palabras: int = 15
+    palabras_clave: Optional[List[str]] = None
+    ngramas: List[int] = [1, 3]
+    criterio: str = "frecuencia"
+
+# Código HTTP de cada código de error de analizador_similitud.
+STATUS_POR_CODIGO_ERROR = {
+    analizador_similitud.ERROR_ARTICULO_NO_ENCONTRADO: 404,
+    analizador_similitud.ERROR_SIN_ABSTRACT: 404,
+    analizador_similitud.ERROR_PARAMETRO_INVALIDO: 400,
+}
+
+def status_error(resultado, por_defecto=400):
+    """Código HTTP de un resultado {"error", "codigo"} según su código de error."""
+    return STATUS_POR_CODIGO_ERROR.get(resultado.get("codigo"), por_defecto)
+
+def respuesta_ndjson(resultado):
+    """
+    Envía un resultado con "resultados" como NDJSON: la primera línea lleva los
+    datos generales (algoritmo, k...) y cada línea siguiente un resultado, a
+    medida que se calcula. El generador es síncrono, así que Starlette lo
+    recorre en su pool de hilos sin bloquear el servidor.
+    """
+    def generar():
+        encabezado = {clave: valor for clave, valor in resultado.items() if clave != "resultados"}
+        yield json.dumps(encabezado, ensure_ascii=False) + "\n"
+        for fila in resultado["resultados"]:
+            yield json.dumps(fila, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(generar(), media_type="application/x-ndjson")
+
 # --- Rutas y Endpoints ---
 
 @app.get("/", response_class=HTMLResponse)
@@ -99,10 +153,23 @@ async def get_articulos():
     ]
     return JSONResponse(content=articulos_simplificados)
 
+@app.get("/algoritmos")
+async def get_algoritmos():
+    """
+    Lista los algoritmos de similitud registrados y sus capacidades
+    (preprocesamiento, puntaje vectorizado e índice precalculado).
+    """
+    return JSONResponse(content=analizador_similitud.listar_algoritmos())
+
 @app.post("/analizar-similitud")
 async def analizar_similitud(request_data: AnalisisSimilitudRequest):
     """
     Recibe dos IDs de artículos y el algoritmo a usar, y calcula la similitud.
+
+    Jaccard compara los conjuntos de palabras de la tokenización compartida con
+    TF-IDF (palabras de 2 o más caracteres alfanuméricos, sin signos de
+    puntuación) y no las palabras separadas por espacios, así que sus puntajes
+    no coinciden con los de versiones anteriores a la tokenización compartida.
     """
     if len(request_data.article_ids) != 2:
         return JSONResponse(content={"error": "Por favor, selecciona exactamente dos artículos para comparar."}, status_code=400)
@@ -115,17 +182,212 @@ async def analizar_similitud(request_data: AnalisisSimilitudRequest):
     if not articulos:
         return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
 
-    if algoritmo == "levenshtein":
-        resultado = analizador_similitud.analizar_similitud_levenshtein(articulos, id1, id2)
-    elif algoritmo == "coseno":
-        resultado = analizador_similitud.analizar_similitud_coseno(articulos, id1, id2)
-    elif algoritmo == "jaccard":
-        resultado = analizador_similitud.analizar_similitud_jaccard(articulos, id1, id2)
-    else:
+    algoritmo_registrado = analizador_similitud.obtener_algoritmo(algoritmo)
+    if algoritmo_registrado is None:
         return JSONResponse(content={"error": f"Algoritmo '{algoritmo}' no reconocido."}, status_code=400)
 
+    resultado = algoritmo_registrado.comparar(articulos, id1, id2)
+
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=status_error(resultado, por_defecto=404))
+
+    return JSONResponse(content=resultado)
+
+@app.post("/analizar-similitud-lote")
+async def analizar_similitud_lote(request_data: AnalisisSimilitudLoteRequest):
+    """
+    Calcula en una sola llamada la similitud de un artículo contra una lista de
+    artículos (`article_id` + `target_ids`) o de una lista explícita de pares.
+    Con `stream` los resultados se envían como NDJSON a medida que se calculan.
+    """
+    if request_data.pares is not None:
+        if request_data.article_id is not None or request_data.target_ids is not None:
+            return JSONResponse(content={"error": "Envía 'pares' o 'article_id' con 'target_ids', no ambos."}, status_code=400)
+        if any(len(par) != 2 for par in request_data.pares):
+            return JSONResponse(content={"error": "Cada par debe contener exactamente dos IDs."}, status_code=400)
+        pares = [(par[0], par[1]) for par in request_data.pares]
+    elif request_data.article_id is not None and request_data.target_ids is not None:
+        pares = [(request_data.article_id, id_destino) for id_destino in request_data.target_ids]
+    else:
+        return JSONResponse(content={"error": "Envía 'pares' o 'article_id' con 'target_ids'."}, status_code=400)
+
+    articulos = analizador_similitud.cargar_articulos()
+    if not articulos:
+        return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
+
+    if request_data.stream:
+        resultado = await asyncio.to_thread(
+            analizador_similitud.iterar_similitud_lote,
+            articulos,
+            request_data.algoritmo,
+            pares,
+        )
+        if "error" in resultado:
+            return JSONResponse(content=resultado, status_code=400)
+        return respuesta_ndjson(resultado)
+
+    resultado = await asyncio.to_thread(
+        analizador_similitud.analizar_similitud_lote,
+        articulos,
+        request_data.algoritmo,
+        pares,
+    )
+
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=400)
+
+    return JSONResponse(content=resultado)
+
+@app.get("/similares/{article_id}")
+async def get_similares(article_id: str, k: int = 10, nprobe: int = indice_ann.NPROBE, exacto: bool = True, algoritmo: str = "coseno"):
+    """
+    Devuelve los k artículos más similares con un índice precalculado: por
+    coseno con el índice ANN (`nprobe` controla el equilibrio entre recall y
+    latencia) o por Jaccard con el índice MinHash + LSH. Con `exacto` los
+    candidatos se puntúan con la similitud real.
+    """
+    if k < 1 or nprobe < 1:
+        return JSONResponse(content={"error": "Los parámetros k y nprobe deben ser al menos 1."}, status_code=400)
+    if algoritmo not in ("coseno", "jaccard"):
+        return JSONResponse(content={"error": f"Algoritmo '{algoritmo}' no disponible. Opciones: coseno, jaccard."}, status_code=400)
+
+    articulos = analizador_similitud.cargar_articulos()
+    if not articulos:
+        return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
+
+    if algoritmo == "jaccard":
+        resultado = await asyncio.to_thread(
+            analizador_similitud.buscar_similares_jaccard,
+            articulos,
+            article_id,
+            k,
+            exacto=exacto,
+        )
+    else:
+        resultado = await asyncio.to_thread(
+            analizador_similitud.buscar_similares_coseno,
+            articulos,
+            article_id,
+            k,
+            nprobe,
+            exacto,
+        )
+
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=status_error(resultado, por_defecto=404))
+
+    return JSONResponse(content=resultado)
+
+@app.post("/similitud-top-k")
+async def similitud_top_k(request_data: SimilitudTopKRequest):
+    """
+    Calcula la similitud de todos los artículos contra todos con el algoritmo
+    indicado y devuelve los k más similares de cada uno, o solo los del
+    artículo indicado en `article_id`. Con `aproximado`, Jaccard usa el índice
+    MinHash + LSH (`exacto` vuelve a puntuar los candidatos) y coseno el índice
+    IVF (`nprobe` listas por consulta). Con `stream` los vecinos de cada
+    artículo se envían como NDJSON apenas se calculan.
+    """
+    articulos = analizador_similitud.cargar_articulos()
+    if not articulos:
+        return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
+
+    # El cálculo es intensivo en CPU; se ejecuta en un hilo para no bloquear el servidor.
+    funcion = (
+        analizador_similitud.iterar_vecinos_similares if request_data.stream
+        else analizador_similitud.calcular_vecinos_similares
+    )
+    resultado = await asyncio.to_thread(
+        funcion,
+        articulos,
+        request_data.algoritmo,
+        request_data.k,
+        request_data.article_id,
+        request_data.aproximado,
+        request_data.exacto,
+        request_data.nprobe,
+    )
+
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=status_error(resultado))
+
+    if request_data.stream:
+        return respuesta_ndjson(resultado)
+
+    return JSONResponse(content=resultado)
+
+
+# --- Endpoints para Requerimiento 3 ---
+@app.post("/frecuencias")
+async def frecuencias(request_data: FrecuenciasRequest):
+    """
+    Frecuencia de cada palabra clave en los abstracts (total, por artículo y por
+    base de datos). Sin `palabras_clave` se usan las del requerimiento. Se
+    responde con el índice invertido del corpus y el resultado queda en caché
+    por conjunto de palabras clave y versión del corpus.
+    """
+    articulos = analizador_similitud.cargar_articulos()
+    if not articulos:
+        return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
+
+    resultado = await asyncio.to_thread(
+        analizador_frecuencias.analizar_frecuencias,
+        articulos,
+        request_data.palabras_clave,
+    )
+
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=400)
+
+    return JSONResponse(content=resultado)
+
+@app.post("/palabras-clave")
+async def palabras_clave(request_data: PalabrasClaveRequest):
+    """
+    Genera las `num_palabras` palabras clave más relevantes del corpus con TF-IDF
+    (n-gramas en el rango `ngramas`, de a lo sumo tres palabras) y calcula su
+    precisión respecto de `palabras_clave` (por defecto, las del requerimiento).
+    El vectorizador solo se ajusta cuando cambia el corpus.
+    """
+    articulos = analizador_similitud.cargar_articulos()
+    if not articulos:
+        return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
+
+    resultado = await asyncio.to_thread(
+        analizador_frecuencias.analizar_palabras_clave,
+        articulos,
+        request_data.num_palabras,
+        request_data.palabras_clave,
+        request_data.ngramas,
+        request_data.criterio,
+    )
+
+    if "error" in resultado:
+        return JSONResponse(content=resultado, status_code=400)
+
+    return JSONResponse(content=resultado)
+
+
+@app.get("/tendencias")
+async def tendencias(palabra_clave: str, fuente: Optional[str] = None):
+    """
+    Apariciones de una palabra clave por año (en todas las bases de datos o
+    solo en `fuente`: ieee, sage, sciencedirect) y por venue. Se responde con
+    el cubo de tendencias precalculado del corpus.
+    """
+    articulos = analizador_similitud.cargar_articulos()
+    if not articulos:
+        return JSONResponse(content={"error": "No se pudo cargar la lista de artículos."}, status_code=500)
+
+    resultado = await asyncio.to_thread(
+        analizador_frecuencias.consultar_tendencias,
+        articulos,
+        palabra_clave,
+        fuente,
+    )
+
     if "error" in resultado:
-        return JSONResponse(content=resultado, status_code=404)
+        return JSONResponse(content=resultado, status_code=400)
 
     return JSONResponse(content=resultado)
 
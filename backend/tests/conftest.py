@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Los paquetes de `app` empiezan con dígitos: los tests los importan con
+# importlib desde el directorio 'backend', igual que main.py.
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
@@ -0,0 +1,56 @@
+import importlib
+import sqlite3
+
+cache_similitud = importlib.import_module("app.2_similitud_texto.cache_similitud")
+
+
+def _filas(ruta):
+    with sqlite3.connect(ruta) as conexion:
+        return conexion.execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+
+
+def test_la_base_de_datos_se_crea_con_el_primer_uso(tmp_path):
+    ruta = tmp_path / 'cache.sqlite'
+    cache = cache_similitud.CacheSimilitud(ruta_sqlite=str(ruta))
+    assert not ruta.exists()
+    assert cache.obtener('clave') is None
+    assert ruta.exists()
+
+
+def test_la_tabla_en_disco_no_supera_su_capacidad(tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    cache = cache_similitud.CacheSimilitud(capacidad=5, ruta_sqlite=ruta, capacidad_disco=100)
+    for i in range(1000):
+        cache.guardar(f'k{i}', {'similitud': i})
+    assert _filas(ruta) <= 100
+
+    # Se conservan las escrituras más recientes, también tras reabrir la caché.
+    reabierta = cache_similitud.CacheSimilitud(ruta_sqlite=ruta, capacidad_disco=100)
+    assert reabierta.obtener('k999') == {'similitud': 999}
+    assert reabierta.obtener('k0') is None
+
+
+def test_reemplazar_una_clave_no_desaloja_otras(tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    cache = cache_similitud.CacheSimilitud(capacidad=1, ruta_sqlite=ruta, capacidad_disco=10)
+    for i in range(10):
+        cache.guardar(f'k{i}', {'similitud': i})
+    for _ in range(50):
+        cache.guardar('k9', {'similitud': 9})
+    assert _filas(ruta) == 10
+    assert cache.obtener('k0') == {'similitud': 0}
+
+
+def test_guardar_varios_escribe_el_lote_en_una_sola_transaccion(tmp_path):
+    ruta = str(tmp_path / 'cache.sqlite')
+    cache = cache_similitud.CacheSimilitud(capacidad=5, ruta_sqlite=ruta, capacidad_disco=100)
+    cache.obtener('k0')
+    sentencias = []
+    cache._conexion.set_trace_callback(sentencias.append)
+    cache.guardar_varios((f'k{i}', {'similitud': i}) for i in range(50))
+    assert sum(sentencia.upper().startswith('COMMIT') for sentencia in sentencias) == 1
+    assert _filas(ruta) == 50
+
+    reabierta = cache_similitud.CacheSimilitud(ruta_sqlite=ruta, capacidad_disco=100)
+    assert reabierta.obtener('k0') == {'similitud': 0}
+    assert reabierta.obtener('k49') == {'similitud': 49}
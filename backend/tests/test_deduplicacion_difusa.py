@@ -0,0 +1,41 @@
+import importlib
+
+import pytest
+
+deduplicacion_difusa = importlib.import_module("app.1_procesamiento_datos.deduplicacion_difusa")
+
+
+def test_normalizar_titulo():
+    assert deduplicacion_difusa.normalizar_titulo(r'{\"O}zt{\'u}rk: {Fine-Tuning} LLMs.') == 'ozturk fine tuning llms'
+
+
+def test_variantes_de_formato_y_erratas_se_agrupan():
+    titulos = [
+        'Generative Models for Personalized Learning in Higher Education',
+        '{Generative} {Models} for personalized learning in higher education.',
+        'Generative models for personalised learning in higher education',
+        'Generative Models: for-Personalized Learning in Higher Education',
+        'A Completely Different Study of Algorithmic Bias in Hiring',
+        '',
+    ]
+    grupos, coincidencias = deduplicacion_difusa.agrupar_titulos(titulos)
+    assert grupos == [0, 0, 0, 0, 4, None]
+    # "personalised" solo se une por similitud; el resto, por clave exacta.
+    assert coincidencias == 1
+
+
+@pytest.mark.parametrize('titulo1, titulo2', [
+    ('Computational thinking in primary education: Part 1', 'Computational thinking in primary education: Part 2'),
+    ('Proceedings of the 2019 Conference on Learning Analytics', 'Proceedings of the 2020 Conference on Learning Analytics'),
+    ('Teaching programming with generative AI, Volume II', 'Teaching programming with generative AI, Volume III'),
+    ('Evaluation of large language models on 5G network traces', 'Evaluation of large language models on 6G network traces'),
+])
+def test_titulos_que_solo_difieren_en_un_numero_no_se_unen(titulo1, titulo2):
+    grupos, coincidencias = deduplicacion_difusa.agrupar_titulos([titulo1, titulo2])
+    assert grupos == [0, 1]
+    assert coincidencias == 0
+
+
+def test_titulos_cortos_solo_por_clave_exacta():
+    grupos, _ = deduplicacion_difusa.agrupar_titulos(['Editorial', 'Editorials', 'EDITORIAL.'])
+    assert grupos == [0, 1, 0]
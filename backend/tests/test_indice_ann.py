@@ -0,0 +1,58 @@
+import importlib
+
+import numpy as np
+from scipy import sparse
+
+indice_ann = importlib.import_module("app.2_similitud_texto.indice_ann")
+
+
+def test_asignacion_por_bloques_coincide_con_la_densa():
+    generador = np.random.RandomState(0)
+    vectores = generador.rand(1000, 16).astype(np.float32)
+    centroides = generador.rand(31, 16).astype(np.float32)
+    esperada = np.argmax(vectores @ centroides.T, axis=1)
+    assert np.array_equal(indice_ann._asignar(vectores, centroides, filas_por_bloque=64), esperada)
+
+
+def test_construir_por_bloques_da_el_mismo_indice(monkeypatch):
+    matriz = sparse.random(400, 300, density=0.05, format='csr', random_state=1)
+    ids = [f"a{i}" for i in range(400)]
+    completo = indice_ann.IndiceANN.construir(ids, matriz)
+    monkeypatch.setattr(indice_ann, 'FILAS_POR_BLOQUE_ASIGNACION', 7)
+    por_bloques = indice_ann.IndiceANN.construir(ids, matriz)
+    assert np.array_equal(completo.asignacion, por_bloques.asignacion)
+    assert completo.buscar("a0", k=5) == por_bloques.buscar("a0", k=5)
+
+
+def _articulos(abstracts):
+    return [{'ID': f"a{i}", 'abstract': abstract} for i, abstract in enumerate(abstracts)]
+
+
+def test_vecinos_aproximados_coseno_usan_el_nprobe_pedido(monkeypatch):
+    analizador_similitud = importlib.import_module("app.2_similitud_texto.analizador_similitud")
+    pedidos = []
+    buscar = indice_ann.IndiceANN.buscar
+
+    def buscar_registrando(self, id_articulo, k=10, nprobe=indice_ann.NPROBE, matriz_tfidf=None):
+        pedidos.append(nprobe)
+        return buscar(self, id_articulo, k, nprobe, matriz_tfidf)
+
+    monkeypatch.setattr(indice_ann.IndiceANN, 'buscar', buscar_registrando)
+    articulos = _articulos([f"privacy ethics model {i} learning data {i % 7}" for i in range(30)])
+    respuesta = analizador_similitud.calcular_vecinos_similares(articulos, 'coseno', 3, 'a0', aproximado=True, nprobe=2)
+    assert pedidos == [2]
+    assert len(respuesta["resultados"][0]["vecinos"]) == 3
+    respuesta = analizador_similitud.calcular_vecinos_similares(articulos, 'coseno', 3, aproximado=True, nprobe=0)
+    assert respuesta["codigo"] == analizador_similitud.ERROR_PARAMETRO_INVALIDO
+
+
+def test_vecinos_aproximados_coseno_sin_indice_no_fallan():
+    # Sin abstracts el modelo TF-IDF no tiene matriz y no hay índice que consultar.
+    analizador_similitud = importlib.import_module("app.2_similitud_texto.analizador_similitud")
+    articulos = [{'ID': 'a0', 'abstract': ''}, {'ID': 'a1'}]
+    coseno = analizador_similitud.obtener_algoritmo('coseno')
+    assert coseno.vecinos_indice(articulos, 'a0', 3, nprobe=2) is None
+    respuesta = analizador_similitud.calcular_vecinos_similares(articulos, 'coseno', 3, aproximado=True)
+    assert respuesta["resultados"] == []
+    respuesta = analizador_similitud.calcular_vecinos_similares(articulos, 'coseno', 3, 'a0', aproximado=True)
+    assert respuesta["codigo"] == analizador_similitud.ERROR_SIN_ABSTRACT
@@ -0,0 +1,99 @@
+import importlib
+import random
+
+import pytest
+
+buscador_palabras_clave = importlib.import_module("app.3_frecuencia_palabras.buscador_palabras_clave")
+indice_invertido = importlib.import_module("app.3_frecuencia_palabras.indice_invertido")
+
+PALABRAS = ['ethics', 'privacy', 'machine', 'learning', 'fine', 'tuning', 'data', 'ai']
+SEPARADORES = [' ', ' ', ' ', '-', ', ', '. ', ' (', ') ', '; ']
+PALABRAS_CLAVE = ['Ethics', 'Privacy', 'Machine learning', 'Fine-tuning', 'machine learning data', 'AI', 'data']
+
+
+def _articulos(cantidad, semilla):
+    generador = random.Random(semilla)
+    articulos = []
+    for i in range(cantidad):
+        partes = []
+        for _ in range(generador.randint(0, 40)):
+            partes.append(generador.choice(PALABRAS).capitalize() if generador.random() < 0.2 else generador.choice(PALABRAS))
+            partes.append(generador.choice(SEPARADORES))
+        articulos.append({'ID': f'a{i}', 'abstract': ''.join(partes), 'title': ' '.join(partes[:4])})
+    return articulos
+
+
+@pytest.fixture(scope='module')
+def articulos():
+    return _articulos(300, semilla=1)
+
+
+@pytest.fixture(scope='module')
+def indice(articulos):
+    return indice_invertido.IndiceInvertido.construir(articulos)
+
+
+def test_frases_coinciden_con_el_buscador(articulos, indice):
+    buscador = buscador_palabras_clave.BuscadorPalabrasClave(PALABRAS_CLAVE)
+    esperadas = buscador.contar(articulo['abstract'] for articulo in articulos)
+    assert indice.frecuencias(PALABRAS_CLAVE) == esperadas
+
+
+def test_las_frases_no_cruzan_signos_de_puntuacion():
+    indice = indice_invertido.IndiceInvertido.construir([
+        {'ID': 'a', 'abstract': 'Machine learning, machine. Learning and machine-learning'},
+    ])
+    assert indice.contar_frase('machine learning') == 2
+    assert indice.aciertos_por_articulo('Machine learning') == {'a': 2}
+
+
+def test_la_distancia_cuenta_palabras_y_no_signos():
+    indice = indice_invertido.IndiceInvertido.construir([
+        {'ID': 'a', 'abstract': 'Ethics, privacy; and (some) privacy.'},
+    ])
+    assert indice.contar_cercanos('ethics', 'privacy', 1) == 1
+    assert indice.contar_cercanos('privacy', 'ethics', 1) == 1
+    assert indice.contar_cercanos('privacy', 'ethics', 3) == 1
+    assert indice.contar_cercanos('privacy', 'ethics', 4) == 2
+
+
+def _cercanos_fuerza_bruta(articulos, frase_a, frase_b, distancia):
+    frase_a = buscador_palabras_clave.normalizar_palabra_clave(frase_a)
+    frase_b = buscador_palabras_clave.normalizar_palabra_clave(frase_b)
+    total = 0
+    for articulo in articulos:
+        palabras, _, unidas = indice_invertido.tokenizar_con_posiciones(articulo['abstract'])
+
+        def inicios(frase):
+            return [
+                i for i in range(len(palabras) - len(frase) + 1)
+                if tuple(palabras[i:i + len(frase)]) == frase and all(unidas[i + 1:i + len(frase)])
+            ]
+
+        inicios_b = inicios(frase_b)
+        for i in inicios(frase_a):
+            total += any(abs(i - j) <= distancia and (frase_a != frase_b or i != j) for j in inicios_b)
+    return total
+
+
+@pytest.mark.parametrize('frase_a, frase_b, distancia', [
+    ('ethics', 'privacy', 1),
+    ('ethics', 'privacy', 5),
+    ('machine learning', 'data', 2),
+    ('data', 'data', 3),
+    ('fine-tuning', 'ai', 0),
+])
+def test_proximidad_coincide_con_fuerza_bruta(articulos, indice, frase_a, frase_b, distancia):
+    assert indice.contar_cercanos(frase_a, frase_b, distancia) == _cercanos_fuerza_bruta(
+        articulos, frase_a, frase_b, distancia
+    )
+
+
+def test_guardar_y_cargar(articulos, indice, tmp_path):
+    ruta = str(tmp_path / 'indice.npz')
+    indice.guardar(ruta)
+    cargado = indice_invertido.IndiceInvertido.cargar(ruta)
+    assert cargado.ids == indice.ids
+    assert cargado.frecuencias(PALABRAS_CLAVE) == indice.frecuencias(PALABRAS_CLAVE)
+    assert cargado.contar_cercanos('ethics', 'privacy', 2) == indice.contar_cercanos('ethics', 'privacy', 2)
+    assert cargado.frecuencias(PALABRAS_CLAVE, campo='title') == indice.frecuencias(PALABRAS_CLAVE, campo='title')
@@ -0,0 +1,216 @@
+import importlib
+import random
+
+import pytest
+
+levenshtein = importlib.import_module("app.2_similitud_texto.levenshtein")
+
+
+def distancia_original(s1, s2):
+    """Implementación O(n·m) anterior de analizador_similitud, como referencia."""
+    if len(s1) < len(s2):
+        return distancia_original(s2, s1)
+    if len(s2) == 0:
+        return len(s1)
+    previous_row = range(len(s2) + 1)
+    for i, c1 in enumerate(s1):
+        current_row = [i + 1]
+        for j, c2 in enumerate(s2):
+            insertions = previous_row[j + 1] + 1
+            deletions = current_row[j] + 1
+            substitutions = previous_row[j] + (c1 != c2)
+            current_row.append(min(insertions, deletions, substitutions))
+        previous_row = current_row
+    return previous_row[-1]
+
+
+ALFABETO = 'abcdeñáéíóú ü-'
+
+
+def _texto_aleatorio(generador, longitud_maxima):
+    return ''.join(generador.choice(ALFABETO) for _ in range(generador.randint(0, longitud_maxima)))
+
+
+def _mutar(generador, texto, ediciones):
+    caracteres = list(texto)
+    for _ in range(ediciones):
+        operacion = generador.randrange(3)
+        posicion = generador.randint(0, len(caracteres))
+        if operacion == 0 or not caracteres:
+            caracteres.insert(posicion, generador.choice(ALFABETO))
+        elif operacion == 1:
+            del caracteres[min(posicion, len(caracteres) - 1)]
+        else:
+            caracteres[min(posicion, len(caracteres) - 1)] = generador.choice(ALFABETO)
+    return ''.join(caracteres)
+
+
+def _pares_aleatorios(cantidad, longitud_maxima, semilla):
+    generador = random.Random(semilla)
+    pares = []
+    for _ in range(cantidad):
+        s1 = _texto_aleatorio(generador, longitud_maxima)
+        # La mitad son variantes cercanas, para ejercitar distancias pequeñas.
+        if generador.random() < 0.5:
+            s2 = _mutar(generador, s1, generador.randint(0, 6))
+        else:
+            s2 = _texto_aleatorio(generador, longitud_maxima)
+        pares.append((s1, s2))
+    return pares
+
+
+PARES = _pares_aleatorios(1500, 40, semilla=7)
+# Más largos que una palabra de máquina, para el caso de varios bloques de 64 bits.
+PARES_LARGOS = _pares_aleatorios(60, 300, semilla=11)
+CASOS_BORDE = [
+    ('', ''),
+    ('', 'abc'),
+    ('ñandú', ''),
+    ('ñ', 'n'),
+    ('año', 'ano'),
+    ('kitten', 'sitting'),
+    ('flaw', 'lawn'),
+    ('ü' * 70, 'u' * 70),
+]
+
+
+@pytest.mark.parametrize('s1, s2', CASOS_BORDE)
+def test_casos_borde_coinciden_con_la_implementacion_original(s1, s2):
+    esperada = distancia_original(s1, s2)
+    assert levenshtein.calcular_distancia(s1, s2) == esperada
+    assert levenshtein.distancia_bit_paralela(s1, s2) == esperada
+    assert levenshtein.distancia_clasica(s1, s2) == esperada
+
+
+def test_pares_aleatorios_coinciden_con_la_implementacion_original():
+    for s1, s2 in PARES + PARES_LARGOS:
+        assert levenshtein.calcular_distancia(s1, s2) == distancia_original(s1, s2), (s1, s2)
+
+
+@pytest.mark.parametrize('max_distance', [0, 1, 3, 7, 8, 20])
+def test_umbral_devuelve_la_distancia_o_umbral_mas_uno(max_distance):
+    # 7 usa la banda de Ukkonen (2k+1 <= ANCHO_BANDA_MAXIMO) y 8 ya el bit-paralelo.
+    for s1, s2 in PARES + PARES_LARGOS:
+        distancia = distancia_original(s1, s2)
+        esperada = distancia if distancia <= max_distance else max_distance + 1
+        assert levenshtein.calcular_distancia(s1, s2, max_distance) == esperada, (s1, s2)
+
+
+def test_umbral_en_el_limite_exacto():
+    for s1, s2 in PARES:
+        distancia = distancia_original(s1, s2)
+        # Justo en el umbral se devuelve la distancia; un paso por debajo, umbral + 1.
+        assert levenshtein.calcular_distancia(s1, s2, distancia) == distancia
+        if distancia > 0:
+            assert levenshtein.calcular_distancia(s1, s2, distancia - 1) == distancia
+
+
+def test_umbral_negativo_es_un_error():
+    with pytest.raises(ValueError):
+        levenshtein.calcular_distancia('a', 'b', -1)
+
+
+def test_motor_vectorial_coincide_con_la_implementacion_original():
+    generador = random.Random(3)
+    consulta = _texto_aleatorio(generador, 60)
+    textos = [_mutar(generador, consulta, generador.randint(0, 10)) for _ in range(200)] + ['', 'ñ' * 90]
+    esperadas = [distancia_original(consulta, texto) for texto in textos]
+    assert levenshtein.distancias_vectoriales(consulta, textos) == esperadas
+    assert levenshtein.distancias_uno_contra_muchos(consulta, textos) == esperadas
+
+
+def test_consulta_larga_se_reparte_entre_procesos(monkeypatch):
+    # Consulta más larga que LONGITUD_MAXIMA_VECTORIAL y costo mínimo en 0 para
+    # que el lote vaya al pool de procesos aunque sea chico.
+    monkeypatch.setattr(levenshtein, 'COSTO_MINIMO_PARALELO', 0)
+    generador = random.Random(5)
+    consulta = _texto_aleatorio(generador, 400) + 'x' * (levenshtein.LONGITUD_MAXIMA_VECTORIAL + 1)
+    textos = [_mutar(generador, consulta, generador.randint(0, 30)) for _ in range(12)] + ['']
+    esperadas = [distancia_original(consulta, texto) for texto in textos]
+    assert levenshtein.distancias_uno_contra_muchos(consulta, textos, max_workers=2) == esperadas
+    assert levenshtein.distancias_uno_contra_muchos(consulta, textos, max_distance=20, max_workers=2) == [
+        distancia if distancia <= 20 else 21 for distancia in esperadas
+    ]
+
+
+def _secuencia(generador, longitud, vocabulario=50):
+    return [generador.randrange(vocabulario) for _ in range(longitud)]
+
+
+@pytest.mark.parametrize("bloques", [1, 2, 3, 7, 500])
+def test_por_bloques_es_cota_superior_y_exacta_con_un_bloque(bloques):
+    for s1, s2 in PARES_LARGOS + CASOS_BORDE:
+        exacta = distancia_original(s1, s2)
+        aproximada = levenshtein.distancia_por_bloques(s1, s2, bloques)
+        assert aproximada >= exacta
+        if bloques == 1:
+            assert aproximada == exacta
+
+
+def test_presupuesto_suficiente_da_la_distancia_exacta():
+    generador = random.Random(8)
+    # Longitudes muy distintas: el costo bit-paralelo (n·⌈m/64⌉) cabe aunque
+    # n·m no quepa.
+    for n, m in [(600, 600), (2000, 200), (800, 400), (3000, 10)]:
+        s1 = _secuencia(generador, n)
+        s2 = [x if generador.random() < 0.8 else generador.randrange(50) for x in s1[:m]]
+        distancia, aproximada = levenshtein.distancia_con_presupuesto(s1, s2, 100_000)
+        assert not aproximada
+        assert distancia == levenshtein.distancia_bit_paralela(s1, s2)
+    # Presupuesto justo igual al costo exacto.
+    for s1, s2 in PARES_LARGOS:
+        n, m = max(len(s1), len(s2)), min(len(s1), len(s2))
+        costo = n * -(-m // 64)
+        assert levenshtein.distancia_con_presupuesto(s1, s2, max(costo, 1)) == (distancia_original(s1, s2), False)
+
+
+def test_sin_presupuesto_suficiente_nunca_baja_de_la_exacta():
+    generador = random.Random(9)
+    for _ in range(20):
+        s1 = _secuencia(generador, generador.randint(200, 600))
+        s2 = [x for x in s1 if generador.random() < 0.9] + _secuencia(generador, generador.randint(0, 50))
+        distancia, aproximada = levenshtein.distancia_con_presupuesto(s1, s2, 200)
+        assert aproximada
+        assert distancia >= levenshtein.distancia_bit_paralela(s1, s2)
+
+
+def test_levenshtein_palabras_marca_la_aproximacion():
+    analizador_similitud = importlib.import_module("app.2_similitud_texto.analizador_similitud")
+    generador = random.Random(10)
+    s1 = _secuencia(generador, 300)
+    s2 = [x for x in s1 if generador.random() < 0.9]
+    exacta = levenshtein.distancia_bit_paralela(s1, s2)
+    resultado = analizador_similitud.calcular_levenshtein_palabras(s1, s2)
+    assert resultado == {"distancia": exacta, "similitud": round(1 - exacta / 300, 4), "aproximado": False}
+    resultado = analizador_similitud.calcular_levenshtein_palabras(s1, s2, presupuesto=300)
+    assert resultado["aproximado"]
+    assert resultado["distancia"] >= exacta
+    assert analizador_similitud.calcular_levenshtein_palabras([], []) == {"distancia": 0, "similitud": 1.0, "aproximado": False}
+
+
+def test_top_k_todos_contra_todos_reutiliza_un_solo_pool(monkeypatch):
+    # Un pool de hilos en lugar del de procesos para contar cuántos se crean.
+    from concurrent.futures import ThreadPoolExecutor
+
+    matriz_similitud = importlib.import_module("app.2_similitud_texto.matriz_similitud")
+    pools = []
+
+    def crear_pool(max_workers=None):
+        pools.append(ThreadPoolExecutor(max_workers=2))
+        return pools[-1]
+
+    monkeypatch.setattr(levenshtein, 'COSTO_MINIMO_PARALELO', 0)
+    monkeypatch.setattr(levenshtein, 'crear_pool', crear_pool)
+    generador = random.Random(6)
+    base = _texto_aleatorio(generador, 30)
+    abstracts = [_mutar(generador, base, generador.randint(0, 8)) for _ in range(2 * matriz_similitud.FILAS_POR_BLOQUE + 6)]
+    ids = [f"a{i}" for i in range(len(abstracts))]
+    resultado = matriz_similitud.top_k_levenshtein(ids, abstracts, 3, max_workers=2)
+    assert len(pools) == 1
+    assert pools[0]._shutdown
+    for fila, (id_articulo, vecinos) in enumerate(resultado):
+        assert id_articulo == ids[fila]
+        for id_vecino, puntaje in vecinos:
+            otra = ids.index(id_vecino)
+            esperada = 1 - distancia_original(abstracts[fila], abstracts[otra]) / max(len(abstracts[fila]), len(abstracts[otra]))
+            assert puntaje == pytest.approx(esperada)
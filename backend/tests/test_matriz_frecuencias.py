@@ -0,0 +1,29 @@
+import importlib
+
+almacen_articulos = importlib.import_module("app.2_similitud_texto.almacen_articulos")
+matriz_frecuencias = importlib.import_module("app.3_frecuencia_palabras.matriz_frecuencias")
+
+ARTICULOS = [
+    {'ID': 'a', 'abstract': 'Ethics and privacy in machine learning.', 'doi': '10.1109/x', 'year': '2021'},
+    {'ID': 'b', 'abstract': 'Privacy, privacy and fine-tuning.', 'doi': '10.1016/y', 'year': '2023'},
+    {'ID': 'c', 'abstract': '', 'year': '2023'},
+]
+
+
+def test_frecuencias_por_articulo_y_fuente():
+    matriz = matriz_frecuencias.obtener_matriz_frecuencias(ARTICULOS, ['Privacy', 'Fine-tuning', 'AI'])
+    assert matriz.ids == ['a', 'b']
+    assert matriz.frecuencia_total() == {'Privacy': 3, 'Fine-tuning': 1, 'AI': 0}
+    assert matriz.frecuencia_documentos() == {'Privacy': 2, 'Fine-tuning': 1, 'AI': 0}
+    assert matriz.frecuencia_articulo('b') == {'Privacy': 2, 'Fine-tuning': 1, 'AI': 0}
+    assert matriz.por_fuente()['ieee'] == {'Privacy': 1, 'Fine-tuning': 0, 'AI': 0}
+
+
+def test_la_cache_del_corpus_esta_acotada():
+    corpus = almacen_articulos.Corpus(ARTICULOS, version=(1, 1))
+    primera = matriz_frecuencias.obtener_matriz_frecuencias(corpus, ['Ethics'])
+    assert matriz_frecuencias.obtener_matriz_frecuencias(corpus, ['Ethics']) is primera
+    for i in range(matriz_frecuencias.CAPACIDAD_CACHE_MATRICES + 10):
+        matriz_frecuencias.obtener_matriz_frecuencias(corpus, [f'palabra{i}'])
+    assert len(corpus.frecuencias) == matriz_frecuencias.CAPACIDAD_CACHE_MATRICES
+    assert ('Ethics',) not in corpus.frecuencias
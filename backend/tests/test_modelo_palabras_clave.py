@@ -0,0 +1,78 @@
+import importlib
+import random
+from collections import Counter
+
+import pytest
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+modelo_palabras_clave = importlib.import_module("app.3_frecuencia_palabras.modelo_palabras_clave")
+
+
+def _abstracts(cantidad, semilla):
+    # Vocabulario chico y textos cortos: muchos términos empatan en frecuencia.
+    generador = random.Random(semilla)
+    vocabulario = [f"termino{i}" for i in range(400)]
+    return [' '.join(generador.choice(vocabulario) for _ in range(generador.randint(3, 15))) for _ in range(cantidad)]
+
+
+@pytest.mark.parametrize('num_palabras', [1, 15, 60, 200, 399])
+def test_palabras_sueltas_coinciden_con_max_features(num_palabras):
+    abstracts = _abstracts(120, semilla=2)
+    modelo = modelo_palabras_clave.ModeloPalabrasClave.ajustar(abstracts, ngramas=(1, 1))
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=num_palabras).fit(abstracts)
+    assert modelo.mas_relevantes(num_palabras) == sorted(vectorizer.get_feature_names_out().tolist())
+
+
+def test_guardar_y_cargar(tmp_path):
+    abstracts = _abstracts(50, semilla=3)
+    ruta = str(tmp_path / 'modelo.npz')
+    modelo = modelo_palabras_clave.obtener_modelo(abstracts, (1, 2), ruta)
+    cargado = modelo_palabras_clave.obtener_modelo(abstracts, (1, 2), ruta)
+    assert cargado.huella == modelo.huella
+    for criterio in modelo_palabras_clave.CRITERIOS:
+        assert cargado.mas_relevantes(30, criterio) == modelo.mas_relevantes(30, criterio)
+
+
+conteo_paralelo = importlib.import_module("app.3_frecuencia_palabras.conteo_paralelo")
+
+
+def test_conteo_por_fragmentos_coincide_con_max_features(monkeypatch):
+    monkeypatch.setattr(conteo_paralelo, 'TEXTOS_POR_FRAGMENTO_TERMINOS', 25)
+    abstracts = _abstracts(120, semilla=4)
+    parametros = {'stop_words': 'english', 'ngram_range': (1, 2)}
+    # Sin límite, o con más candidatos que términos, no se descarta nada.
+    for max_terminos in (None, 5000):
+        terminos, conteos = conteo_paralelo.matriz_conteos_terminos(abstracts, parametros, max_terminos, max_workers=1)
+        esperado = CountVectorizer(max_features=max_terminos, **parametros)
+        esperados = esperado.fit_transform(abstracts)
+        assert terminos.tolist() == esperado.get_feature_names_out().tolist()
+        assert (conteos != esperados).nnz == 0
+    # Con descarte la selección puede variar, pero los conteos son exactos.
+    terminos, conteos = conteo_paralelo.matriz_conteos_terminos(abstracts, parametros, 40, max_workers=1)
+    assert len(terminos) == 40
+    esperados = CountVectorizer(vocabulary=terminos.tolist(), **parametros).transform(abstracts)
+    assert (conteos != esperados).nnz == 0
+
+
+def test_conteo_por_fragmentos_acota_los_candidatos(monkeypatch):
+    monkeypatch.setattr(conteo_paralelo, 'TEXTOS_POR_FRAGMENTO_TERMINOS', 10)
+    monkeypatch.setattr(conteo_paralelo, 'CANDIDATOS_POR_TERMINO', 2)
+    tamanos = []
+    mas_frecuentes = conteo_paralelo._mas_frecuentes
+
+    def registrar(totales, limite):
+        # La suma global es un Counter; lo de cada fragmento, un dict.
+        if isinstance(totales, Counter):
+            tamanos.append(len(totales))
+        return mas_frecuentes(totales, limite)
+
+    monkeypatch.setattr(conteo_paralelo, '_mas_frecuentes', registrar)
+    # Términos frecuentes en todo el corpus y una cola larga de términos únicos.
+    abstracts = [f"alpha beta gamma unico{i}a unico{i}b unico{i}c" for i in range(200)]
+    parametros = {'stop_words': 'english', 'ngram_range': (1, 1)}
+    terminos, conteos = conteo_paralelo.matriz_conteos_terminos(abstracts, parametros, 3, max_workers=1)
+    assert terminos.tolist() == ['alpha', 'beta', 'gamma']
+    assert conteos.sum(axis=0).tolist() == [[200, 200, 200]]
+    # La suma global se recorta (límite de 2 x 3 candidatos) al pasar del doble,
+    # así que nunca llega a las 603 palabras distintas del corpus.
+    assert tamanos and max(tamanos) <= 3 * 2 * 3